@@ -1,23 +1,24 @@
 import os
-import requests
 import json
+from app.llm_cache import cached_chat_completion
+from app.prompt_compactor import compact_prompt, record_usage
 
-def ai_resume_feedback(resume_text: str, job_description: str = None):
+def ai_resume_feedback(resume_text: str, job_description: str = None, usage: dict = None):
     """
     Provides feedback on resume strengths, missing skills, and job match explanation.
     If job_description is provided, feedback is tailored to that job.
+    Both are compacted to the prompt token budget; token counts go to `usage`.
     """
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         return {"error": "GROQ_API_KEY not set"}
 
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-
     system_prompt = "You are an AI career coach. Provide feedback in JSON format only."
+    compacted = compact_prompt(resume_text, job_description)
+    record_usage(usage, compacted)
     user_prompt = {
-        "resume": resume_text,
-        "job": job_description or "N/A"
+        "resume": compacted["resume"],
+        "job": compacted["job_description"] or "N/A"
     }
 
     payload = {
@@ -31,9 +32,7 @@ def ai_resume_feedback(resume_text: str, job_description: str = None):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        result = response.json()
+        result = cached_chat_completion(api_key, payload, timeout=30)
         return json.loads(result["choices"][0]["message"]["content"])
     except Exception as e:
         return {"error": str(e)}
@@ -1,28 +1,21 @@
 # app/ai_assistant.py
 import os
+import re
 import requests
 import json
 from dotenv import load_dotenv
+from app.llm_cache import cached_chat_completion
+from app.llm_stream import parse_partial_json, stream_chat_completion
+from app.prompt_compactor import compact_prompt, record_usage
 
 load_dotenv()
 
-def ai_resume_feedback(resume_text: str, job_description: str = None) -> dict:
-    """
-    Provides AI-powered feedback on a resume.
-    If job_description is provided, it will give tailored advice.
-    Uses Groq API (Mixtral or LLaMA) to analyze.
-    """
+FEEDBACK_FIELDS = ("strengths", "weaknesses", "missing_skills", "suggestions")
+FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
 
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        return {"error": "GROQ_API_KEY not set in environment variables"}
-
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
 
+def _feedback_payload(resume_text, job_description, usage):
+    """Chat payload for resume feedback (prompt compacted to the token budget)."""
     system_prompt = (
         "You are an AI resume coach. Analyze resumes and provide feedback.\n"
         "Give JSON output with fields:\n"
@@ -34,11 +27,13 @@ def ai_resume_feedback(resume_text: str, job_description: str = None) -> dict:
         "}\n"
     )
 
-    user_prompt = f"Resume:\n{resume_text}\n"
-    if job_description:
-        user_prompt += f"\nTarget Job Description:\n{job_description}"
+    compacted = compact_prompt(resume_text, job_description)
+    record_usage(usage, compacted)
+    user_prompt = f"Resume:\n{compacted['resume']}\n"
+    if compacted["job_description"]:
+        user_prompt += f"\nTarget Job Description:\n{compacted['job_description']}"
 
-    payload = {
+    return {
         "model": "llama-3.1-8b-instant",  # ✅ pick one from your Groq models list
         "messages": [
             {"role": "system", "content": system_prompt},
@@ -48,10 +43,25 @@ def ai_resume_feedback(resume_text: str, job_description: str = None) -> dict:
         "response_format": {"type": "json_object"},
     }
 
+
+def ai_resume_feedback(resume_text: str, job_description: str = None, usage: dict = None) -> dict:
+    """
+    Provides AI-powered feedback on a resume.
+    If job_description is provided, it will give tailored advice.
+    Uses Groq API (Mixtral or LLaMA) to analyze.
+    Resume and job description are compacted to the prompt token budget
+    (sections most relevant to the job kept first); token counts go to `usage`.
+    """
+
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        return {"error": "GROQ_API_KEY not set in environment variables"}
+
+    payload = _feedback_payload(resume_text, job_description, usage)
+
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        result = response.json()
+        # Identical requests are served from the response cache
+        result = cached_chat_completion(api_key, payload, timeout=30)
         ai_output = result["choices"][0]["message"]["content"]
 
         return json.loads(ai_output)
@@ -62,3 +72,58 @@ def ai_resume_feedback(resume_text: str, job_description: str = None) -> dict:
         return {"error": "Failed to parse AI response as JSON"}
     except Exception as e:
         return {"error": f"Unexpected error: {e}"}
+
+
+# ---------------------------
+# Streaming feedback
+# ---------------------------
+def validate_feedback(text):
+    """The complete response as a feedback dict (every field a list of strings), or {"error": ...}."""
+    try:
+        feedback = json.loads(FENCE_RE.sub("", text))
+    except json.JSONDecodeError:
+        return {"error": "Failed to parse AI response as JSON"}
+    if not isinstance(feedback, dict):
+        return {"error": "AI response is not a JSON object"}
+    for field in FEEDBACK_FIELDS:
+        value = feedback.get(field) or []
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            return {"error": f"AI response field '{field}' is not a list"}
+        feedback[field] = [str(item) for item in value]
+    return feedback
+
+
+def stream_resume_feedback(resume_text: str, job_description: str = None, usage: dict = None, url=None):
+    """
+    Streaming ai_resume_feedback: yields the feedback parsed so far each time
+    the partial JSON grows, and finally the validated result (or {"error"}).
+    `usage` gets the prompt token counts plus ttft_ms / total_ms.
+    """
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        yield {"error": "GROQ_API_KEY not set in environment variables"}
+        return
+
+    payload = _feedback_payload(resume_text, job_description, usage)
+    payload.pop("response_format")  # Groq's JSON mode can't stream; the final text is validated instead
+    timings = {}
+    text, shown = "", {}
+    try:
+        for delta in stream_chat_completion(api_key, payload, url=url, timeout=30, timings=timings):
+            text += delta
+            partial = parse_partial_json(text)
+            if partial and partial != shown:
+                shown = partial
+                yield partial
+    except requests.exceptions.RequestException as e:
+        yield {"error": f"API request failed: {e}"}
+        return
+    except Exception as e:
+        yield {"error": f"Unexpected error: {e}"}
+        return
+    finally:
+        if usage is not None:
+            usage.update({key: round(ms, 1) for key, ms in timings.items()})
+    yield validate_feedback(text)
@@ -0,0 +1,106 @@
+import threading
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+# Defaults for the recall/latency trade-off
+DEFAULT_DIM = 128      # dense projection size
+DEFAULT_N_PROBE = 8    # clusters searched per query (higher = better recall, slower)
+MIN_JOBS = 2000        # below this an exact scan is already cheap
+REBUILD_DRIFT = 0.1    # rebuild once 10% of the jobs changed since the build
+
+
+# ---------------------------
+# IVF Index
+# ---------------------------
+class IVFJobIndex:
+    """
+    IVF-style approximate retrieval over dense (SVD) projections of a JobIndex.
+    Jobs are clustered with k-means; a query only visits the n_probe closest
+    clusters and returns their jobs as a shortlist for exact re-ranking.
+    """
+
+    def __init__(self, job_index, dim=DEFAULT_DIM, n_lists=None, random_state=0):
+        weighted = job_index.weighted_matrix()
+        n_jobs, n_terms = weighted.shape
+        dim = max(1, min(dim, n_terms - 1, n_jobs - 1))
+        n_lists = n_lists or max(1, int(np.sqrt(n_jobs)))
+
+        self.n_terms = n_terms
+        self.svd = TruncatedSVD(n_components=dim, random_state=random_state)
+        dense = normalize(self.svd.fit_transform(weighted))
+
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=random_state, n_init=3, batch_size=4096)
+        labels = kmeans.fit_predict(dense)
+        self.centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+
+        job_ids = np.asarray(job_index.job_ids, dtype=object)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(n_lists + 1))
+        self.lists = [job_ids[order[bounds[i]:bounds[i + 1]]] for i in range(n_lists)]
+        self.built_ids = set(job_index.job_ids)
+        self.added_ids = np.asarray([], dtype=object)
+
+    def candidates(self, query_vec, n_probe=DEFAULT_N_PROBE):
+        """Job ids in the n_probe clusters closest to a sparse TF-IDF query vector."""
+        # Terms added to the vocabulary since the build are appended columns: drop them
+        projected = normalize(self.svd.transform(query_vec[:, :self.n_terms]))
+        closest = np.argsort(-(self.centroids @ projected.ravel()))[:n_probe]
+        return np.concatenate([self.lists[i] for i in closest])
+
+    def shortlist_rows(self, job_index, query_vec, n_probe=DEFAULT_N_PROBE):
+        """JobIndex row numbers to re-rank: probed clusters + jobs added since the build."""
+        row_of = job_index._row_of
+        ids = np.concatenate([self.candidates(query_vec, n_probe), self.added_ids])
+        rows = [row_of[j] for j in ids if j in row_of]
+        return np.unique(np.asarray(rows, dtype=np.int64))
+
+    def sync(self, job_index):
+        """Track jobs added since the build; returns True once the drift warrants a rebuild."""
+        current = set(job_index.job_ids)
+        self.added_ids = np.asarray(sorted(current - self.built_ids), dtype=object)
+        changed = len(self.added_ids) + len(self.built_ids - current)
+        return changed > REBUILD_DRIFT * max(1, len(self.built_ids))
+
+
+# ---------------------------
+# Search
+# ---------------------------
+_lock = threading.Lock()
+_cached = {"ann": None, "job_index": None, "version": None}
+
+
+def get_ann_index(job_index):
+    """IVF index for job_index, (re)built lazily when jobs drift too far."""
+    with _lock:
+        ann = _cached["ann"]
+        changed = _cached["job_index"] is not job_index or _cached["version"] != job_index.version
+        if ann is None or (changed and ann.sync(job_index)):
+            ann = IVFJobIndex(job_index)
+        _cached.update(ann=ann, job_index=job_index, version=job_index.version)
+        return ann
+
+
+def ann_search(job_index, query_vec, top_n=5, n_probe=DEFAULT_N_PROBE, allowed=None):
+    """
+    Approximate top-N: shortlist via the IVF index, then exact cosine
+    re-ranking on the shortlisted sparse rows. Returns [(row, similarity), ...].
+    Small indexes (or small `allowed` prefiltered row sets) are scanned exactly.
+    """
+    if allowed is not None and len(allowed) < MIN_JOBS:
+        rows = np.asarray(allowed, dtype=np.int64)
+    elif len(job_index) < MIN_JOBS:
+        rows = np.arange(len(job_index))
+    else:
+        rows = get_ann_index(job_index).shortlist_rows(job_index, query_vec, n_probe)
+    if allowed is not None:
+        rows = np.intersect1d(rows, allowed)
+    if not len(rows) or top_n <= 0:
+        return []
+
+    sims = (job_index.weighted_matrix()[rows] @ query_vec.T).toarray().ravel()
+    k = min(top_n, len(sims))
+    best = np.argpartition(-sims, k - 1)[:k]
+    best = best[np.argsort(-sims[best], kind="stable")]
+    return [(int(rows[i]), float(sims[i])) for i in best]
@@ -1,5 +1,8 @@
 # app/ats_checker.py
-import os, re, string
+import os
+import numpy as np
+import scipy.sparse as sp
+from app.skill_taxonomy import get_taxonomy, normalize_text
 try:
     import nltk
     from nltk.corpus import stopwords
@@ -32,53 +35,42 @@ if nltk:
 if not STOPWORDS:
     STOPWORDS = {"and","or","for","with","the","a","an","of","to","in","on","our","your","will","are","is","be","as","by","at","from","this","that","we","you","have","has","its"}
 
-SKILLSET = [
-    "python","sql","data visualization","erp","finance","supply chain management",
-    "human capital management","oracle analytics cloud","fusion data intelligence",
-    "machine learning","deep learning","nlp","pandas","pytorch","tensorflow",
-    "docker","kubernetes","streamlit","springboot","microservices"
-]
-
-SKILL_WEIGHTS = {s: 2 if s in {"python","sql","machine learning","nlp","oracle analytics cloud","data visualization"} else 1 for s in SKILLSET}
+# Skill taxonomy (names, aliases, weights) lives in app/data/skills.json
+TAXONOMY = get_taxonomy()
+SKILLSET = TAXONOMY.keys
+SKILL_WEIGHTS = TAXONOMY.weights
 
 def _normalize_text(text: str) -> str:
-    if not text: return ""
-    text = text.lower()
-    text = text.translate(str.maketrans(string.punctuation, " " * len(string.punctuation)))
-    return re.sub(r"\s+", " ", text).strip()
+    return normalize_text(text)
 
-def _contains_skill(text_norm: str, skill: str) -> bool:
-    skill = skill.lower().strip()
-    if " " in skill:
-        return skill in text_norm
-    return bool(re.search(rf"\b{re.escape(skill)}\b", text_norm))
+def ats_score(resume_text: str, job_desc: str, taxonomy=None):
+    taxonomy = taxonomy or TAXONOMY
 
-def ats_score(resume_text: str, job_desc: str):
-    resume_norm = _normalize_text(resume_text or "")
-    job_norm = _normalize_text(job_desc or "")
+    # One pass over each text finds every skill (with counts)
+    resume_hits = taxonomy.find(resume_text or "")
+    job_hits = taxonomy.find(job_desc or "")
 
     matched, missing = [], []
     density = {}
     total_required_weight, matched_weight = 0, 0
 
-    for skill in SKILLSET:
-        weight = SKILL_WEIGHTS.get(skill, 1)
-        if _contains_skill(job_norm, skill):  # required in JD
-            total_required_weight += weight
-            resume_count = resume_norm.count(skill)
-            job_count = job_norm.count(skill)
-            density[skill] = {"resume_count": resume_count, "job_count": job_count}
+    for skill in sorted(job_hits, key=taxonomy.index.get):  # required in JD
+        weight = taxonomy.weight(skill)
+        total_required_weight += weight
+        resume_count = resume_hits.get(skill, 0)
+        job_count = job_hits[skill]
+        density[skill] = {"resume_count": resume_count, "job_count": job_count}
 
-            if resume_count > 0:
-                matched.append(skill)
-                matched_weight += weight
-            else:
-                missing.append(skill)
+        if resume_count > 0:
+            matched.append(skill)
+            matched_weight += weight
+        else:
+            missing.append(skill)
 
     score = int((matched_weight / total_required_weight) * 100) if total_required_weight else 0
     score = max(0, min(100, score))
 
-    critical_missing = sorted(missing, key=lambda x: SKILL_WEIGHTS.get(x,1), reverse=True)[:5]
+    critical_missing = sorted(missing, key=lambda x: taxonomy.weight(x), reverse=True)[:5]
 
     return {
         "ATS Score": score,
@@ -87,3 +79,87 @@ def ats_score(resume_text: str, job_desc: str):
         "critical_missing": critical_missing,
         "keyword_density": density
     }
+
+
+# ---------------------------
+# Batch ATS scoring
+# ---------------------------
+def skill_matrix(texts, taxonomy=None):
+    """Sparse (len(texts) x n_skills) skill-count matrix; one automaton pass per text."""
+    taxonomy = taxonomy or TAXONOMY
+    return skill_count_matrix((taxonomy.find(text or "") for text in texts), taxonomy)
+
+
+def skill_count_matrix(skill_counts, taxonomy=None):
+    """Sparse skill-count matrix from {skill: count} dicts (e.g. stored extracted_skills)."""
+    taxonomy = taxonomy or TAXONOMY
+    index = taxonomy.index
+    indptr, indices, data = [0], [], []
+    for hits in skill_counts:
+        row = sorted((index[skill], count) for skill, count in hits.items() if skill in index)
+        indices.extend(col for col, _ in row)
+        data.extend(count for _, count in row)
+        indptr.append(len(indices))
+    return sp.csr_matrix(
+        (np.array(data, dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr)),
+        shape=(len(indptr) - 1, len(taxonomy)),
+    )
+
+
+def ats_score_matrix(resume_matrix, job_matrix, taxonomy=None):
+    """
+    ATS Score for every (resume, job) pair as an int array (n_resumes x n_jobs):
+    weight of JD skills present in the resume / weight of all JD skills.
+    """
+    taxonomy = taxonomy or TAXONOMY
+    weights = np.array([taxonomy.weight(key) for key in taxonomy.keys], dtype=np.float64)
+    resume_has = (resume_matrix > 0).astype(np.float64)
+    job_weighted = (job_matrix > 0).astype(np.float64).multiply(weights).tocsr()
+
+    matched = np.asarray((resume_has @ job_weighted.T).todense())
+    required = np.asarray(job_weighted.sum(axis=1)).ravel()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(required > 0, (matched / required) * 100, 0)
+    return np.clip(np.floor(scores), 0, 100).astype(int)
+
+
+def _pair_result(taxonomy, score, resume_counts, job_row):
+    """ats_score()-shaped result from a precomputed score and skill rows."""
+    matched, missing, density = [], [], {}
+    for col, job_count in zip(job_row.indices, job_row.data):
+        skill = taxonomy.keys[col]
+        resume_count = resume_counts.get(col, 0)
+        density[skill] = {"resume_count": int(resume_count), "job_count": int(job_count)}
+        (matched if resume_count > 0 else missing).append(skill)
+    return {
+        "ATS Score": int(score),
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "critical_missing": sorted(missing, key=lambda x: taxonomy.weight(x), reverse=True)[:5],
+        "keyword_density": density
+    }
+
+
+def ats_results(resume_matrix, job_matrix, taxonomy=None):
+    """results[i][j] == ats_score(resume i, job j), from precomputed skill matrices."""
+    taxonomy = taxonomy or TAXONOMY
+    scores = ats_score_matrix(resume_matrix, job_matrix, taxonomy)
+    job_rows = [job_matrix[j] for j in range(job_matrix.shape[0])]
+    results = []
+    for i in range(resume_matrix.shape[0]):
+        row = resume_matrix[i]
+        resume_counts = dict(zip(row.indices, row.data))
+        results.append([
+            _pair_result(taxonomy, scores[i, j], resume_counts, job_row)
+            for j, job_row in enumerate(job_rows)
+        ])
+    return results
+
+
+def ats_score_many(resume_texts, job_descs, taxonomy=None):
+    """
+    Vectorized ats_score over every (resume, job description) pair.
+    Each text is scanned once; returns results[i][j] in the ats_score format.
+    """
+    taxonomy = taxonomy or TAXONOMY
+    return ats_results(skill_matrix(resume_texts, taxonomy), skill_matrix(job_descs, taxonomy), taxonomy)
@@ -3,7 +3,7 @@ from app.mongodb_config import users_collection
 
 
 def signup_user(email, password):
-    if users_collection.find_one({"email": email}):
+    if users_collection.find_one({"email": email}, {"_id": 1}):
         return {"success": False, "message": "⚠️ User already exists"}
 
     hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
@@ -16,7 +16,7 @@ def signup_user(email, password):
 
 
 def login_user(email, password):
-    user = users_collection.find_one({"email": email})
+    user = users_collection.find_one({"email": email}, {"_id": 0, "password": 1, "role": 1})
     if not user:
         return {"success": False, "message": "⚠️ User not found"}
 
@@ -0,0 +1,223 @@
+import os
+import re
+import sys
+import json
+import time
+import pandas as pd
+from pymongo import UpdateOne
+from app.mongodb_config import jobs_collection
+from app.db_schema import INDEXES
+from app.job_index import build_job_index, job_record, prepare_job_features, sync_jobs_to_index
+
+DEFAULT_CHUNKSIZE = 20000   # CSV rows parsed at a time
+DEFAULT_BATCH_SIZE = 1000   # upserts per bulk_write
+INDEX_SYNC_LIMIT = 5000     # more changed jobs than this -> rebuild the index instead of syncing
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def clean_col_names(df):
+    """Normalize CSV column names to snake_case."""
+    new_cols = []
+    for col in df.columns:
+        new_col = re.sub(r'[^A-Za-z0-9_]+', '', col.lower().strip().replace(' ', '_'))
+        new_cols.append(new_col)
+    df.columns = new_cols
+    return df
+
+
+def _read_header(csv_path):
+    """(column names, malformed) - malformed means the whole header was quoted as one field."""
+    columns = list(pd.read_csv(csv_path, nrows=0).columns)
+    if len(columns) == 1 and "," in columns[0]:
+        return [col.strip() for col in columns[0].split(",")], True
+    return columns, False
+
+
+def iter_csv_chunks(csv_path, chunksize=DEFAULT_CHUNKSIZE, skip_rows=0):
+    """
+    Yield (row_offset, DataFrame) for the CSV, `chunksize` rows at a time,
+    all columns read as strings (no per-chunk dtype guessing) with cleaned
+    column names and missing values as None. The first `skip_rows` data rows
+    are skipped (resume). Rows of a malformed file (each line quoted as a
+    single field) are split per chunk.
+    """
+    columns, malformed = _read_header(csv_path)
+    reader = pd.read_csv(
+        csv_path, chunksize=chunksize, dtype=str, keep_default_na=False, na_values=[""],
+        skiprows=range(1, skip_rows + 1) if skip_rows else None,
+    )
+    offset = skip_rows
+    for chunk in reader:
+        if malformed:
+            chunk = chunk[chunk.columns[0]].str.split(",", n=len(columns) - 1, expand=True)
+            chunk = chunk.reindex(columns=range(len(columns)))
+            chunk.columns = columns
+        chunk = clean_col_names(chunk)
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield offset, chunk
+        offset += len(chunk)
+
+
+# ---------------------------
+# Checkpoints
+# ---------------------------
+def _checkpoint_path(csv_path):
+    return f"{csv_path}.import-checkpoint.json"
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return {"csv_path": os.path.abspath(csv_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def load_checkpoint(path, stamp, mode, target):
+    """The saved progress for this exact file/mode/target, or None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    same = {k: checkpoint.get(k) for k in stamp} == stamp
+    if not same or checkpoint.get("mode") != mode or checkpoint.get("target") != target:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+# ---------------------------
+# Importer
+# ---------------------------
+def _write_batch(collection, records):
+    """Upsert one batch by (title, company), unordered. Returns (result, changed keys)."""
+    changed = prepare_job_features(records, collection)
+    ops = [
+        UpdateOne({"title": r["title"], "company": r["company"]}, {"$set": r}, upsert=True)
+        for r in records
+    ]
+    return collection.bulk_write(ops, ordered=False), changed
+
+
+def import_jobs_csv(csv_path, collection=None, mode="upsert", chunksize=DEFAULT_CHUNKSIZE,
+                    batch_size=DEFAULT_BATCH_SIZE, checkpoint_path=None, resume=True, normalize=False):
+    """
+    Stream a (possibly multi-GB) job CSV into MongoDB at steady memory.
+
+    mode="upsert":  merge into the live collection by (title, company).
+    mode="replace": load into a staging collection, then atomically rename it
+                    over the live one (readers never see a half-loaded table).
+
+    Progress (rows consumed) is checkpointed after every bulk batch; a rerun
+    on the same unchanged file resumes from there unless resume=False.
+    normalize=True stores the job fields save_jobs_to_mongo stores (job_record)
+    instead of the raw CSV columns.
+    """
+    collection = jobs_collection if collection is None else collection
+    if mode not in ("upsert", "replace"):
+        return {"error": f"⚠️ Unknown import mode: {mode}"}
+    try:
+        columns, malformed = _read_header(csv_path)
+    except Exception as e:
+        return {"error": f"⚠️ Failed to read CSV: {e}"}
+    if malformed:
+        print("⚠️ Malformed header detected. Fixing per chunk...")
+    columns = list(clean_col_names(pd.DataFrame(columns=columns)).columns)
+    print(f"Cleaned CSV columns: {columns}")
+    if not {"title", "company"}.issubset(columns):
+        return {"error": "⚠️ CSV must contain 'title' and 'company' columns."}
+
+    checkpoint_path = checkpoint_path or _checkpoint_path(csv_path)
+    stamp = _source_stamp(csv_path)
+    checkpoint = load_checkpoint(checkpoint_path, stamp, mode, collection.name) if resume else None
+
+    database = collection.database
+    staging = database[f"{collection.name}_import_staging"] if mode == "replace" else None
+    if checkpoint:
+        print(f"↩️ Resuming import at row {checkpoint['rows_done']}.")
+    else:
+        checkpoint = {**stamp, "mode": mode, "target": collection.name, "rows_done": 0,
+                      "inserted": 0, "updated": 0, "skipped": 0,
+                      "changed": None if mode == "replace" else []}
+        if staging is not None:
+            staging.drop()  # leftovers of an abandoned run
+    target = collection
+    if staging is not None:
+        staging.create_indexes(INDEXES["jobs"])  # (title, company) upserts need the unique index
+        target = staging
+
+    start = time.perf_counter()
+    batches = 0
+    try:
+        for offset, chunk in iter_csv_chunks(csv_path, chunksize, skip_rows=checkpoint["rows_done"]):
+            records = chunk.to_dict(orient="records")
+            if normalize:
+                records = [job_record(r) for r in records]
+            for i in range(0, len(records), batch_size):
+                batch = [r for r in records[i:i + batch_size] if r.get("title") and r.get("company")]
+                consumed = min(i + batch_size, len(records))
+                checkpoint["skipped"] += consumed - i - len(batch)
+                if batch:
+                    result, changed = _write_batch(target, batch)
+                    checkpoint["inserted"] += result.upserted_count
+                    checkpoint["updated"] += result.modified_count
+                    if checkpoint["changed"] is not None:
+                        checkpoint["changed"].extend(changed)
+                        if len(checkpoint["changed"]) > INDEX_SYNC_LIMIT:
+                            checkpoint["changed"] = None  # too many: rebuild at the end
+                    batches += 1
+                checkpoint["rows_done"] = offset + consumed
+                save_checkpoint(checkpoint_path, checkpoint)
+    except Exception as e:
+        return {"error": f"⚠️ Import stopped at row {checkpoint['rows_done']} (rerun to resume): {e}"}
+
+    if staging is not None:
+        staging.rename(collection.name, dropTarget=True)
+        print(f"Swapped staging collection into '{collection.name}'.")
+
+    # Keep the matching index in step with the imported jobs
+    try:
+        if staging is not None or checkpoint["changed"] is None:
+            index = build_job_index(collection)
+            print(f"Rebuilt job index ({len(index)} jobs, {len(index.terms)} terms).")
+        elif checkpoint["changed"]:
+            sync_jobs_to_index([tuple(key) for key in checkpoint["changed"]], collection)
+    except Exception as e:
+        print(f"⚠️ Job index update failed: {e}")
+
+    os.remove(checkpoint_path)
+    print(f"Filtered out {checkpoint['skipped']} rows with missing title/company.")
+    return {
+        "inserted": checkpoint["inserted"],
+        "updated": checkpoint["updated"],
+        "rows": checkpoint["rows_done"],
+        "skipped": checkpoint["skipped"],
+        "batches": batches,
+        "seconds": round(time.perf_counter() - start, 2),
+        "message": "✅ Jobs imported successfully from CSV."
+    }
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+if __name__ == "__main__":
+    # python -m app.csv_importer jobs_dump.csv [--replace] [--batch-size 2000] [--chunksize 50000] [--restart]
+    import argparse
+    parser = argparse.ArgumentParser(description="Stream a job CSV into MongoDB.")
+    parser.add_argument("csv_path")
+    parser.add_argument("--replace", action="store_true", help="load into staging and swap over the jobs collection")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint")
+    args = parser.parse_args()
+    result = import_jobs_csv(args.csv_path, mode="replace" if args.replace else "upsert",
+                             chunksize=args.chunksize, batch_size=args.batch_size, resume=not args.restart)
+    print(result)
+    sys.exit(1 if "error" in result else 0)
@@ -0,0 +1,172 @@
+import sys
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import PyMongoError
+from app.mongodb_config import USER_AUTH_PROJECTION, get_db  # noqa: F401 (listed with the other projections)
+from app.resume_parser import AI_PARSER, RULE_CACHE_KIND
+
+# ---------------------------
+# Indexes
+# ---------------------------
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+    ],
+    "resumes": [
+        IndexModel([("uploaded_by", ASCENDING), ("uploaded_at", DESCENDING)]),
+    ],
+    "refresh_queries": [
+        IndexModel([("keywords", ASCENDING), ("location", ASCENDING)], unique=True),
+    ],
+    "jobs": [
+        IndexModel([("title", ASCENDING), ("company", ASCENDING)], unique=True, sparse=True),
+        IndexModel([("location", ASCENDING)]),
+        IndexModel([("title", TEXT), ("skills_required", TEXT), ("description", TEXT)],
+                   weights={"title": 5, "skills_required": 3, "description": 1}, name="job_text"),
+    ],
+}
+
+# Fields read back from stored documents (explicit projections, no full reads);
+# USER_AUTH_PROJECTION lives with authenticate_user in app.mongodb_config
+USER_LIST_PROJECTION = {"_id": 0, "email": 1, "role": 1}
+RESUME_PROJECTION = {field: 1 for field in (
+    "Name", "Email", "Phone", "Skills", "Education", "Experience", "Error",
+    "uploaded_by", "version_name", "uploaded_at",
+)}
+
+_ensured = set()
+
+
+def ensure_indexes(db=None, collections=None, force=False):
+    """
+    Create the indexes above (idempotent; existing identical indexes are a no-op).
+    Runs once per process and database unless force=True. Returns
+    {collection: [index names] | "⚠️ error"}.
+    """
+    db = get_db() if db is None else db
+    results = {}
+    for name in collections or INDEXES:
+        key = (id(db), name)
+        if key in _ensured and not force:
+            continue
+        try:
+            results[name] = db[name].create_indexes(INDEXES[name])
+            _ensured.add(key)
+        except PyMongoError as e:  # e.g. duplicate emails block the unique index
+            results[name] = f"⚠️ Failed to create {name} indexes: {e}"
+            print(results[name])
+    return results
+
+
+# ---------------------------
+# Query plan check
+# ---------------------------
+# Every query the app runs per request / per batch. Admin full-collection
+# reads and exports are deliberate scans and are not listed.
+HOT_QUERIES = [
+    {"name": "user by email", "collection": "users",
+     "filter": {"email": "someone@example.com"}, "projection": USER_AUTH_PROJECTION},
+    {"name": "resumes of a user", "collection": "resumes",
+     "filter": {"uploaded_by": "someone@example.com"}, "projection": RESUME_PROJECTION,
+     "sort": [("uploaded_at", DESCENDING)], "limit": 10},
+    {"name": "resume keyset batch", "collection": "resumes",
+     "filter": {"_id": {"$gt": ObjectId("000000000000000000000000")}}, "projection": RESUME_PROJECTION,
+     "sort": [("_id", ASCENDING)], "limit": 1000},
+    {"name": "resume re-parse batch", "collection": "resumes",
+     "filter": {"_id": {"$gt": ObjectId("000000000000000000000000")}, "raw_text": {"$exists": True},
+                "parser": {"$nin": [AI_PARSER, RULE_CACHE_KIND]}}, "projection": {"raw_text": 1},
+     "sort": [("_id", ASCENDING)], "limit": 500},
+    {"name": "job keyset batch", "collection": "jobs",
+     "filter": {"_id": {"$gt": ObjectId("000000000000000000000000")}}, "projection": {"tokens": 1},
+     "sort": [("_id", ASCENDING)], "limit": 1000},
+    {"name": "jobs by id", "collection": "jobs",
+     "filter": {"_id": {"$in": [ObjectId("000000000000000000000000")]}}, "projection": {"tokens": 0}},
+    {"name": "jobs by (title, company)", "collection": "jobs",
+     "filter": {"$or": [{"title": "Data Scientist", "company": "TechNova"},
+                        {"title": "ML Engineer", "company": "DeepAI"}]},
+     "projection": {"title": 1, "company": 1, "content_hash": 1}},
+    {"name": "jobs by location", "collection": "jobs",
+     "filter": {"location": "Remote"}, "projection": {"title": 1, "company": 1, "location": 1}},
+    {"name": "job text search", "collection": "jobs",
+     "filter": {"$text": {"$search": "python"}}, "projection": {"title": 1, "company": 1}, "limit": 50},
+]
+
+
+def _plan_stages(plan):
+    """All stage names in an explain() plan tree (classic and SBE layouts)."""
+    stages = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if "stage" in node:
+            stages.append(node["stage"])
+        stack.extend(node.get(child) for child in ("inputStage", "queryPlan", "outerStage", "innerStage"))
+        stack.extend(node.get("inputStages", []))
+    return stages
+
+
+def _index_stages(collection, query):
+    """
+    Static stand-in for explain() on backends without a planner (mongomock):
+    a query counts as indexed when a field it filters (or, failing that, sorts)
+    on leads one of the collection's indexes.
+    """
+    indexes = [[("_id", 1)]] + [list(info["key"]) for info in collection.index_information().values()]
+
+    def _stage(filter_, sort):
+        if "$text" in filter_:
+            return "TEXT" if any(kind == "text" for keys in indexes for _, kind in keys) else "COLLSCAN"
+        if "$or" in filter_:
+            branches = [_stage(branch, None) for branch in filter_["$or"]]
+            return "COLLSCAN" if "COLLSCAN" in branches else "OR"
+        fields = [f for f in filter_ if not f.startswith("$")] or [f for f, _ in sort or []]
+        return "IXSCAN" if any(keys and keys[0][0] in fields for keys in indexes) else "COLLSCAN"
+
+    return [_stage(query["filter"], query.get("sort"))]
+
+
+def explain_query(collection, query):
+    """Stage names of the winning plan for one HOT_QUERIES entry."""
+    cursor = collection.find(query["filter"], query.get("projection"))
+    if query.get("sort"):
+        cursor = cursor.sort(query["sort"])
+    if query.get("limit"):
+        cursor = cursor.limit(query["limit"])
+    if not hasattr(cursor, "explain"):
+        return _index_stages(collection, query)
+    return _plan_stages(cursor.explain().get("queryPlanner", {}).get("winningPlan", {}))
+
+
+def check_query_plans(db=None, queries=HOT_QUERIES):
+    """
+    Explain every hot query. Returns {name: [stages]} for the queries that
+    scan a whole collection (COLLSCAN) or cannot be planned; empty means OK.
+    """
+    db = get_db() if db is None else db
+    failures = {}
+    for query in queries:
+        try:
+            stages = explain_query(db[query["collection"]], query)
+        except PyMongoError as e:  # e.g. $text without a text index
+            stages = [f"ERROR: {e}"]
+        if "COLLSCAN" in stages or any(stage.startswith("ERROR") for stage in stages):
+            failures[query["name"]] = stages
+    return failures
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+if __name__ == "__main__":
+    # python -m app.db_schema          -> create indexes, then check query plans
+    # python -m app.db_schema --check  -> only check query plans
+    if "--check" not in sys.argv:
+        print(ensure_indexes(force=True))
+    failures = check_query_plans()
+    for name, stages in failures.items():
+        print(f"⚠️ {name}: {' -> '.join(stages)}")
+    if failures:
+        sys.exit(1)
+    print(f"✅ All {len(HOT_QUERIES)} hot queries use an index.")
@@ -0,0 +1,172 @@
+import io
+import sys
+import csv
+import json
+import time
+import tempfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+from app.db_schema import RESUME_PROJECTION
+from app.mongodb_config import jobs_collection, resumes_collection
+from app.pagination import iter_batches
+
+FORMATS = ("ndjson", "csv", "parquet")
+AVAILABLE_FORMATS = tuple(fmt for fmt in FORMATS if fmt != "parquet" or pa is not None)
+MIME_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Exported columns per collection (CSV / Parquet need a fixed header up front)
+EXPORT_FIELDS = {
+    "resumes": [field for field in RESUME_PROJECTION if field != "Error"],
+    "jobs": ["title", "company", "location", "description", "skills_required", "link", "updated"],
+}
+COLLECTIONS = {"resumes": resumes_collection, "jobs": jobs_collection}
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def _cell(value):
+    """Flat string value for CSV / Parquet cells."""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(v) for v in value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_export_batches(collection, fields, batch_size=1000, query=None):
+    """Documents (only `fields`, no _id) in _id-ordered batches; one batch in memory at a time."""
+    projection = {field: 1 for field in fields}
+    for batch in iter_batches(collection, batch_size=batch_size, projection=projection, query=query):
+        # copies: the keyset cursor still needs the batch's last _id
+        yield [{k: v for k, v in doc.items() if k != "_id"} for doc in batch]
+
+
+# ---------------------------
+# Encoders (batches -> byte chunks)
+# ---------------------------
+def ndjson_chunks(batches):
+    for batch in batches:
+        yield "".join(json.dumps(doc, default=str, ensure_ascii=False) + "\n" for doc in batch).encode("utf-8")
+
+
+def csv_chunks(batches, fields):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows({field: _cell(doc.get(field)) for field in fields} for doc in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def write_parquet(batches, fields, sink):
+    """One row group per batch, all columns as strings (schema fixed up front)."""
+    if pa is None:
+        raise ImportError("⚠️ Parquet export needs the pyarrow package")
+    schema = pa.schema([(field, pa.string()) for field in fields])
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            columns = {field: [_cell(doc.get(field)) for doc in batch] for field in fields}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+
+# ---------------------------
+# Export entry points
+# ---------------------------
+def export_collection(collection, fmt, out, fields, batch_size=1000, query=None):
+    """
+    Stream a collection into `out` (path or binary file object) as NDJSON,
+    CSV or Parquet. Memory stays at one batch regardless of collection size.
+    Returns {"docs", "bytes", "seconds"}.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"⚠️ Unknown export format: {fmt}")
+    start = time.perf_counter()
+    stats = {"docs": 0}
+
+    def _counted(batches):
+        for batch in batches:
+            stats["docs"] += len(batch)
+            yield batch
+
+    batches = _counted(iter_export_batches(collection, fields, batch_size, query))
+    close = isinstance(out, str)
+    f = open(out, "wb") if close else out
+    try:
+        if fmt == "parquet":
+            start_pos = f.tell()
+            write_parquet(batches, fields, f)
+            stats["bytes"] = f.tell() - start_pos
+        else:
+            stats["bytes"] = 0
+            chunks = ndjson_chunks(batches) if fmt == "ndjson" else csv_chunks(batches, fields)
+            for chunk in chunks:
+                f.write(chunk)
+                stats["bytes"] += len(chunk)
+        f.flush()
+    finally:
+        if close:
+            f.close()
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def iter_export(collection, fmt, fields, batch_size=1000, query=None, chunk_size=1 << 20):
+    """Export as a generator of byte chunks (e.g. for an HTTP/Streamlit response)."""
+    if fmt == "parquet":  # Parquet needs a seekable sink: spool to disk, then stream it back
+        with export_to_tempfile(collection, fmt, fields, batch_size, query) as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+        return
+    batches = iter_export_batches(collection, fields, batch_size, query)
+    yield from (ndjson_chunks(batches) if fmt == "ndjson" else csv_chunks(batches, fields))
+
+
+def export_to_tempfile(collection, fmt, fields, batch_size=1000, query=None, max_memory=8 << 20):
+    """
+    Export into a SpooledTemporaryFile (in memory up to `max_memory`, then on
+    disk), rewound and ready to hand to st.download_button.
+    """
+    f = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    export_collection(collection, fmt, f, fields, batch_size, query)
+    f.seek(0)
+    return f
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+if __name__ == "__main__":
+    # python -m app.exporter resumes resumes.ndjson
+    # python -m app.exporter jobs jobs.parquet [--format parquet] [--batch-size 2000]
+    import argparse
+    parser = argparse.ArgumentParser(description="Stream a collection to NDJSON / CSV / Parquet.")
+    parser.add_argument("collection", choices=sorted(COLLECTIONS))
+    parser.add_argument("output", help="output file path ('-' for stdout, NDJSON/CSV only)")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the output file extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    extension = args.output.rsplit(".", 1)[-1].lower()
+    fmt = args.format or {"jsonl": "ndjson", "json": "ndjson"}.get(extension, extension)
+    out = sys.stdout.buffer if args.output == "-" else args.output
+    result = export_collection(COLLECTIONS[args.collection], fmt, out, EXPORT_FIELDS[args.collection],
+                               batch_size=args.batch_size)
+    print(f"✅ Exported {result['docs']} {args.collection} ({result['bytes']} bytes) in {result['seconds']}s",
+          file=sys.stderr)
@@ -0,0 +1,167 @@
+import os
+import time
+import random
+import threading
+from collections import defaultdict, deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))          # keep-alive connections per host
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", 4))     # concurrent requests per host
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.5))  # seconds
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", 30))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+def _retry_after(response):
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP-date), if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------------------
+# Shared client
+# ---------------------------
+class HttpClient:
+    """
+    Connection-pooled requests.Session shared by the Groq and Jooble clients.
+    - keep-alive pool per host, bounded concurrency per host (a stream=True
+      response holds its slot until it is closed)
+    - retries 429/5xx and connection errors with exponential backoff + full
+      jitter, honouring Retry-After; read timeouts only for idempotent
+      requests (a timed-out POST may have been processed, e.g. a paid Groq
+      completion - pass idempotent=True for read-only POSTs like searches)
+    - per-host latency / retry / error metrics
+    """
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, max_per_host=HTTP_MAX_PER_HOST,
+                 max_retries=HTTP_MAX_RETRIES, backoff_base=HTTP_BACKOFF_BASE, backoff_max=HTTP_BACKOFF_MAX):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._metrics = defaultdict(lambda: {
+            "requests": 0, "retries": 0, "errors": 0, "latency": deque(maxlen=1000),
+        })
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[host]
+
+    @staticmethod
+    def _release_on_close(response, slot):
+        """Keep a streamed response's slot until the caller closes it (the body is read after request())."""
+        close, released = response.close, []
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released:
+                    released.append(True)
+                    slot.release()
+        response.close = close_and_release
+
+    def _backoff(self, attempt, response=None):
+        delay = _retry_after(response) if response is not None else None
+        if delay is None:
+            delay = random.uniform(0, self.backoff_base * (2 ** attempt))
+        return min(delay, self.backoff_max)
+
+    def _record(self, host, key, value=1):
+        with self._lock:
+            if key == "latency":
+                self._metrics[host]["latency"].append(value)
+            else:
+                self._metrics[host][key] += value
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """
+        Send a request with pooling, per-host limits and retries; returns the
+        final Response. `idempotent` (default: by method) allows retrying
+        after a read timeout.
+        """
+        host = urlsplit(url).netloc
+        idempotent = method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        slot = self._slot(host)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            slot.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                slot.release()
+                self._record(host, "errors")
+                # a read timeout means the request was sent (and maybe processed)
+                sent = isinstance(e, requests.exceptions.ReadTimeout)
+                if attempt >= self.max_retries or (sent and not idempotent):
+                    raise
+                response = None
+            except BaseException:
+                slot.release()
+                raise
+            else:
+                self._record(host, "requests")
+                self._record(host, "latency", time.perf_counter() - start)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    if kwargs.get("stream"):
+                        self._release_on_close(response, slot)
+                    else:
+                        slot.release()
+                    return response
+                response.close()
+                slot.release()
+
+            self._record(host, "retries")
+            time.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def metrics(self):
+        """Per-host counters and latency percentiles (ms) over recent requests."""
+        with self._lock:
+            snapshot = {}
+            for host, m in self._metrics.items():
+                latency = sorted(m["latency"])
+                pick = lambda q: round(latency[min(len(latency) - 1, int(q * len(latency)))] * 1000, 1)
+                snapshot[host] = {
+                    "requests": m["requests"],
+                    "retries": m["retries"],
+                    "errors": m["errors"],
+                    "p50_ms": pick(0.5) if latency else None,
+                    "p95_ms": pick(0.95) if latency else None,
+                    "max_ms": round(latency[-1] * 1000, 1) if latency else None,
+                }
+            return snapshot
+
+
+http_client = HttpClient()
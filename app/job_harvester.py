@@ -0,0 +1,161 @@
+import sys
+import math
+import time
+import asyncio
+
+from app.http_client import http_client
+from app.jobs_utils import JOOBLE_API_KEY, JOOBLE_API_URL, save_jobs_to_mongo
+
+
+# ---------------------------
+# Rate limiting
+# ---------------------------
+class RateLimiter:
+    """Async token bucket: at most `rate` requests per second overall (small bursts allowed)."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _job_key(job):
+    """Same identity as the MongoDB upsert key: (title, company), matched exactly."""
+    return job.get("title") or "", job.get("company") or ""
+
+
+# ---------------------------
+# Harvester
+# ---------------------------
+class JoobleHarvester:
+    """
+    Concurrent multi-query, multi-page Jooble fetcher.
+    Page 1 of every query is fetched first to learn totalCount; the remaining
+    pages are then fetched concurrently. All requests share one global rate
+    limit and go through the pooled HTTP client (run in worker threads).
+    Unique jobs are streamed to `sink` in batches while fetching continues.
+    """
+
+    def __init__(self, api_key=JOOBLE_API_KEY, base_url=JOOBLE_API_URL, max_pages=5,
+                 concurrency=8, rate_per_sec=5.0, batch_size=100, sink=save_jobs_to_mongo):
+        self.url = f"{base_url}{api_key}"
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.rate_per_sec = rate_per_sec
+        self.batch_size = batch_size
+        self.sink = sink
+        self.stats = {"requests": 0, "errors": 0, "jobs_seen": 0, "invalid": 0, "duplicates": 0,
+                      "unique": 0, "batches": 0, "inserted": 0, "updated": 0}
+
+    async def _fetch_page(self, keywords, location, page):
+        async with self._semaphore:
+            await self._limiter.acquire()
+            payload = {"keywords": keywords, "location": location, "page": page}
+            self.stats["requests"] += 1
+            try:
+                response = await asyncio.to_thread(http_client.post, self.url, json=payload, timeout=20,
+                                                   idempotent=True)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"⚠️ Jooble API error ({keywords!r}, {location!r}, page {page}): {e}")
+                return {}
+
+    async def _emit(self, jobs):
+        for job in jobs:
+            self.stats["jobs_seen"] += 1
+            key = _job_key(job)
+            if not all(key):  # no title/company: save_jobs_to_mongo can't upsert it
+                self.stats["invalid"] += 1
+                continue
+            if key in self._seen:
+                self.stats["duplicates"] += 1
+                continue
+            self._seen.add(key)
+            self.stats["unique"] += 1
+            await self._queue.put(job)
+
+    async def _harvest_query(self, keywords, location):
+        first = await self._fetch_page(keywords, location, 1)
+        jobs = first.get("jobs", [])
+        await self._emit(jobs)
+        if not jobs:
+            return
+        total = first.get("totalCount") or len(jobs)
+        pages = min(self.max_pages, math.ceil(total / len(jobs)))
+
+        async def _page(page):
+            await self._emit((await self._fetch_page(keywords, location, page)).get("jobs", []))
+
+        await asyncio.gather(*(_page(page) for page in range(2, pages + 1)))
+
+    async def _save_batches(self):
+        batch = []
+        while True:
+            job = await self._queue.get()
+            if job is not None:
+                batch.append(job)
+            if batch and (job is None or len(batch) >= self.batch_size):
+                try:
+                    result = await asyncio.to_thread(self.sink, batch) or {}
+                except Exception as e:  # keep draining so fetchers never block on a full queue
+                    print(f"⚠️ Failed to save {len(batch)} harvested jobs: {e}")
+                    result = {}
+                self.stats["batches"] += 1
+                self.stats["inserted"] += result.get("inserted", 0)
+                self.stats["updated"] += result.get("updated", 0)
+                batch = []
+            if job is None:
+                return
+
+    async def run(self, queries):
+        """Harvest [(keywords, location), ...]; returns stats incl. wall time and jobs/sec."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = RateLimiter(self.rate_per_sec)
+        self._queue = asyncio.Queue(maxsize=self.batch_size * 4)
+        self._seen = set()
+
+        start = time.perf_counter()
+        saver = asyncio.create_task(self._save_batches())
+        try:
+            await asyncio.gather(*(self._harvest_query(k, l) for k, l in queries))
+        finally:
+            await self._queue.put(None)
+            await saver
+
+        elapsed = time.perf_counter() - start
+        self.stats["seconds"] = round(elapsed, 2)
+        self.stats["jobs_per_sec"] = round(self.stats["unique"] / elapsed, 1) if elapsed else 0.0
+        return dict(self.stats)
+
+
+def harvest_jobs(queries, **kwargs):
+    """Synchronous entry point: harvest [(keywords, location), ...] into MongoDB."""
+    if not JOOBLE_API_KEY and "api_key" not in kwargs:
+        return {"error": "⚠️ JOOBLE_API_KEY not found. Skipping API fetch."}
+    return asyncio.run(JoobleHarvester(**kwargs).run(queries))
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+if __name__ == "__main__":
+    # python -m app.job_harvester "Data Scientist:India" "Python Developer:Remote"
+    args = sys.argv[1:] or ["Data Scientist:India"]
+    queries = [tuple(arg.split(":", 1)) if ":" in arg else (arg, "India") for arg in args]
+    print(f"🔄 Harvesting {len(queries)} queries from Jooble...")
+    print(harvest_jobs(queries))
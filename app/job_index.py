@@ -0,0 +1,540 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import contextlib
+import numpy as np
+import scipy.sparse as sp
+from bson import ObjectId
+from pymongo import UpdateOne
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+from app.mongodb_config import jobs_collection
+from app.ats_checker import skill_count_matrix
+from app.skill_taxonomy import get_taxonomy
+
+try:
+    import fcntl
+except ImportError:  # Windows: the index lock only covers this process
+    fcntl = None
+
+BASE_DIR = os.path.dirname(__file__)
+JOB_INDEX_DIR = os.getenv("JOB_INDEX_DIR", os.path.join(BASE_DIR, "job_index"))
+
+# Fields that make up a job document for matching
+JOB_FIELDS = ("title", "company", "location", "description", "skills_required")
+JOB_PROJECTION = {field: 1 for field in JOB_FIELDS}
+
+# Derived fields stored on each job at write time (see "Precomputed job features")
+FEATURES_VERSION = 1  # bump when preprocessing, tokenization or the taxonomy changes
+FEATURE_FIELDS = ("norm_text", "tokens", "extracted_skills", "content_hash")
+ATS_JOB_FIELDS = ("title", "description", "skills_required")
+INDEX_PROJECTION = {"tokens": 1, "extracted_skills": 1, "location": 1}
+
+# Same tokenization/stop words as TfidfVectorizer(stop_words="english")
+_analyze = CountVectorizer(stop_words="english").build_analyzer()
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def preprocess(text):
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def job_record(job):
+    """A Jooble result or CSV row as stored in the jobs collection (the fields every import writes)."""
+    return {
+        "title": job.get("title"),
+        "company": job.get("company"),
+        "location": job.get("location"),
+        "description": job.get("description") or job.get("snippet"),
+        "skills_required": job.get("skills_required", ""),
+        "link": job.get("link"),
+        "updated": job.get("updated"),
+    }
+
+
+def job_document(job):
+    """Combine description + required skills (and headline fields) into one text."""
+    parts = [job.get(field) or "" for field in JOB_FIELDS]
+    return preprocess(" ".join(str(p) for p in parts))
+
+
+def job_tokens(job):
+    """Stored token list of a job, or tokenize its source fields if it has none."""
+    tokens = job.get("tokens")
+    return _analyze(job_document(job)) if tokens is None else tokens
+
+
+def job_skills(job):
+    """Stored {skill: count} of a job, or scan its ATS fields if it has none."""
+    pairs = job.get("extracted_skills")
+    if pairs is None:
+        return get_taxonomy().find(" ".join(str(job.get(field) or "") for field in ATS_JOB_FIELDS))
+    return dict(pairs)
+
+
+def to_object_id(job_id):
+    """Index ids are stored as strings; turn them back into ObjectIds where possible."""
+    return ObjectId(job_id) if ObjectId.is_valid(job_id) else job_id
+
+
+def count_terms(texts, vocabulary, terms=None):
+    """
+    Term-count CSR rows for texts (or pre-tokenized lists) over vocabulary (term -> column).
+    If the terms list is given, unseen terms are appended to it (and to vocabulary);
+    otherwise they are ignored.
+    """
+    indptr, indices, data = [0], [], []
+    for text in texts:
+        row = {}
+        for term in (text if isinstance(text, list) else _analyze(text)):
+            col = vocabulary.get(term)
+            if col is None:
+                if terms is None:
+                    continue
+                col = len(terms)
+                vocabulary[term] = col
+                terms.append(term)
+            row[col] = row.get(col, 0) + 1
+        indices.extend(row.keys())
+        data.extend(row.values())
+        indptr.append(len(indices))
+    return sp.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(texts), len(vocabulary)),
+    )
+
+
+# ---------------------------
+# Vectorizer (vocabulary + IDF)
+# ---------------------------
+class JobVectorizer:
+    """Frozen vocabulary + IDF weights; turns texts into L2-normalized TF-IDF rows."""
+
+    def __init__(self, terms, idf):
+        self.terms = list(terms)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+
+    def transform(self, texts):
+        """TF-IDF vectors for texts (resumes or job documents) using the job vocabulary."""
+        if isinstance(texts, str):
+            texts = [texts]
+        counts = count_terms(texts, self.vocabulary)
+        return normalize(counts @ sp.diags(self.idf)).tocsr()
+
+    @classmethod
+    def load(cls, path=JOB_INDEX_DIR):
+        """Load just the vocabulary + IDF of a saved index (no job matrix), or None."""
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(meta["terms"], np.load(os.path.join(path, "idf.npy")))
+
+
+# ---------------------------
+# Job Index
+# ---------------------------
+class JobIndex:
+    """
+    TF-IDF index over job documents.
+    Rows are stored as raw term counts together with document frequencies, so
+    jobs can be added/removed without refitting and IDF stays exact. A
+    row-aligned skill-count matrix (taxonomy columns) and location list are
+    kept alongside (for skill overlap scoring and prefiltering).
+    """
+
+    def __init__(self, terms=None, doc_freq=None, counts=None, job_ids=None, skills=None, locations=None):
+        self.terms = list(terms or [])
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.doc_freq = np.zeros(len(self.terms), dtype=np.int64)
+        if doc_freq is not None:
+            self.doc_freq = np.asarray(doc_freq, dtype=np.int64)
+        self.job_ids = list(job_ids or [])
+        self._row_of = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        if counts is None:
+            counts = sp.csr_matrix((0, len(self.terms)), dtype=np.float32)
+        self.counts = counts.tocsr()
+        if skills is None:
+            skills = sp.csr_matrix((self.counts.shape[0], len(get_taxonomy())), dtype=np.int32)
+        self.skills = skills.tocsr()
+        self.locations = list(locations) if locations is not None else [""] * len(self.job_ids)
+        self._weighted = None
+        self.version = 0   # bumped on every change, lets derived indexes detect staleness
+        self.removals = 0  # bumped when rows are removed (or re-upserted): row numbers moved
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def __contains__(self, job_id):
+        return str(job_id) in self._row_of
+
+    @classmethod
+    def build(cls, jobs):
+        """Fit an index from an iterable of job documents (must include _id)."""
+        index = cls()
+        index.upsert(jobs)
+        return index
+
+    # --- Weights ---
+    @property
+    def idf(self):
+        """Smoothed IDF as in sklearn; terms no longer in any job get weight 0."""
+        n_docs = len(self.job_ids)
+        idf = np.log((1 + n_docs) / (1 + self.doc_freq)) + 1.0
+        idf[self.doc_freq == 0] = 0.0
+        return idf.astype(np.float32)
+
+    def weighted_matrix(self):
+        """L2-normalized TF-IDF job matrix (CSR), cached until the index changes."""
+        if self._weighted is None:
+            self._weighted = normalize(self.counts @ sp.diags(self.idf)).tocsr()
+        return self._weighted
+
+    # --- Vectorizing ---
+    def vectorizer(self):
+        """Snapshot of the current vocabulary + IDF."""
+        return JobVectorizer(self.terms, self.idf)
+
+    def transform(self, texts):
+        """TF-IDF vectors for query texts (e.g. resumes) using the job vocabulary."""
+        return self.vectorizer().transform(texts)
+
+    def score(self, text):
+        """Cosine similarity of one text against every job row."""
+        if not len(self):
+            return np.zeros(0, dtype=np.float32)
+        query = self.transform(text)
+        return (self.weighted_matrix() @ query.T).toarray().ravel()
+
+    def top_matches(self, queries, top_n=5, max_chunk_bytes=64 * 1024 * 1024):
+        """
+        Top-N jobs for every row of a TF-IDF query matrix (e.g. many resumes).
+        Similarities are computed as one sparse product per chunk of queries,
+        sized so the dense chunk x jobs block stays under max_chunk_bytes.
+        Returns one [(row, similarity), ...] list per query, best first.
+        """
+        n_jobs = len(self)
+        top_n = min(top_n, n_jobs)
+        if top_n <= 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        job_matrix_t = self.weighted_matrix().T.tocsr()
+        chunk_size = max(1, max_chunk_bytes // (4 * n_jobs))
+        results = []
+        for start in range(0, queries.shape[0], chunk_size):
+            sims = (queries[start:start + chunk_size] @ job_matrix_t).toarray()
+            best = np.argpartition(-sims, top_n - 1, axis=1)[:, :top_n]
+            best_sims = np.take_along_axis(sims, best, axis=1)
+            order = np.argsort(-best_sims, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_sims = np.take_along_axis(best_sims, order, axis=1)
+            results.extend(
+                [(int(r), float(v)) for r, v in zip(rows, vals)] for rows, vals in zip(best, best_sims)
+            )
+        return results
+
+    # --- Incremental updates ---
+    def _resize_columns(self):
+        n_skills = len(get_taxonomy())
+        if self.skills.shape[1] < n_skills:  # taxonomy grew
+            s = self.skills
+            self.skills = sp.csr_matrix((s.data, s.indices, s.indptr), shape=(s.shape[0], n_skills))
+        n_terms = len(self.terms)
+        if self.counts.shape[1] != n_terms:
+            c = self.counts
+            self.counts = sp.csr_matrix((c.data, c.indices, c.indptr), shape=(c.shape[0], n_terms))
+        if len(self.doc_freq) != n_terms:
+            self.doc_freq = np.concatenate(
+                [self.doc_freq, np.zeros(n_terms - len(self.doc_freq), dtype=np.int64)]
+            )
+
+    def remove(self, job_ids):
+        """Drop jobs from the index. Returns the number of rows removed."""
+        rows = sorted({self._row_of[str(j)] for j in job_ids if str(j) in self._row_of})
+        if not rows:
+            return 0
+        removed = self.counts[rows]
+        self.doc_freq -= np.bincount(removed.indices, minlength=len(self.terms))
+        keep = np.ones(len(self.job_ids), dtype=bool)
+        keep[rows] = False
+        self.counts = self.counts[keep]
+        self.skills = self.skills[keep]
+        self.locations = [loc for loc, k in zip(self.locations, keep) if k]
+        self.job_ids = [j for j, k in zip(self.job_ids, keep) if k]
+        self._row_of = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        self._weighted = None
+        self.version += 1
+        self.removals += 1
+        return len(rows)
+
+    def upsert(self, jobs):
+        """Add or replace jobs (documents with _id + job fields)."""
+        latest = {}
+        for job in jobs:
+            latest[str(job["_id"])] = job
+        if not latest:
+            return 0
+
+        self.remove(latest.keys())
+        new_rows = count_terms([job_tokens(job) for job in latest.values()], self.vocabulary, self.terms)
+        self._resize_columns()
+        self.doc_freq += np.bincount(new_rows.indices, minlength=len(self.terms))
+        self.counts = sp.vstack([self.counts, new_rows], format="csr")
+        new_skills = skill_count_matrix(job_skills(job) for job in latest.values())
+        self.skills = sp.vstack([self.skills, new_skills], format="csr")
+        self.locations.extend(str(job.get("location") or "") for job in latest.values())
+        start = len(self.job_ids)
+        self.job_ids.extend(latest.keys())
+        self._row_of.update({job_id: start + i for i, job_id in enumerate(latest.keys())})
+        self._weighted = None
+        self.version += 1
+        return len(latest)
+
+    # --- Persistence ---
+    def save(self, path=JOB_INDEX_DIR):
+        """Write vocabulary, IDF weights and the CSR count matrix to disk."""
+        os.makedirs(path, exist_ok=True)
+
+        def _atomic(name, write):
+            tmp = os.path.join(path, f".{name}.tmp")
+            with open(tmp, "wb") as f:
+                write(f)
+            os.replace(tmp, os.path.join(path, name))
+
+        _atomic("counts.npz", lambda f: sp.save_npz(f, self.counts))
+        _atomic("skills.npz", lambda f: sp.save_npz(f, self.skills))
+        _atomic("doc_freq.npy", lambda f: np.save(f, self.doc_freq))
+        _atomic("idf.npy", lambda f: np.save(f, self.idf))
+        _atomic("job_ids.json", lambda f: f.write(json.dumps(self.job_ids).encode("utf-8")))
+        _atomic("locations.json", lambda f: f.write(json.dumps(self.locations).encode("utf-8")))
+        # meta.json is written last: its mtime marks a complete index
+        meta = {"terms": self.terms, "n_jobs": len(self.job_ids)}
+        _atomic("meta.json", lambda f: f.write(json.dumps(meta).encode("utf-8")))
+
+    @classmethod
+    def load(cls, path=JOB_INDEX_DIR):
+        """Load a saved index, or return None if there isn't one (or it predates skill/location rows)."""
+        meta_path = os.path.join(path, "meta.json")
+        if not all(os.path.exists(os.path.join(path, name)) for name in ("meta.json", "skills.npz", "locations.json")):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "job_ids.json"), "r", encoding="utf-8") as f:
+            job_ids = json.load(f)
+        with open(os.path.join(path, "locations.json"), "r", encoding="utf-8") as f:
+            locations = json.load(f)
+        return cls(
+            terms=meta["terms"],
+            doc_freq=np.load(os.path.join(path, "doc_freq.npy")),
+            counts=sp.load_npz(os.path.join(path, "counts.npz")),
+            job_ids=job_ids,
+            skills=sp.load_npz(os.path.join(path, "skills.npz")),
+            locations=locations,
+        )
+
+
+# ---------------------------
+# Precomputed job features
+# ---------------------------
+def content_hash(job):
+    """Hash of the source fields the features are derived from (and the feature version)."""
+    h = hashlib.sha1(f"v{FEATURES_VERSION}".encode())
+    for field in JOB_FIELDS:
+        h.update(b"\x1f" + str(job.get(field) or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def compute_job_features(job):
+    """Normalized text, index tokens, [skill, count] pairs and content hash of a job."""
+    norm_text = job_document(job)
+    skills = get_taxonomy().find(" ".join(str(job.get(field) or "") for field in ATS_JOB_FIELDS))
+    return {
+        "norm_text": norm_text,
+        "tokens": _analyze(norm_text),
+        # pairs rather than a dict: skill keys like "node.js" can't be MongoDB field names
+        "extracted_skills": sorted([skill, count] for skill, count in skills.items()),
+        "content_hash": content_hash(job),
+    }
+
+
+def prepare_job_features(docs, collection=None, batch_size=500):
+    """
+    Add features to job docs about to be upserted by (title, company).
+    Features are only recomputed for jobs that are new or whose source fields
+    changed (content hash differs from the stored one). Returns the
+    (title, company) keys of those jobs.
+    """
+    collection = jobs_collection if collection is None else collection
+    docs = [doc for doc in docs if doc.get("title") and doc.get("company")]
+    stored = {}
+    for start in range(0, len(docs), batch_size):
+        chunk = docs[start:start + batch_size]
+        query = {"$or": [{"title": d["title"], "company": d["company"]} for d in chunk]}
+        for job in collection.find(query, {"title": 1, "company": 1, "content_hash": 1}):
+            stored[(job.get("title"), job.get("company"))] = job.get("content_hash")
+
+    changed = []
+    for doc in docs:
+        key = (doc["title"], doc["company"])
+        digest = content_hash(doc)
+        if stored.get(key) != digest:
+            doc.update(compute_job_features(doc))
+            changed.append(key)
+    return changed
+
+
+def ensure_job_features(jobs, collection=None, fields=FEATURE_FIELDS):
+    """
+    Fill in features for projected job docs written before features existed:
+    their source fields are fetched once, features computed and stored back.
+    """
+    missing = [job for job in jobs if any(field not in job for field in fields)]
+    if not missing:
+        return jobs
+    collection = jobs_collection if collection is None else collection
+    sources = {job["_id"]: job for job in collection.find({"_id": {"$in": [j["_id"] for j in missing]}},
+                                                          JOB_PROJECTION)}
+    ops = []
+    for job in missing:
+        features = compute_job_features(sources.get(job["_id"], job))
+        job.update({field: features[field] for field in fields})
+        ops.append(UpdateOne({"_id": job["_id"]}, {"$set": features}))
+    collection.bulk_write(ops, ordered=False)
+    return jobs
+
+
+def backfill_job_features(collection=None, batch_size=500, force=False):
+    """
+    Compute features for jobs that have none. With force=True every job's
+    content hash is re-checked (e.g. after bumping FEATURES_VERSION) and only
+    stale jobs are recomputed. Returns the number of jobs updated.
+    """
+    collection = jobs_collection if collection is None else collection
+    query = {} if force else {"tokens": {"$exists": False}}
+    projection = {**JOB_PROJECTION, "content_hash": 1}
+    updated, last_id = 0, None
+    while True:
+        page_query = dict(query)
+        if last_id is not None:
+            page_query["_id"] = {"$gt": last_id}
+        batch = list(collection.find(page_query, projection).sort("_id", 1).limit(batch_size))
+        if not batch:
+            return updated
+        last_id = batch[-1]["_id"]
+        ops = [
+            UpdateOne({"_id": job["_id"]}, {"$set": compute_job_features(job)})
+            for job in batch
+            if not force or job.get("content_hash") != content_hash(job)
+        ]
+        if ops:
+            collection.bulk_write(ops, ordered=False)
+            updated += len(ops)
+
+
+# ---------------------------
+# Shared (persisted) index
+# ---------------------------
+_lock = threading.Lock()
+_cached = {"index": None, "stamp": None}
+
+
+@contextlib.contextmanager
+def _index_lock(path, exclusive=True):
+    """
+    Lock on the index directory, shared with the other processes using it
+    (the app, the job refresher worker, CLIs): exclusive around
+    load-modify-write, shared around loads. Threads serialize on _lock.
+    """
+    with _lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(os.path.join(path, "meta.json"))
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_ino, stat.st_size  # meta.json is replaced on every save
+
+
+def _store(index, path):
+    index.save(path)
+    _cached["index"], _cached["stamp"] = index, _stamp(path)
+
+
+def build_job_index(collection=None, path=JOB_INDEX_DIR):
+    """(Re)build the index from the whole jobs collection and persist it."""
+    collection = jobs_collection if collection is None else collection
+    backfill_job_features(collection)
+    with _index_lock(path):
+        index = JobIndex.build(collection.find({}, INDEX_PROJECTION))
+        _store(index, path)
+        return index
+
+
+def get_job_index(collection=None, path=JOB_INDEX_DIR):
+    """
+    Return the persisted job index, reloading it if another process rewrote it
+    and building it from MongoDB on first use.
+    """
+    with _index_lock(path, exclusive=False):
+        stamp = _stamp(path)
+        if stamp is not None and stamp == _cached["stamp"]:
+            return _cached["index"]
+        index = JobIndex.load(path) if stamp is not None else None
+        if index is not None:
+            _cached["index"], _cached["stamp"] = index, stamp
+            return index
+    return build_job_index(collection, path)
+
+
+def update_job_index(jobs=(), removed_ids=(), path=JOB_INDEX_DIR):
+    """
+    Apply upserted jobs / deleted job ids to the persisted index (no-op until
+    it exists). Load, change and save happen under the directory lock, and the
+    index is reloaded if another process saved it since, so no change is lost.
+    """
+    with _index_lock(path):
+        stamp = _stamp(path)
+        if stamp is None:
+            return None
+        index = _cached["index"] if stamp == _cached["stamp"] else JobIndex.load(path)
+        if index is None:  # outdated on-disk format: rebuilt on next get_job_index()
+            return None
+        index.remove(removed_ids)
+        index.upsert(jobs)
+        _store(index, path)
+        return index
+
+
+def sync_jobs_to_index(keys, collection=None, path=JOB_INDEX_DIR, batch_size=500):
+    """Re-read the (title, company) keys just written to MongoDB and upsert them into the index."""
+    collection = jobs_collection if collection is None else collection
+    if _stamp(path) is None:
+        return None
+    keys = list(keys)
+    jobs = []
+    for start in range(0, len(keys), batch_size):
+        query = {"$or": [{"title": t, "company": c} for t, c in keys[start:start + batch_size]]}
+        jobs.extend(ensure_job_features(list(collection.find(query, INDEX_PROJECTION)), collection,
+                                        ("tokens", "extracted_skills")))
+    return update_job_index(jobs=jobs, path=path)
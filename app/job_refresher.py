@@ -0,0 +1,282 @@
+import os
+import sys
+import time
+import socket
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.mongodb_config import refresh_queries_collection, refresh_state_collection
+from app.jobs_utils import fetch_from_jooble, save_jobs_to_mongo
+
+DEFAULT_INTERVAL_MINUTES = int(os.getenv("REFRESH_INTERVAL_MINUTES", "60"))
+MAX_PAGES = int(os.getenv("REFRESH_MAX_PAGES", "5"))
+LOCK_TTL_SECONDS = 300
+POLL_SECONDS = 30
+
+LOCK_ID = "job_refresh_lock"
+STATUS_ID = "job_refresh_status"
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)  # MongoDB stores naive UTC
+
+
+def parse_updated(value):
+    """Jooble 'updated' (e.g. 2026-01-01T10:00:00.0000000) -> datetime, or None."""
+    if not value:
+        return None
+    text = str(value).rstrip("Z")
+    if "." in text:  # fromisoformat only takes up to 6 fractional digits
+        head, frac = text.split(".", 1)
+        text = f"{head}.{frac[:6]}"
+    try:
+        return datetime.fromisoformat(text).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+# ---------------------------
+# Saved queries
+# ---------------------------
+def add_saved_query(keywords, location, interval_minutes=DEFAULT_INTERVAL_MINUTES, collection=None):
+    collection = refresh_queries_collection if collection is None else collection
+    collection.update_one(
+        {"keywords": keywords, "location": location},
+        {"$set": {"interval_minutes": interval_minutes, "enabled": True},
+         "$setOnInsert": {"last_run": None, "watermark": None}},
+        upsert=True,
+    )
+    return {"success": True}
+
+
+def remove_saved_query(keywords, location, collection=None):
+    collection = refresh_queries_collection if collection is None else collection
+    collection.delete_one({"keywords": keywords, "location": location})
+    return {"success": True}
+
+
+def list_saved_queries(collection=None):
+    collection = refresh_queries_collection if collection is None else collection
+    return list(collection.find({}, {"_id": 0}).sort([("keywords", 1), ("location", 1)]))
+
+
+def due_queries(now=None, force=False, collection=None):
+    """Enabled saved queries whose interval has elapsed (all of them if force)."""
+    collection = refresh_queries_collection if collection is None else collection
+    now = now or _now()
+    due = []
+    for query in collection.find({"enabled": True}):
+        last_run = query.get("last_run")
+        interval = timedelta(minutes=query.get("interval_minutes", DEFAULT_INTERVAL_MINUTES))
+        if force or last_run is None or last_run + interval <= now:
+            due.append(query)
+    return due
+
+
+# ---------------------------
+# Lease lock (one refresher across processes/sessions)
+# ---------------------------
+class LeaseLock:
+    """
+    MongoDB lease: a single document owned by one worker until it expires.
+    An expired lease can be taken over, so a crashed worker never blocks
+    refreshes for longer than the TTL.
+    """
+
+    def __init__(self, collection, owner, ttl=LOCK_TTL_SECONDS, lock_id=LOCK_ID):
+        self.collection = collection
+        self.owner = owner
+        self.ttl = ttl
+        self.lock_id = lock_id
+
+    def acquire(self, now=None):
+        """Take or renew the lease; False if another live owner holds it."""
+        now = now or _now()
+        try:
+            self.collection.find_one_and_update(
+                {"_id": self.lock_id, "$or": [{"expires_at": {"$lt": now}}, {"owner": self.owner}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.ttl)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            return True
+        except DuplicateKeyError:  # lock document exists and belongs to someone else
+            return False
+
+    renew = acquire
+
+    def release(self):
+        self.collection.delete_one({"_id": self.lock_id, "owner": self.owner})
+
+
+class LeaseLost(Exception):
+    """Another worker took the lease over (ours expired mid-refresh)."""
+
+
+# ---------------------------
+# Status (the only thing the UI reads)
+# ---------------------------
+def _set_status(fields, collection=None):
+    collection = refresh_state_collection if collection is None else collection
+    collection.update_one({"_id": STATUS_ID}, {"$set": fields}, upsert=True)
+
+
+def get_refresh_status(collection=None):
+    collection = refresh_state_collection if collection is None else collection
+    return collection.find_one({"_id": STATUS_ID}, {"_id": 0}) or {"state": "never run"}
+
+
+def request_refresh(collection=None):
+    """Ask the worker to refresh every saved query on its next poll (non-blocking)."""
+    _set_status({"requested_at": _now()}, collection)
+    return {"success": True}
+
+
+# ---------------------------
+# Refresh
+# ---------------------------
+def refresh_query(query, max_pages=MAX_PAGES, fetch=fetch_from_jooble, save=save_jobs_to_mongo, on_page=None):
+    """
+    Incremental refresh of one saved query: only jobs whose `updated` is
+    newer than the query's watermark are saved, and paging stops at the
+    first page with nothing new. `on_page()` runs after every fetched page
+    (the scheduler renews its lease there). Returns (metrics, new watermark).
+    """
+    start = time.perf_counter()
+    watermark = query.get("watermark")
+    newest = watermark
+    metrics = {"keywords": query["keywords"], "location": query["location"],
+               "pages": 0, "fetched": 0, "new": 0, "inserted": 0, "updated": 0}
+    date_from = watermark.strftime("%Y-%m-%d") if watermark else None
+
+    fresh = []
+    for page in range(1, max_pages + 1):
+        jobs = fetch(query["keywords"], query["location"], page=page, limit=1000, date_from=date_from)
+        metrics["pages"] += 1
+        metrics["fetched"] += len(jobs)
+        page_new = []
+        for job in jobs:
+            updated = parse_updated(job.get("updated"))
+            if watermark is None or (updated is not None and updated > watermark):
+                page_new.append(job)
+            if updated is not None and (newest is None or updated > newest):
+                newest = updated
+        fresh.extend(page_new)
+        if on_page is not None:
+            on_page()
+        if not jobs or not page_new:
+            break
+
+    metrics["new"] = len(fresh)
+    if fresh:
+        result = save(fresh)
+        metrics["inserted"] = result.get("inserted", 0)
+        metrics["updated"] = result.get("updated", 0)
+    metrics["seconds"] = round(time.perf_counter() - start, 2)
+    return metrics, newest
+
+
+def run_due_refreshes(owner=None, force=False, queries_collection=None, state_collection=None, **kwargs):
+    """
+    One scheduler tick: take the lease, refresh every due saved query,
+    record per-query metrics in the status document, release the lease.
+    The lease is renewed after every page; if it was lost meanwhile the
+    tick stops without saving the query in progress.
+    """
+    queries_collection = refresh_queries_collection if queries_collection is None else queries_collection
+    state_collection = refresh_state_collection if state_collection is None else state_collection
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+
+    status = get_refresh_status(state_collection)
+    requested = status.get("requested_at")
+    force = force or bool(requested and requested > (status.get("last_started") or datetime.min))
+    due = due_queries(force=force, collection=queries_collection)
+    if not due:
+        return {"skipped": "nothing due"}
+
+    lock = LeaseLock(state_collection, owner)
+    if not lock.acquire():
+        return {"skipped": "another refresh is running"}
+
+    started = _now()
+    _set_status({"state": "running", "worker": owner, "last_started": started, "heartbeat": started},
+                state_collection)
+    results, errors = [], 0
+
+    def heartbeat():
+        if not lock.renew():
+            raise LeaseLost("⚠️ Refresh lease lost to another worker; stopped before saving the current query.")
+        _set_status({"heartbeat": _now()}, state_collection)
+
+    lost = None
+    try:
+        for query in due:
+            try:
+                metrics, watermark = refresh_query(query, on_page=heartbeat, **kwargs)
+            except LeaseLost:
+                raise
+            except Exception as e:
+                errors += 1
+                metrics, watermark = {"keywords": query["keywords"], "location": query["location"],
+                                      "error": f"⚠️ {e}"}, query.get("watermark")
+            results.append(metrics)
+            queries_collection.update_one({"_id": query["_id"]},
+                                          {"$set": {"last_run": _now(), "watermark": watermark}})
+            heartbeat()
+    except LeaseLost as e:
+        lost = str(e)
+    finally:
+        lock.release()
+        if lost is None:  # after a takeover the status document is the new owner's
+            _set_status({
+                "state": "error" if errors else "idle",
+                "last_finished": _now(),
+                "last_results": results,
+                "last_new_jobs": sum(m.get("new", 0) for m in results),
+            }, state_collection)
+    if lost:
+        return {"error": lost, "refreshed": len(results), "results": results}
+    return {"refreshed": len(results), "errors": errors, "results": results}
+
+
+# ---------------------------
+# Worker
+# ---------------------------
+def run_worker(poll_seconds=POLL_SECONDS):
+    """Poll forever: run due saved queries (or requested refreshes) every poll."""
+    print(f"🔄 Job refresher started (poll every {poll_seconds}s).")
+    while True:
+        try:
+            result = run_due_refreshes()
+            if "error" in result:
+                print(result["error"])
+            elif "skipped" not in result:
+                print(f"✅ Refreshed {result['refreshed']} queries ({result['errors']} errors).")
+        except Exception as e:
+            print(f"⚠️ Refresh tick failed: {e}")
+        time.sleep(poll_seconds)
+
+
+if __name__ == "__main__":
+    # python -m app.job_refresher                 -> run as a worker process
+    # python -m app.job_refresher --once          -> one tick (e.g. from cron)
+    # python -m app.job_refresher --add "Data Scientist:India" [--interval 60]
+    import argparse
+    parser = argparse.ArgumentParser(description="Background Jooble job refresher.")
+    parser.add_argument("--once", action="store_true")
+    parser.add_argument("--force", action="store_true", help="refresh all saved queries now")
+    parser.add_argument("--add", metavar="KEYWORDS:LOCATION")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL_MINUTES, help="minutes")
+    parser.add_argument("--poll", type=int, default=POLL_SECONDS, help="seconds between ticks")
+    args = parser.parse_args()
+
+    if args.add:
+        keywords, _, location = args.add.partition(":")
+        print(add_saved_query(keywords, location or "India", args.interval))
+        sys.exit(0)
+    if args.once or args.force:
+        print(run_due_refreshes(force=args.force))
+        sys.exit(0)
+    run_worker(args.poll)
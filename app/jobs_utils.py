@@ -1,43 +1,33 @@
 import os
-import re
-import requests
-import pandas as pd
 from dotenv import load_dotenv
 from pymongo import UpdateOne
+from app.http_client import http_client
 from app.mongodb_config import jobs_collection
+from app.job_index import job_record, prepare_job_features, sync_jobs_to_index
+from app.csv_importer import clean_col_names, import_jobs_csv  # noqa: F401 (clean_col_names re-exported)
 
 # Load env vars
 load_dotenv()
 JOOBLE_API_KEY = os.getenv("JOOBLE_API_KEY")
-
-
-# ---------------------------
-# Helpers
-# ---------------------------
-def clean_col_names(df):
-    """Normalize CSV column names."""
-    new_cols = []
-    for col in df.columns:
-        new_col = re.sub(r'[^A-Za-z0-9_]+', '', col.lower().strip().replace(' ', '_'))
-        new_cols.append(new_col)
-    df.columns = new_cols
-    return df
+JOOBLE_API_URL = os.getenv("JOOBLE_API_URL", "https://jooble.org/api/")
 
 
 # ---------------------------
 # Jooble API
 # ---------------------------
-def fetch_from_jooble(keywords="Python Developer", location="India", page=1, limit=20):
-    """Fetch jobs from Jooble API."""
+def fetch_from_jooble(keywords="Python Developer", location="India", page=1, limit=20, date_from=None):
+    """Fetch jobs from Jooble API (optionally only those created since date_from, YYYY-MM-DD)."""
     if not JOOBLE_API_KEY:
         print("⚠️ JOOBLE_API_KEY not found. Skipping API fetch.")
         return []
 
-    url = f"https://jooble.org/api/{JOOBLE_API_KEY}"
+    url = f"{JOOBLE_API_URL}{JOOBLE_API_KEY}"
     payload = {"keywords": keywords, "location": location, "page": page}
+    if date_from:
+        payload["datecreatedfrom"] = date_from
 
     try:
-        response = requests.post(url, json=payload, timeout=20)
+        response = http_client.post(url, json=payload, timeout=20, idempotent=True)  # a search: safe to retry
         response.raise_for_status()
         data = response.json()
         return data.get("jobs", [])[:limit]
@@ -50,30 +40,9 @@ def fetch_from_jooble(keywords="Python Developer", location="India", page=1, lim
 # CSV Import
 # ---------------------------
 def import_jobs_from_csv(csv_path="jobs_sample.csv"):
-    """Import jobs from CSV into MongoDB."""
-    try:
-        df = pd.read_csv(csv_path)
-    except Exception as e:
-        return {"error": f"⚠️ Failed to read CSV: {e}"}
-
-    if len(df.columns) == 1 and "," in df.columns[0]:
-        print("⚠️ Malformed header detected. Fixing...")
-        df = df[df.columns[0]].str.split(",", expand=True)
-        header_df = pd.read_csv(csv_path, nrows=0)
-        df.columns = [col.strip() for col in header_df.columns[0].split(",")]
-
-    df = clean_col_names(df)
-    print(f"Cleaned CSV columns: {list(df.columns)}")
-
-    if not {"title", "company"}.issubset(df.columns):
-        return {"error": "⚠️ CSV must contain 'title' and 'company' columns."}
-
-    initial_count = len(df)
-    df.dropna(subset=["title", "company"], inplace=True)
-    print(f"Filtered out {initial_count - len(df)} rows with missing title/company.")
-
-    records = df.to_dict(orient="records")
-    return save_jobs_to_mongo(records)
+    """Import jobs from CSV into MongoDB (streamed in chunks, upserted in unordered batches)."""
+    # same stored fields as save_jobs_to_mongo (Jooble imports)
+    return import_jobs_csv(csv_path, jobs_collection, mode="upsert", normalize=True)
 
 
 # ---------------------------
@@ -84,33 +53,32 @@ def save_jobs_to_mongo(job_list):
     if not job_list:
         return {"inserted": 0, "updated": 0, "message": "⚠️ No jobs to save."}
 
-    # Ensure unique index exists
-    jobs_collection.create_index([("title", 1), ("company", 1)], unique=True, sparse=True)
-
-    ops = []
-    for job in job_list:
-        doc = {
-            "title": job.get("title"),
-            "company": job.get("company"),
-            "location": job.get("location"),
-            "description": job.get("description") or job.get("snippet"),
-            "skills_required": job.get("skills_required", ""),
-            "link": job.get("link"),
-            "updated": job.get("updated"),
-        }
-        if doc["title"] and doc["company"]:
-            ops.append(
-                UpdateOne(
-                    {"title": doc["title"], "company": doc["company"]},
-                    {"$set": doc},
-                    upsert=True,
-                )
-            )
+    docs = [job_record(job) for job in job_list]
+
+    # Derived matching features, recomputed only for new/changed jobs
+    changed = prepare_job_features(docs, jobs_collection)
+
+    ops = [
+        UpdateOne(
+            {"title": doc["title"], "company": doc["company"]},
+            {"$set": doc},
+            upsert=True,
+        )
+        for doc in docs
+        if doc["title"] and doc["company"]
+    ]
 
     if not ops:
         return {"error": "⚠️ No valid operations created."}
 
     result = jobs_collection.bulk_write(ops)
+
+    # Keep the persisted matching index in step with the upserted jobs
+    try:
+        sync_jobs_to_index(changed)
+    except Exception as e:
+        print(f"⚠️ Job index update failed: {e}")
+
     return {
         "inserted": result.upserted_count,
         "updated": result.modified_count,
@@ -0,0 +1,127 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from app.http_client import http_client
+
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 512))
+
+
+def _normalize(value):
+    """Collapse whitespace in strings so cosmetic differences share a cache entry."""
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def payload_key(url, payload):
+    """Hash of the normalized request (endpoint, model, prompts, params)."""
+    canonical = json.dumps({"url": url, "payload": _normalize(payload)}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# ---------------------------
+# TTL + LRU cache with request coalescing
+# ---------------------------
+class LLMResponseCache:
+    """
+    In-memory cache of chat-completion responses with TTL and LRU eviction.
+    Concurrent calls for the same key are coalesced: one caller makes the
+    HTTP request, the others wait for and share its result.
+    """
+
+    def __init__(self, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, response)
+        self._inflight = {}            # key -> {"event", "result", "error"}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, response):
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_or_fetch(self, key, fetch):
+        """Cached response for key, or the result of fetch() (shared by concurrent callers)."""
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.stats["hits"] += 1
+                return cached
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = {"event": threading.Event(), "result": None, "error": None}
+                self._inflight[key] = call
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call["event"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fetch()
+            with self._lock:
+                self._store(key, call["result"])
+            return call["result"]
+        except Exception as e:  # errors are shared with waiters but never cached
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call["event"].set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+llm_cache = LLMResponseCache()
+
+
+def cached_chat_completion(api_key, payload, url=GROQ_API_URL, timeout=30):
+    """
+    POST a chat-completions payload (Groq/OpenAI-compatible) through the
+    response cache and return the decoded JSON response. The API key is not
+    part of the cache key. HTTP errors raise requests exceptions as before.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+
+    def fetch():
+        response = http_client.post(url, headers=headers, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    return llm_cache.get_or_fetch(payload_key(url, payload), fetch)
@@ -0,0 +1,109 @@
+import json
+import time
+from app.http_client import http_client
+from app.llm_cache import GROQ_API_URL
+
+
+# ---------------------------
+# Server-sent events
+# ---------------------------
+def iter_sse_data(lines):
+    """`data:` payloads of an SSE stream (one per event), up to the OpenAI-style [DONE]."""
+    data = []
+    for line in lines:
+        if line is None:
+            continue
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line:  # blank line ends an event
+            if data:
+                payload = "\n".join(data)
+                if payload.strip() == "[DONE]":
+                    return
+                yield payload
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+        # ":" comments, event:/id:/retry: fields are ignored
+    if data and "\n".join(data).strip() != "[DONE]":
+        yield "\n".join(data)
+
+
+def stream_chat_completion(api_key, payload, url=None, timeout=30, timings=None):
+    """
+    POST a chat-completions payload with "stream": true and yield the content
+    deltas as they arrive. Not cached. `timings` receives ttft_ms (request
+    start to first content) and total_ms (to the end of the stream).
+    """
+    timings = {} if timings is None else timings
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json",
+               "Accept": "text/event-stream"}
+    start = time.perf_counter()
+    response = http_client.post(url or GROQ_API_URL, headers=headers, json={**payload, "stream": True},
+                                timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        for data in iter_sse_data(response.iter_lines(decode_unicode=True)):
+            event = json.loads(data)
+            if "error" in event:
+                raise ValueError(f"Stream error: {event['error']}")
+            for choice in event.get("choices", []):
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    timings.setdefault("ttft_ms", (time.perf_counter() - start) * 1000)
+                    yield content
+    finally:
+        timings["total_ms"] = (time.perf_counter() - start) * 1000
+        response.close()
+
+
+# ---------------------------
+# Partial JSON
+# ---------------------------
+_CLOSE = {"{": "}", "[": "]"}
+
+
+def parse_partial_json(text):
+    """
+    Best-effort dict from the prefix of a JSON object being streamed: an open
+    string is closed, a dangling key/comma is cut off and open arrays/objects
+    are closed ('{"strengths": ["Clear', -> {"strengths": ["Clear"]}).
+    Returns {} until something parses.
+    """
+    start = text.find("{")
+    if start < 0:
+        return {}
+    text = text[start:]
+    stack, in_string, escape = [], False, False
+    cuts = []  # (end, open brackets) where the prefix text[:end] can be closed
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+            cuts.append((i + 1, tuple(stack)))
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            cuts.append((i + 1, tuple(stack)))
+        elif ch == ",":
+            cuts.append((i, tuple(stack)))
+
+    tail = text + ('"' if in_string and not escape else "")
+    candidates = [(tail, tuple(stack))] + [(text[:end], opened) for end, opened in reversed(cuts)]
+    for prefix, opened in candidates[:8]:  # the answer is almost always one of the last cut points
+        try:
+            value = json.loads(prefix + "".join(_CLOSE[b] for b in reversed(opened)))
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return {}
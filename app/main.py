@@ -2,12 +2,14 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import streamlit as st
-import pdfplumber
-import json
 import pandas as pd
+from datetime import datetime, timezone
 from bson import ObjectId
 
-from app.resume_parser import parse_resume_text, ai_parse_resume_text
+from app.resume_parser import (
+    AI_PARSER, RULE_CACHE_KIND, TIERED_CACHE_KIND, parse_resume_text, ai_parse_resume_text, tiered_parse_resume_text,
+    tier_stats,
+)
 from app.mongodb_config import (
     resumes_collection,
     jobs_collection,
@@ -15,10 +17,21 @@ from app.mongodb_config import (
     register_user,
     authenticate_user,
 )
-from app.matching_engine import match_resume_to_jobs
-from app.ai_assistant import ai_resume_feedback
-from app.jobs_utils import refresh_jobs
+from app.matching_engine import (
+    DISPLAY_PROJECTION, match_resume_to_jobs, ats_score_resume_vs_jobs, ats_score_resumes_vs_job,
+)
+from app.ai_assistant import FEEDBACK_FIELDS, stream_resume_feedback
+from app.job_refresher import (
+    add_saved_query, get_refresh_status, list_saved_queries, remove_saved_query, request_refresh,
+)
+from app.job_index import update_job_index
 from app.ats_checker import ats_score
+from app.pdf_extraction import DEFAULT_MAX_PAGES, extract_pdf_text
+from app.resume_cache import get_resume_cache, pdf_digest
+from app.http_client import http_client
+from app.db_schema import RESUME_PROJECTION, USER_LIST_PROJECTION, ensure_indexes
+from app.pagination import Pager, count_cache
+from app.exporter import AVAILABLE_FORMATS, EXPORT_FIELDS, MIME_TYPES, export_to_tempfile
 
 # --- Config ---
 st.set_page_config(page_title="AI Resume Analyzer", layout="wide")
@@ -26,6 +39,9 @@ st.title("📄 AI-Powered Resume Analyzer")
 
 SUPERADMIN_EMAIL = "srujithbollamwork@gmail.com"
 
+# --- Indexes (created once per process) ---
+ensure_indexes()
+
 # --- Session State ---
 if "user" not in st.session_state:
     st.session_state["user"] = None
@@ -77,13 +93,66 @@ if user["role"] in ["admin", "superadmin"]:
 tab1, tab2, tab3, tab4, *admin_tab = st.tabs(tabs)
 
 # --- Helpers ---
-@st.cache_data
+resume_cache = get_resume_cache()
+
+
 def extract_text_from_pdf(uploaded_file):
-    try:
-        with pdfplumber.open(uploaded_file) as pdf:
-            return "\n".join(page.extract_text() or "" for page in pdf.pages).strip()
-    except Exception:
-        return None
+    """Extracted text, cached on disk by the SHA-256 of the PDF bytes (shared by all tabs)."""
+    data = uploaded_file.getvalue()
+
+    def _extract():
+        try:
+            # Page cap keeps a pathological PDF from stalling the script thread
+            return extract_pdf_text(data, max_pages=DEFAULT_MAX_PAGES)["text"]
+        except Exception:
+            return None
+
+    return resume_cache.get_or_compute(pdf_digest(data), "text", _extract, cacheable=bool)
+
+
+ADMIN_PAGE_SIZE = 10
+
+
+def pager_controls(pager, page):
+    """Prev / Next buttons under a keyset-paginated admin list."""
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if pager.page_number > 1 and st.button("⬅️ Prev", key=f"{pager.key}_prev"):
+            pager.prev()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {pager.page_number}")
+    with col_next:
+        if page["has_next"] and st.button("Next ➡️", key=f"{pager.key}_next"):
+            pager.next(page["last_id"])
+            st.rerun()
+
+
+def export_controls(name, collection):
+    """Format picker + on-demand streaming export (spooled to a temp file) + download button."""
+    fmt = st.selectbox("Export format", AVAILABLE_FORMATS, key=f"{name}_export_fmt")
+    if st.button(f"📦 Prepare {name.title()} Export"):
+        with st.spinner(f"Exporting {name}..."):
+            st.session_state[f"{name}_export"] = (fmt, export_to_tempfile(collection, fmt, EXPORT_FIELDS[name]))
+    if f"{name}_export" in st.session_state:
+        fmt, f = st.session_state[f"{name}_export"]
+        f.seek(0)
+        st.download_button(f"⬇️ Download {name.title()} ({fmt.upper()})", data=f,
+                           file_name=f"all_{name}.{fmt}", mime=MIME_TYPES[fmt])
+
+
+def refresh_status_panel(key):
+    """Background refresher status (read-only) + a non-blocking "refresh now" request."""
+    status = get_refresh_status()
+    state = status.get("state", "never run")
+    finished = status.get("last_finished")
+    st.caption(f"🔄 Job refresher: **{state}**"
+               + (f" | last run {finished:%Y-%m-%d %H:%M} UTC, {status.get('last_new_jobs', 0)} new jobs"
+                  if finished else ""))
+    if st.button("🔄 Request Job Refresh", key=f"{key}_request_refresh"):
+        request_refresh()
+        count_cache.invalidate("jobs")
+        st.info("Refresh requested. The background worker will pick it up on its next poll.")
 
 
 # ==============================
@@ -99,17 +168,42 @@ with tab1:
             st.error("⚠️ Could not extract text")
         else:
             st.success("✅ Resume processed")
-            parser_type = st.radio("Parser:", ["Rule-based", "AI-powered"])
-            parsed_data = (
-                parse_resume_text(resume_text)
-                if parser_type == "Rule-based"
-                else ai_parse_resume_text(resume_text)
-            )
+            parser_type = st.radio("Parser:", ["Tiered (rules + AI fallback)", "Rule-based", "AI-powered"])
+            digest = pdf_digest(uploaded_file.getvalue())
+            if parser_type == "Rule-based":
+                parsed_data = resume_cache.get_or_compute(
+                    digest, RULE_CACHE_KIND, lambda: parse_resume_text(resume_text)
+                )
+                parser_kind = RULE_CACHE_KIND
+            elif parser_type == "AI-powered":
+                parsed_data = resume_cache.get_or_compute(
+                    digest, "ai", lambda: ai_parse_resume_text(resume_text),
+                    cacheable=lambda parsed: "Error" not in parsed,
+                )
+                parser_kind = AI_PARSER
+            else:
+                parsed_data = resume_cache.get_or_compute(
+                    digest, TIERED_CACHE_KIND, lambda: tiered_parse_resume_text(resume_text),
+                    cacheable=lambda parsed: "LLM Error" not in parsed,
+                )
+                # only resumes the LLM actually completed are "ai" (kept out of rule re-parses)
+                used_llm = parsed_data["LLM Fields"] and "LLM Error" not in parsed_data
+                parser_kind = AI_PARSER if used_llm else RULE_CACHE_KIND
+                summary = tier_stats.summary()
+                st.caption(
+                    f"AI asked for: {', '.join(parsed_data['LLM Fields']) or 'nothing'} · "
+                    f"resolved without an LLM call: {summary.get('rule_only', 0)}/{summary['resumes']} resumes"
+                    + (f" · median latency saved ≈ {summary['p50_saved_ms']:.0f} ms"
+                       if summary.get("p50_saved_ms") is not None else "")
+                )
 
             # Add version tracking
             parsed_data["uploaded_by"] = user["email"]
             parsed_data["version_name"] = uploaded_file.name
-            resumes_collection.insert_one(parsed_data)
+            parsed_data["uploaded_at"] = datetime.now(timezone.utc)
+            # raw text + parser version let app.resume_reparser re-parse it later
+            resumes_collection.insert_one({**parsed_data, "raw_text": resume_text, "parser": parser_kind})
+            count_cache.invalidate("resumes")
 
             st.json(parsed_data)
             st.info(f"Resume saved as version: {uploaded_file.name}")
@@ -121,7 +215,11 @@ with tab1:
 with tab2:
     st.subheader("📚 Stored Resumes")
 
-    user_resumes = list(resumes_collection.find({"uploaded_by": user["email"]}).limit(10))
+    user_resumes = list(
+        resumes_collection.find({"uploaded_by": user["email"]}, RESUME_PROJECTION)
+        .sort("uploaded_at", -1)
+        .limit(10)
+    )
     if user_resumes:
         for r in user_resumes:
             r["_id"] = str(r["_id"])
@@ -137,29 +235,29 @@ with tab2:
 with tab3:
     st.subheader("🔍 Job Matching")
 
-    col1, col2 = st.columns([2, 2])
+    refresh_status_panel("matching")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
-        keywords = st.text_input("Enter job keywords:", value="Data Scientist")
+        match_location = st.text_input("Location (blank = anywhere):", value="")
     with col2:
-        location = st.text_input("Enter location:", value="India")
-
-    if st.button("🔄 Refresh Jobs from Jooble"):
-        with st.spinner(f"Fetching jobs for '{keywords}' in '{location}'..."):
-            try:
-                result = refresh_jobs(keywords, location, limit=10)
-                st.success(f"✅ {result.get('inserted',0)} inserted, {result.get('updated',0)} updated")
-            except Exception as e:
-                st.error(f"⚠️ Failed to fetch jobs: {e}")
+        remote_choice = st.selectbox("Remote jobs", ["Any", "Remote", "No remote"],
+                                     help="Remote: remote jobs (plus jobs in the location, if set)")
+    with col3:
+        min_overlap = st.number_input("Min shared skills", min_value=0, value=0, step=1)
+    remote_filter = {"Any": None, "Remote": True, "No remote": False}[remote_choice]
 
     uploaded_resume = st.file_uploader("Upload resume", type=["pdf"], key="matcher")
     if uploaded_resume:
         resume_text = extract_text_from_pdf(uploaded_resume)
         if resume_text.strip():
-            matches = match_resume_to_jobs(resume_text, top_n=5)
+            matches = match_resume_to_jobs(resume_text, top_n=5, location=match_location.strip() or None,
+                                           remote=remote_filter, min_skill_overlap=int(min_overlap))
             if matches:
                 for job in matches:
                     st.markdown(f"### {job['title']} at {job['company']}")
                     st.write(f"📍 {job.get('location','N/A')} | 🔥 {job['similarity']*100:.1f}% match")
+                    st.caption(" | ".join(f"{stage}: {score*100:.0f}%" for stage, score in job.get("scores", {}).items()))
                     st.write(f"📝 {job.get('description','No description')}")
                     st.markdown("---")
             else:
@@ -179,8 +277,23 @@ with tab4:
         resume_text = extract_text_from_pdf(uploaded_resume)
 
         if st.button("Get AI Feedback"):
-            feedback = ai_resume_feedback(resume_text, job_desc)
-            st.json(feedback)
+            usage = {}
+            placeholder = st.empty()
+            feedback = {}
+            # Partial strengths/weaknesses/... render as the response streams in
+            for feedback in stream_resume_feedback(resume_text, job_desc, usage=usage):
+                with placeholder.container():
+                    for field in FEEDBACK_FIELDS:
+                        if feedback.get(field):
+                            st.markdown(f"**{field.replace('_', ' ').title()}**")
+                            st.markdown("\n".join(f"- {item}" for item in feedback[field]))
+            placeholder.json(feedback)  # the validated result (or the error)
+            if "tokens_before" in usage:
+                st.caption(f"Prompt: {usage['tokens_before']:,} → {usage['tokens_after']:,} tokens "
+                           f"({usage['tokens_saved']:,} saved)")
+            if "total_ms" in usage:
+                ttft = f"{usage['ttft_ms']:,.0f} ms" if "ttft_ms" in usage else "n/a"
+                st.caption(f"Time to first token: {ttft} · total: {usage['total_ms']:,.0f} ms")
 
         if job_desc and st.button("Run ATS Check"):
             result = ats_score(resume_text, job_desc)
@@ -191,10 +304,20 @@ with tab4:
 
             # Keyword density
             st.subheader("📊 Keyword Density")
-            all_skills = result["matched_skills"] + result["missing_skills"]
-            for skill in all_skills:
-                count = resume_text.lower().count(skill.lower())
-                st.write(f"{skill}: {count} times")
+            for skill, counts in result["keyword_density"].items():
+                st.write(f"{skill}: {counts['resume_count']} times")
+
+        if st.button("Run ATS Check Against All Jobs"):
+            with st.spinner("Scoring resume against every job..."):
+                ranked = ats_score_resume_vs_jobs(resume_text, top_n=20)
+            if ranked:
+                st.dataframe(pd.DataFrame([
+                    {"Title": r["title"], "Company": r["company"], "ATS Score": r["ATS Score"],
+                     "Missing": ", ".join(r["critical_missing"])}
+                    for r in ranked
+                ]))
+            else:
+                st.info("No jobs found.")
 
 
 # ==============================
@@ -205,16 +328,24 @@ if user["role"] in ["admin", "superadmin"] and admin_tab:
         st.subheader("🛠 Admin Dashboard")
 
         # Stats
-        total_users = users_collection.count_documents({})
-        total_resumes = resumes_collection.count_documents({})
-        total_jobs = jobs_collection.count_documents({})
+        total_users = count_cache.count(users_collection)
+        total_resumes = count_cache.count(resumes_collection)
+        total_jobs = count_cache.count(jobs_collection)
         st.write(f"👤 Users: {total_users} | 📄 Resumes: {total_resumes} | 💼 Jobs: {total_jobs}")
+        cache_stats = resume_cache.stats()
+        st.write("🗄️ Resume cache: " + " | ".join(
+            f"{kind}: {s['hits']} hits / {s['misses']} misses ({s['saved_seconds']}s saved)"
+            for kind, s in cache_stats.items() if kind != "_store"
+        ) + f" | {cache_stats['_store']['entries']} entries")
+        with st.expander("🌐 API client metrics (Groq / Jooble)"):
+            st.json(http_client.metrics())
         st.markdown("---")
 
         # --- User Management ---
         st.subheader("👤 User Management")
-        users = list(users_collection.find({}, {"_id": 0}))
-        for u in users:
+        users_pager = Pager(st.session_state, "users")
+        users_page = users_pager.fetch(users_collection, USER_LIST_PROJECTION, page_size=ADMIN_PAGE_SIZE)
+        for u in users_page["items"]:
             col1, col2, col3 = st.columns([3, 1, 1])
             with col1:
                 st.write(f"{u['email']} ({u.get('role', 'user')})")
@@ -229,31 +360,31 @@ if user["role"] in ["admin", "superadmin"] and admin_tab:
                 if u["email"] != SUPERADMIN_EMAIL:
                     if st.button(f"Delete {u['email']}", key=f"delete_{u['email']}"):
                         users_collection.delete_one({"email": u["email"]})
+                        count_cache.invalidate("users")
                         st.warning(f"User {u['email']} deleted")
                         st.rerun()
+        pager_controls(users_pager, users_page)
 
         st.markdown("---")
 
         # --- Resume Management ---
         st.subheader("📄 Resume Management")
-        resumes = list(resumes_collection.find().limit(5))
-        for r in resumes:
+        resumes_pager = Pager(st.session_state, "resumes")
+        resumes_page = resumes_pager.fetch(resumes_collection, RESUME_PROJECTION, page_size=ADMIN_PAGE_SIZE)
+        for r in resumes_page["items"]:
             r["_id"] = str(r["_id"])
             with st.expander(f"Resume: {r.get('version_name', 'Unknown')}"):
                 st.json(r)
                 if st.button(f"Delete Resume {r['_id']}", key=f"res_{r['_id']}"):
                     resumes_collection.delete_one({"_id": ObjectId(r["_id"])})
+                    count_cache.invalidate("resumes")
                     st.warning("Resume deleted")
                     st.rerun()
+        pager_controls(resumes_pager, resumes_page)
 
-        all_resumes = list(resumes_collection.find({}, {"_id": 0}))
-        if all_resumes:
-            json_data = json.dumps(all_resumes, indent=4)
-            csv_data = pd.DataFrame(all_resumes).to_csv(index=False)
-            st.download_button("⬇️ Download Resumes (JSON)", data=json_data,
-                               file_name="all_resumes.json", mime="application/json")
-            st.download_button("⬇️ Download Resumes (CSV)", data=csv_data,
-                               file_name="all_resumes.csv", mime="text/csv")
+        if total_resumes:
+            # Exports are only built on request (and kept for the download reruns)
+            export_controls("resumes", resumes_collection)
 
             st.markdown("---")
             # ✅ Delete All Resumes with confirmation
@@ -262,6 +393,9 @@ if user["role"] in ["admin", "superadmin"] and admin_tab:
             if st.button("🗑️ Delete All Resumes"):
                 if confirm_delete:
                     resumes_collection.delete_many({})
+                    count_cache.invalidate("resumes")
+                    resumes_pager.reset()
+                    st.session_state.pop("resumes_export", None)
                     st.success("✅ All resumes deleted successfully.")
                     st.rerun()
                 else:
@@ -269,36 +403,60 @@ if user["role"] in ["admin", "superadmin"] and admin_tab:
         else:
             st.info("No resumes found.")
 
+        # --- Screen all resumes against one posting ---
+        screen_desc = st.text_area("Paste a job description to ATS-screen all resumes:", key="admin_screen")
+        if screen_desc and st.button("📋 Screen All Resumes"):
+            ranked = ats_score_resumes_vs_job(screen_desc, top_n=50)
+            if ranked:
+                st.dataframe(pd.DataFrame([
+                    {"Resume": r["version_name"], "Uploaded By": r["uploaded_by"],
+                     "ATS Score": r["ATS Score"], "Missing": ", ".join(r["critical_missing"])}
+                    for r in ranked
+                ]))
+            else:
+                st.info("No resumes found.")
+
         st.markdown("---")
 
         # --- Job Management ---
         st.subheader("💼 Job Management")
-        jobs = list(jobs_collection.find().limit(5))
-        for j in jobs:
+        jobs_pager = Pager(st.session_state, "jobs")
+        jobs_page = jobs_pager.fetch(jobs_collection, DISPLAY_PROJECTION, page_size=ADMIN_PAGE_SIZE)
+        for j in jobs_page["items"]:
             j["_id"] = str(j["_id"])
             with st.expander(f"Job: {j.get('title', 'Unknown')} @ {j.get('company', 'N/A')}"):
                 st.json(j)
                 if st.button(f"Delete Job {j['_id']}", key=f"job_{j['_id']}"):
                     jobs_collection.delete_one({"_id": ObjectId(j["_id"])})
+                    update_job_index(removed_ids=[j["_id"]])
+                    count_cache.invalidate("jobs")
                     st.warning("Job deleted")
                     st.rerun()
-
-        all_jobs = list(jobs_collection.find({}, {"_id": 0}))
-        if all_jobs:
-            json_data = json.dumps(all_jobs, indent=4)
-            csv_data = pd.DataFrame(all_jobs).to_csv(index=False)
-            st.download_button("⬇️ Download Jobs (JSON)", data=json_data,
-                               file_name="all_jobs.json", mime="application/json")
-            st.download_button("⬇️ Download Jobs (CSV)", data=csv_data,
-                               file_name="all_jobs.csv", mime="text/csv")
-
+        pager_controls(jobs_pager, jobs_page)
+
+        if total_jobs:
+            export_controls("jobs", jobs_collection)
+
+        st.subheader("🗓️ Scheduled Job Refresh")
+        refresh_status_panel("admin")
+        for m in get_refresh_status().get("last_results", []):
+            st.write(f"- {m['keywords']} @ {m['location']}: "
+                     + (m["error"] if "error" in m else
+                        f"{m['new']} new ({m['inserted']} inserted, {m['updated']} updated), {m['seconds']}s"))
+        for q in list_saved_queries():
+            col_q, col_del = st.columns([4, 1])
+            with col_q:
+                last_run = q.get("last_run")
+                st.write(f"**{q['keywords']}** @ {q['location']} every {q['interval_minutes']} min"
+                         + (f" (last run {last_run:%Y-%m-%d %H:%M} UTC)" if last_run else ""))
+            with col_del:
+                if st.button("Remove", key=f"rmq_{q['keywords']}_{q['location']}"):
+                    remove_saved_query(q["keywords"], q["location"])
+                    st.rerun()
         keywords = st.text_input("Keywords", "Data Scientist", key="admin_kw")
         location = st.text_input("Location", "India", key="admin_loc")
-        if st.button("🔄 Refresh Jobs Now (Admin)"):
-            with st.spinner("Fetching jobs..."):
-                try:
-                    result = refresh_jobs(keywords, location, limit=10)
-                    st.success(f"✅ {result.get('inserted',0)} inserted, {result.get('updated',0)} updated")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"⚠️ Error refreshing jobs: {e}")
+        interval = st.number_input("Every (minutes)", min_value=5, value=60, step=5, key="admin_interval")
+        if st.button("➕ Save Refresh Query"):
+            add_saved_query(keywords, location, int(interval))
+            st.success(f"✅ Saved '{keywords}' @ '{location}'")
+            st.rerun()
@@ -1,64 +1,229 @@
-import re
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from app.mongodb_config import jobs_collection
-from app.resume_parser import parse_resume_text
+from app.mongodb_config import jobs_collection, resumes_collection
+from app.resume_parser import extract_skills
+from app.job_index import (
+    FEATURE_FIELDS, INDEX_PROJECTION, JobVectorizer, ensure_job_features, get_job_index, preprocess,
+    to_object_id,
+)
+from app.streaming_matcher import iter_job_batches, top_jobs_from_batches
+from app.pagination import iter_batches
+from app.ann_index import DEFAULT_N_PROBE, ann_search
+from app.ranking import get_ranker
+from app.prefilter import filter_rows
+from app.ats_checker import ats_results, skill_count_matrix, skill_matrix
 
+# Job documents as shown to users (without the stored matching features)
+DISPLAY_PROJECTION = {field: 0 for field in FEATURE_FIELDS}
 
-def preprocess(text):
-    if not text:
-        return ""
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
 
+def _resume_corpus(resume_text):
+    """Resume text + extracted skills, preprocessed like the job documents."""
+    # Only the skills are needed here, not a full parse
+    resume_skills_text = " ".join(extract_skills(resume_text))
 
-def match_resume_to_jobs(resume_text, top_n=5):
-    """Match resume to jobs using skills + job description weighted similarity."""
+    return preprocess(resume_text + " " + resume_skills_text)
 
-    # Parse resume to extract structured data
-    parsed_resume = parse_resume_text(resume_text)
-    resume_skills = parsed_resume.get("Skills", [])
-    resume_skills_text = " ".join(resume_skills)
 
-    # Prepare resume combined text
-    resume_corpus = preprocess(resume_text + " " + resume_skills_text)
+def _fetch_jobs(job_ids):
+    """Full job documents for index job ids, keyed by id string."""
+    return {
+        str(job["_id"]): job
+        for job in jobs_collection.find({"_id": {"$in": [to_object_id(j) for j in job_ids]}}, DISPLAY_PROJECTION)
+    }
 
-    # Fetch jobs from MongoDB
-    jobs = list(jobs_collection.find().limit(100))  # limit for performance
-    if not jobs:
+
+def _attach_jobs(ranked):
+    """Fetch full job documents for [(job_id, similarity), ...] and keep the ranking order."""
+    jobs = _fetch_jobs(job_id for job_id, _ in ranked)
+    results = []
+    for job_id, score in ranked:
+        job = jobs.get(job_id)
+        if job is not None:  # deleted since it was scored
+            job["similarity"] = float(score)
+            results.append(job)
+    return results
+
+
+def _hybrid_matches(index, resume_text, top_n, weights, location, remote, min_skill_overlap):
+    """[(row, score, {stage: score})] of the hybrid ranker, after the prefilter."""
+    rows = filter_rows(index, resume_text, location, remote, min_skill_overlap)
+    return get_ranker(index).rank(resume_text, top_n=top_n, weights=weights, rows=rows)
+
+
+def _cosine_matches(index, query_vec, rows, top_n):
+    """[(row, similarity)] by TF-IDF cosine, over every job or only the candidate `rows`."""
+    # Sparse mat-vec against the L2-normalized job matrix
+    if rows is None:
+        sims = (index.weighted_matrix() @ query_vec.T).toarray().ravel()
+        rows = np.arange(len(sims))
+    else:
+        sims = (index.weighted_matrix()[rows] @ query_vec.T).toarray().ravel()
+    top_n = min(top_n, len(sims))
+    top = np.argpartition(-sims, top_n - 1)[:top_n] if top_n > 0 else []
+    top = sorted(top, key=lambda i: sims[i], reverse=True)
+    return [(int(rows[i]), float(sims[i])) for i in top]
+
+
+def match_resume_to_jobs(resume_text, top_n=5, mode="hybrid", batch_size=1000, n_probe=DEFAULT_N_PROBE,
+                         weights=None, location=None, remote=None, min_skill_overlap=0):
+    """
+    Match resume to jobs.
+
+    location / remote / min_skill_overlap prefilter the jobs through posting
+    lists (app/prefilter.py) before any similarity scoring: only jobs in
+    `location` (remote=True also admits remote jobs, remote=False drops
+    them) that require at least `min_skill_overlap` of the resume's skills
+    are scored. Filters need the job index (every mode except "stream").
+
+    mode="hybrid": weighted BM25 + TF-IDF cosine + skill overlap over the
+                   persisted job index (see app/ranking.py; `weights` overrides
+                   MATCH_WEIGHTS). Each match carries its per-stage "scores".
+    mode="index": TF-IDF cosine of resume text + extracted skills against the
+                  persisted in-memory job index (fastest).
+    mode="stream": scan the whole jobs collection in batches with a bounded
+                   top-N heap, so memory stays flat regardless of collection size.
+    mode="ann":    approximate retrieval (IVF over dense projections) for a
+                   shortlist, exact cosine re-ranking on it; n_probe trades
+                   recall for latency.
+    """
+    filtered = bool(location) or remote is not None or min_skill_overlap > 0
+    if filtered and mode == "stream":
+        raise ValueError("⚠️ Location/remote/skill filters need the job index (mode='hybrid', 'index' or 'ann')")
+
+    if mode == "hybrid":
+        index = get_job_index()
+        if index is None or not len(index):
+            return []
+        ranked = _hybrid_matches(index, resume_text, top_n, weights, location, remote, min_skill_overlap)
+        matches = _attach_jobs([(index.job_ids[row], score) for row, score, _ in ranked])
+        stages = {index.job_ids[row]: scores for row, _, scores in ranked}
+        for job in matches:
+            job["scores"] = stages[str(job["_id"])]
+        return matches
+
+    resume_corpus = _resume_corpus(resume_text)
+
+    if mode == "stream":
+        vectorizer = JobVectorizer.load() or get_job_index().vectorizer()
+        query_vec = vectorizer.transform(resume_corpus)
+        batches = (
+            ensure_job_features(batch, jobs_collection, ("tokens",))
+            for batch in iter_job_batches(jobs_collection, batch_size=batch_size, projection=INDEX_PROJECTION)
+        )
+        top = top_jobs_from_batches(query_vec, vectorizer, batches, top_n=top_n)
+        return _attach_jobs([(str(job["_id"]), score) for score, job in top])
+
+    # Persisted job-side TF-IDF index: only the resume is vectorized here
+    index = get_job_index()
+    if index is None or not len(index):
         return []
 
-    job_docs = []
-    job_meta = []
-    for job in jobs:
-        title = job.get("title", "")
-        company = job.get("company", "")
-        location = job.get("location", "")
-        description = job.get("description", "")
-        skills_required = job.get("skills_required", "")
+    rows = filter_rows(index, resume_text, location, remote, min_skill_overlap)
+
+    if mode == "ann":
+        top = ann_search(index, index.transform(resume_corpus), top_n=top_n, n_probe=n_probe, allowed=rows)
+        return _attach_jobs([(index.job_ids[row], score) for row, score in top])
+
+    top = _cosine_matches(index, index.transform(resume_corpus), rows, top_n)
+    return _attach_jobs([(index.job_ids[row], score) for row, score in top])
+
+
+def match_resumes_to_jobs(resumes, top_n=5, mode="hybrid", weights=None, location=None, remote=None,
+                          min_skill_overlap=0):
+    """
+    Batch variant of match_resume_to_jobs for bulk screening: same ranking
+    (mode="hybrid" or "index") and the same prefilters, with job documents
+    fetched from MongoDB once for the whole batch. Without filters, "index"
+    mode vectorizes all resumes as one sparse matrix and scores them in
+    memory-bounded chunks. Returns one ranked job list per resume.
+    """
+    if mode not in ("hybrid", "index"):
+        raise ValueError(f"⚠️ Batch matching supports mode='hybrid' or 'index', not {mode!r}")
+    resumes = list(resumes)
+    index = get_job_index()
+    if not resumes or index is None or not len(index):
+        return [[] for _ in resumes]
+
+    filtered = bool(location) or remote is not None or min_skill_overlap > 0
+    if mode == "hybrid":
+        per_resume = [_hybrid_matches(index, text, top_n, weights, location, remote, min_skill_overlap)
+                      for text in resumes]
+    else:
+        queries = index.transform([_resume_corpus(text) for text in resumes])
+        if filtered:
+            per_resume = [
+                _cosine_matches(index, queries[i], filter_rows(index, text, location, remote, min_skill_overlap),
+                                top_n)
+                for i, text in enumerate(resumes)
+            ]
+        else:
+            per_resume = index.top_matches(queries, top_n=top_n)
+
+    # One MongoDB read for every job that made any resume's top-N
+    jobs = _fetch_jobs({index.job_ids[match[0]] for ranked in per_resume for match in ranked})
+
+    results = []
+    for ranked in per_resume:
+        matches = []
+        for row, score, *stages in ranked:
+            job = jobs.get(index.job_ids[row])
+            if job is not None:
+                matches.append(dict(job, similarity=float(score), **({"scores": stages[0]} if stages else {})))
+        results.append(matches)
+    return results
+
+
+# ---------------------------
+# Batch ATS checks
+# ---------------------------
+RESUME_FIELDS = ("Skills", "Experience", "Education")
+
+
+def resume_document(resume):
+    """Searchable text of a stored (parsed) resume."""
+    parts = []
+    for field in RESUME_FIELDS:
+        value = resume.get(field) or []
+        parts.extend(value if isinstance(value, list) else [value])
+    return " ".join(str(p) for p in parts)
+
 
-        # Combine description + required skills
-        job_text = preprocess(f"{title} {company} {location} {description} {skills_required}")
-        job_docs.append(job_text)
-        job_meta.append(job)
+def ats_score_resume_vs_jobs(resume_text, top_n=None, collection=None, batch_size=1000):
+    """
+    ATS-check one resume against every job in the collection. The resume is
+    scanned once; jobs are read in keyset batches with their stored skill
+    counts and scored per batch as a sparse matrix. Returns ats_score() results (plus job_id/title/company)
+    sorted by ATS Score.
+    """
+    collection = jobs_collection if collection is None else collection
+    resume_matrix = skill_matrix([resume_text])
+    projection = {"title": 1, "company": 1, "extracted_skills": 1}
 
-    # Vectorize resume + jobs
-    vectorizer = TfidfVectorizer(stop_words="english")
-    tfidf_matrix = vectorizer.fit_transform([resume_corpus] + job_docs)
+    results = []
+    for batch in iter_job_batches(collection, batch_size=batch_size, projection=projection):
+        ensure_job_features(batch, collection, ("extracted_skills",))
+        job_matrix = skill_count_matrix(dict(job["extracted_skills"]) for job in batch)
+        for job, result in zip(batch, ats_results(resume_matrix, job_matrix)[0]):
+            results.append({"job_id": str(job["_id"]), "title": job.get("title"),
+                            "company": job.get("company"), **result})
 
-    resume_vec = tfidf_matrix[0:1]
-    job_vecs = tfidf_matrix[1:]
+    results.sort(key=lambda r: r["ATS Score"], reverse=True)
+    return results[:top_n] if top_n else results
 
-    # Cosine similarity
-    sims = cosine_similarity(resume_vec, job_vecs).flatten()
 
-    # Attach similarity to job meta
-    for i, score in enumerate(sims):
-        job_meta[i]["similarity"] = float(score)
+def ats_score_resumes_vs_job(job_desc, top_n=None, collection=None, batch_size=1000, query=None):
+    """ATS-check every stored resume (optionally filtered by `query`) against one posting."""
+    collection = resumes_collection if collection is None else collection
+    job_matrix = skill_matrix([job_desc])
+    projection = {field: 1 for field in ("uploaded_by", "version_name", "Name", *RESUME_FIELDS)}
 
-    # Sort by similarity
-    ranked = sorted(job_meta, key=lambda x: x["similarity"], reverse=True)
+    results = []
+    for batch in iter_batches(collection, batch_size=batch_size, projection=projection, query=query):
+        resume_matrix = skill_matrix(resume_document(r) for r in batch)
+        for resume, per_job in zip(batch, ats_results(resume_matrix, job_matrix)):
+            results.append({"resume_id": str(resume["_id"]), "name": resume.get("Name"),
+                            "uploaded_by": resume.get("uploaded_by"),
+                            "version_name": resume.get("version_name"), **per_job[0]})
 
-    return ranked[:top_n]
+    results.sort(key=lambda r: r["ATS Score"], reverse=True)
+    return results[:top_n] if top_n else results
@@ -1,27 +1,139 @@
 import os
+import threading
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import MongoClient, ReadPreference
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
 import bcrypt
 
+try:
+    import mongomock  # optional: in-memory backend for tests/benchmarks
+except ImportError:
+    mongomock = None
+
 # ===============================
 # 🔹 Load Environment
 # ===============================
 load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "ai_resume_analyzer")
+MONGO_BACKEND = os.getenv("MONGO_BACKEND", "mongo")  # "mongo" or "memory"
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
 
-if not MONGO_URI:
-    raise ValueError("⚠️ MONGO_URI not found in .env")
+# Pool / timeout / concern settings (all overridable from .env)
+CLIENT_OPTIONS = {
+    "maxPoolSize": _env_int("MONGO_MAX_POOL_SIZE", 50),
+    "minPoolSize": _env_int("MONGO_MIN_POOL_SIZE", 0),
+    "maxIdleTimeMS": _env_int("MONGO_MAX_IDLE_TIME_MS", 300000),
+    "connectTimeoutMS": _env_int("MONGO_CONNECT_TIMEOUT_MS", 5000),
+    "serverSelectionTimeoutMS": _env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+    "socketTimeoutMS": _env_int("MONGO_SOCKET_TIMEOUT_MS", 30000),
+    "retryWrites": os.getenv("MONGO_RETRY_WRITES", "true").lower() == "true",
+}
+READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primaryPreferred")
+READ_CONCERN = os.getenv("MONGO_READ_CONCERN", "local")
+WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "1")  # "1", "majority", ...
 
 # ===============================
-# 🔹 MongoDB Setup
+# 🔹 MongoDB Setup (lazy, one client per process)
 # ===============================
-client = MongoClient(MONGO_URI)
-db = client["ai_resume_analyzer"]
+_lock = threading.Lock()
+_state = {"backend": MONGO_BACKEND, "client": None, "db": None}
+
+
+def _snake_upper(name):
+    """primaryPreferred -> PRIMARY_PREFERRED"""
+    return "".join(f"_{c}" if c.isupper() else c for c in name).upper()
+
+
+def set_backend(backend):
+    """Switch between "mongo" and the in-memory "memory" backend (drops the current client)."""
+    if backend not in ("mongo", "memory"):
+        raise ValueError(f"⚠️ Unknown MongoDB backend: {backend}")
+    with _lock:
+        if _state["client"] is not None and _state["backend"] == "mongo":
+            _state["client"].close()
+        _state.update(backend=backend, client=None, db=None)
+
+
+def get_client():
+    """The shared MongoClient, created on first use."""
+    with _lock:
+        if _state["client"] is None:
+            if _state["backend"] == "memory":
+                if mongomock is None:
+                    raise ImportError("⚠️ MONGO_BACKEND=memory needs the mongomock package")
+                _state["client"] = mongomock.MongoClient()
+            else:
+                if not MONGO_URI:
+                    raise ValueError("⚠️ MONGO_URI not found in .env")
+                _state["client"] = MongoClient(MONGO_URI, **CLIENT_OPTIONS)
+        return _state["client"]
+
+
+def get_db():
+    """The application database on the shared client."""
+    client = get_client()
+    with _lock:
+        if _state["db"] is None:
+            if _state["backend"] == "memory":
+                _state["db"] = client[MONGO_DB_NAME]
+            else:
+                w = int(WRITE_CONCERN) if WRITE_CONCERN.isdigit() else WRITE_CONCERN
+                _state["db"] = client.get_database(
+                    MONGO_DB_NAME,
+                    read_preference=getattr(ReadPreference, _snake_upper(READ_PREFERENCE)),
+                    read_concern=ReadConcern(READ_CONCERN),
+                    write_concern=WriteConcern(w=w),
+                )
+        return _state["db"]
+
+
+class LazyCollection:
+    """Stands in for a pymongo Collection; connects on first attribute access."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _collection(self):
+        return get_db()[self.name]
+
+    def __getattr__(self, attr):
+        return getattr(self._collection(), attr)
+
+    def __getitem__(self, key):
+        return self._collection()[key]
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+class LazyDatabase:
+    """Stands in for the pymongo Database; connects on first use."""
+
+    def __getattr__(self, attr):
+        return getattr(get_db(), attr)
+
+    def __getitem__(self, name):
+        return get_db()[name]
+
+    def __repr__(self):
+        return f"LazyDatabase({MONGO_DB_NAME!r})"
+
+
+db = LazyDatabase()
 
 # Collections
-resumes_collection = db["resumes"]
-jobs_collection = db["jobs"]
-users_collection = db["users"]
+resumes_collection = LazyCollection("resumes")
+jobs_collection = LazyCollection("jobs")
+users_collection = LazyCollection("users")
+refresh_queries_collection = LazyCollection("refresh_queries")  # saved Jooble queries (job_refresher)
+refresh_state_collection = LazyCollection("refresh_state")      # refresher lock + status
 
 # Superadmin email (hardcoded for protection)
 SUPERADMIN_EMAIL = "srujithbollamwork@gmail.com"
@@ -42,7 +154,7 @@ def check_password(password: str, hashed: bytes) -> bool:
 # ===============================
 def register_user(email: str, password: str, role: str = "user"):
     """Register a new user (only users, never admins)."""
-    if users_collection.find_one({"email": email}):
+    if users_collection.find_one({"email": email}, {"_id": 1}):
         return {"error": "User already exists"}
 
     # 🚫 Prevent new admins from registering directly
@@ -57,9 +169,12 @@ def register_user(email: str, password: str, role: str = "user"):
     })
     return {"success": True}
 
+# Login lookup; app.db_schema checks its plan against the users.email index
+USER_AUTH_PROJECTION = {"_id": 0, "email": 1, "password": 1, "role": 1}
+
 def authenticate_user(email: str, password: str):
     """Authenticate user by email + password."""
-    user = users_collection.find_one({"email": email})
+    user = users_collection.find_one({"email": email}, USER_AUTH_PROJECTION)
     if not user:
         return None
 
@@ -0,0 +1,117 @@
+import time
+import threading
+
+
+# ---------------------------
+# Keyset pagination
+# ---------------------------
+def fetch_page(collection, projection=None, page_size=20, after=None, query=None):
+    """
+    One page of documents in _id order, starting after the `after` _id.
+    Each page is an _id index range scan (no skip()), so page N costs the
+    same as page 1. Returns {"items", "last_id", "has_next"}.
+    """
+    page_query = dict(query or {})
+    if after is not None:
+        page_query["_id"] = {"$gt": after}
+    if projection and projection.get("_id") == 0:  # the cursor position needs _id
+        projection = {k: v for k, v in projection.items() if k != "_id"} or None
+
+    items = list(collection.find(page_query, projection).sort("_id", 1).limit(page_size + 1))
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    return {
+        "items": items,
+        "last_id": items[-1]["_id"] if items else after,
+        "has_next": has_next,
+    }
+
+
+def iter_batches(collection, batch_size=1000, projection=None, query=None):
+    """
+    Yield the whole collection (or the `query` matches) as lists of projected
+    documents, in _id order. Each batch is an _id index range scan and only
+    one batch is held in memory. The next batch starts after the last _id,
+    so consumers must leave `_id` in the yielded documents.
+    """
+    if projection and projection.get("_id") == 0:  # the cursor position needs _id
+        projection = {k: v for k, v in projection.items() if k != "_id"} or None
+    last_id = None
+    while True:
+        page_query = dict(query or {})
+        if last_id is not None:
+            page_query["_id"] = {"$gt": last_id}
+        batch = list(collection.find(page_query, projection).sort("_id", 1).limit(batch_size))
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]["_id"]
+
+
+class Pager:
+    """
+    Forward/back navigation over fetch_page(). Keeps the stack of page start
+    ids (a dict-like `state`, e.g. st.session_state, persists it across reruns).
+    """
+
+    def __init__(self, state, key):
+        self.state = state
+        self.key = f"pager_{key}"
+        if self.key not in self.state:
+            self.state[self.key] = [None]
+
+    @property
+    def page_number(self):
+        return len(self.state[self.key])
+
+    def fetch(self, collection, projection=None, page_size=20, query=None):
+        return fetch_page(collection, projection, page_size, self.state[self.key][-1], query)
+
+    def next(self, last_id):
+        self.state[self.key].append(last_id)
+
+    def prev(self):
+        if len(self.state[self.key]) > 1:
+            self.state[self.key].pop()
+
+    def reset(self):
+        self.state[self.key] = [None]
+
+
+# ---------------------------
+# Count cache
+# ---------------------------
+class CountCache:
+    """
+    Document counts cached for `ttl` seconds per (collection, query).
+    Unfiltered counts use estimated_document_count (collection metadata,
+    no scan).
+    """
+
+    def __init__(self, ttl=30.0):
+        self.ttl = ttl
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def count(self, collection, query=None):
+        key = (collection.name, repr(sorted((query or {}).items())))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get(key)
+            if cached and now - cached[1] < self.ttl:
+                return cached[0]
+        value = collection.count_documents(query) if query else collection.estimated_document_count()
+        with self._lock:
+            self._counts[key] = (value, now)
+        return value
+
+    def invalidate(self, collection_name=None):
+        """Drop cached counts (for one collection, or all) after writes."""
+        with self._lock:
+            if collection_name is None:
+                self._counts.clear()
+            else:
+                self._counts = {k: v for k, v in self._counts.items() if k[0] != collection_name}
+
+
+count_cache = CountCache()
@@ -0,0 +1,126 @@
+import io
+import os
+import time
+import multiprocessing as mp
+from collections import deque
+from multiprocessing.connection import wait
+
+import pdfplumber
+
+PAGE_BREAK = "\f"        # between pages, like pdftotext
+DEFAULT_MAX_PAGES = 10   # resumes longer than this are truncated
+DEFAULT_TIMEOUT = 30     # seconds per document before its worker is killed
+
+
+# ---------------------------
+# Single document
+# ---------------------------
+def extract_pdf_text(source, max_pages=DEFAULT_MAX_PAGES):
+    """
+    Extract text from a PDF (path, bytes or file-like), at most max_pages pages.
+    Returns {"text", "pages", "truncated"}; pages are separated by PAGE_BREAK.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with pdfplumber.open(source) as pdf:
+        total = len(pdf.pages)
+        pages = [page.extract_text() or "" for page in pdf.pages[:max_pages]]
+    return {
+        "text": PAGE_BREAK.join(pages).strip(),
+        "pages": len(pages),
+        "truncated": total > max_pages,
+    }
+
+
+# ---------------------------
+# Process pool
+# ---------------------------
+def _worker(conn, max_pages):
+    """Worker loop: receive (key, source), send back an extraction result dict."""
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        key, source = task
+        start = time.perf_counter()
+        try:
+            result = extract_pdf_text(source, max_pages=max_pages)
+            result["error"] = None
+        except Exception as e:
+            result = {"text": None, "pages": 0, "truncated": False, "error": str(e)}
+        result.update(source=key, seconds=time.perf_counter() - start)
+        conn.send(result)
+
+
+class _Worker:
+    def __init__(self, ctx, max_pages):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker, args=(child_conn, max_pages), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task = None      # key of the document in progress
+        self.started = None
+
+    def submit(self, key, source):
+        self.task, self.started = key, time.monotonic()
+        self.conn.send((key, source))
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+def _load(source):
+    """Paths are read by the worker; (name, bytes) pairs are shipped as bytes."""
+    if isinstance(source, (tuple, list)):
+        return source[0], source[1]
+    return str(source), str(source)
+
+
+def extract_many(sources, workers=None, timeout=DEFAULT_TIMEOUT, max_pages=DEFAULT_MAX_PAGES):
+    """
+    Extract many PDFs in parallel and yield result dicts as they complete.
+
+    sources: file paths or (name, bytes) pairs.
+    Each document gets `timeout` seconds; a worker stuck past that is killed
+    and replaced, and the document is reported with error="timeout".
+    """
+    ctx = mp.get_context()
+    workers = workers or os.cpu_count() or 1
+    pending = deque(sources)
+    pool = [_Worker(ctx, max_pages) for _ in range(min(workers, len(pending)) or 1)]
+
+    try:
+        while pending or any(w.task is not None for w in pool):
+            for w in pool:
+                if w.task is None and pending:
+                    w.submit(*_load(pending.popleft()))
+
+            busy = [w for w in pool if w.task is not None]
+            ready = wait([w.conn for w in busy], timeout=0.1)
+            for w in busy:
+                if w.conn in ready:
+                    try:
+                        result = w.conn.recv()
+                    except EOFError:  # worker crashed (e.g. segfault in a PDF library)
+                        result = {"source": w.task, "text": None, "pages": 0, "truncated": False,
+                                  "error": "worker crashed", "seconds": time.monotonic() - w.started}
+                        pool[pool.index(w)] = _Worker(ctx, max_pages)
+                        w.stop(kill=True)
+                    w.task = None
+                    yield result
+                elif time.monotonic() - w.started > timeout:
+                    yield {"source": w.task, "text": None, "pages": 0, "truncated": False,
+                           "error": "timeout", "seconds": time.monotonic() - w.started}
+                    w.stop(kill=True)
+                    pool[pool.index(w)] = _Worker(ctx, max_pages)
+    finally:
+        for w in pool:
+            w.stop(kill=w.task is not None)
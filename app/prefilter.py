@@ -0,0 +1,167 @@
+import threading
+import numpy as np
+from app.job_index import preprocess
+from app.ats_checker import skill_matrix
+
+# Location text that marks a job as remote
+REMOTE_TERMS = ("remote", "work from home", "wfh", "anywhere")
+
+
+def location_tokens(location):
+    """Normalized location tokens (remote markers excluded)."""
+    text = preprocess(location)
+    for term in REMOTE_TERMS:
+        text = text.replace(term, " ")
+    return text.split()
+
+
+def is_remote(location):
+    text = preprocess(location)
+    return any(term in text for term in REMOTE_TERMS)
+
+
+def _group(rows, keys):
+    """{key: sorted int32 rows} from parallel (row, key) arrays."""
+    if not len(rows):
+        return {}
+    order = np.lexsort((rows, keys))
+    rows, keys = rows[order], keys[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    return {
+        int(group_keys[0]): group_rows.astype(np.int32)
+        for group_keys, group_rows in zip(np.split(keys, bounds), np.split(rows, bounds))
+    }
+
+
+def _merge(postings, new):
+    """Append postings of rows that come after every existing row (order stays sorted)."""
+    for key, rows in new.items():
+        postings[key] = np.concatenate([postings[key], rows]) if key in postings else rows
+
+
+# ---------------------------
+# Posting lists
+# ---------------------------
+class JobPostings:
+    """
+    Inverted index over a JobIndex's rows for cheap prefiltering: location
+    token -> rows, taxonomy skill -> rows, and the remote rows, each a
+    sorted int32 array. Filters are posting-list intersections, so only the
+    surviving rows get similarity-scored.
+    """
+
+    def __init__(self, job_index):
+        self.terms = {}        # location token -> id (posting keys are ints)
+        self.locations = {}    # token id -> rows
+        self.skills = {}       # taxonomy column -> rows
+        self.remote = np.zeros(0, dtype=np.int32)
+        self.job_ids = []
+        self._append(job_index, 0)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def _append(self, job_index, start):
+        """Index rows [start:] of job_index."""
+        skills = job_index.skills[start:].tocoo()
+        _merge(self.skills, _group(skills.row.astype(np.int64) + start, skills.col.astype(np.int64)))
+
+        # Few distinct locations: tokenize each once, then fan out its rows
+        code_of = {}
+        codes = np.fromiter((code_of.setdefault(loc, len(code_of)) for loc in job_index.locations[start:]),
+                            dtype=np.int64, count=len(job_index) - start)
+        by_location = _group(np.arange(start, len(job_index), dtype=np.int64), codes)
+        rows, keys, remote = [], [], [self.remote]
+        for location, code in code_of.items():
+            for token in set(location_tokens(location)):
+                rows.append(by_location[code])
+                keys.append(np.full(len(by_location[code]), self.terms.setdefault(token, len(self.terms))))
+            if is_remote(location):
+                remote.append(by_location[code])
+        if rows:
+            _merge(self.locations, _group(np.concatenate(rows).astype(np.int64), np.concatenate(keys)))
+        self.remote = np.sort(np.concatenate(remote)).astype(np.int32)
+
+        self.job_ids = list(job_index.job_ids)
+        self.version = job_index.version
+        self.removals = job_index.removals
+
+    def sync(self, job_index):
+        """
+        Catch up with job_index. New jobs are appended as new rows, so they
+        are simply added to the postings; any removal - including a re-upsert,
+        which removes a job and appends it again, possibly at the same row -
+        triggers a rebuild. Returns self or a rebuilt JobPostings.
+        """
+        n = len(self.job_ids)
+        if job_index.removals == self.removals and job_index.job_ids[:n] == self.job_ids:
+            self._append(job_index, n)
+            return self
+        return JobPostings(job_index)
+
+    def candidates(self, location=None, remote=None, skill_cols=None, min_skill_overlap=0):
+        """
+        Sorted rows passing the filters, or None when no filter is set.
+
+        location:          every token must match the job location ("new delhi").
+                           A remote location ("Remote", "WFH") means remote=True
+                           unless `remote` is given.
+        remote:            True admits remote jobs (in addition to `location`, if given);
+                           False drops them.
+        min_skill_overlap: minimum number of `skill_cols` (the resume's skills)
+                           the job requires.
+        """
+        rows = None
+        if remote is None and location and is_remote(location):
+            remote = True
+        tokens = location_tokens(location) if location else []
+        if tokens:
+            for token in tokens:
+                key = self.terms.get(token)
+                posting = self.locations.get(key, np.zeros(0, dtype=np.int32))
+                rows = posting if rows is None else np.intersect1d(rows, posting, assume_unique=True)
+        if remote is True:
+            rows = self.remote if rows is None else np.union1d(rows, self.remote)
+        elif remote is False:
+            rows = np.setdiff1d(np.arange(len(self), dtype=np.int32) if rows is None else rows,
+                                self.remote, assume_unique=True)
+
+        if min_skill_overlap > 0:
+            postings = [self.skills[col] for col in (skill_cols or []) if col in self.skills]
+            total = sum(len(posting) for posting in postings)
+            if rows is None or 4 * len(rows) * np.log2(max(total, 2)) > total:  # cheaper than searching
+                # count hits over every job (one pass over the postings)
+                hits = np.bincount(np.concatenate(postings), minlength=len(self)) if postings else np.zeros(len(self))
+                skilled = np.flatnonzero(hits >= min_skill_overlap).astype(np.int32)
+                rows = skilled if rows is None else rows[hits[rows] >= min_skill_overlap]
+            else:  # few candidates left: binary-search them in each posting list
+                hits = np.zeros(len(rows), dtype=np.int32)
+                for posting in postings:
+                    at = np.minimum(np.searchsorted(posting, rows), len(posting) - 1)
+                    hits += posting[at] == rows
+                rows = rows[hits >= min_skill_overlap]
+        return rows
+
+
+_lock = threading.Lock()
+_cached = {"postings": None, "job_index": None, "version": None}
+
+
+def get_postings(job_index):
+    """JobPostings for job_index, synced incrementally as the index changes."""
+    with _lock:
+        postings = _cached["postings"]
+        if postings is None or _cached["job_index"] is not job_index:
+            postings = JobPostings(job_index)
+        elif _cached["version"] != job_index.version:
+            postings = postings.sync(job_index)
+        _cached.update(postings=postings, job_index=job_index, version=job_index.version)
+        return postings
+
+
+def filter_rows(job_index, resume_text="", location=None, remote=None, min_skill_overlap=0):
+    """JobIndex rows matching the filters (None = no filtering)."""
+    if not location and remote is None and not min_skill_overlap:
+        return None
+    skill_cols = skill_matrix([resume_text]).indices.tolist() if min_skill_overlap else None
+    return get_postings(job_index).candidates(location, remote, skill_cols, min_skill_overlap)
@@ -0,0 +1,198 @@
+import os
+import re
+from collections import Counter
+from app.ats_checker import STOPWORDS
+from app.pdf_extraction import PAGE_BREAK
+from app.skill_taxonomy import get_taxonomy, tokenize
+
+# Token budget for the resume + job description of one Groq request
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 3000))
+JD_SHARE = 0.35          # the job description's share of the budget when both don't fit
+MIN_PARTIAL_TOKENS = 40  # a section that doesn't fit is cut down only if this much room is left
+EDGE_LINES = 3           # lines at the top/bottom of a page checked for running headers/footers
+
+# Rough Llama-3 token count: a token per short word, number chunk or symbol
+TOKEN_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+BOILERPLATE_RE = re.compile(
+    r"^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|resume|curriculum vitae|confidential"
+    r"|references? (?:are )?available (?:up)?on request\.?|i hereby declare\b.*|declaration:?)$",
+    re.I,
+)
+# Bare page numbers ("2", "2 / 5") - only dropped as repeated page-edge lines that match
+# the page's position, never everywhere (a lone "2019" or phone number line is resume content)
+PAGE_NUMBER_RE = re.compile(r"^(\d+)(?:\s*(?:of|/)\s*\d+)?$")
+SPACE_RE = re.compile(r"[ \t ]+")
+DIGITS_RE = re.compile(r"\d+")
+SECTION_PRIORITY = ("header", "skills", "experience", "education", "other")
+
+
+def estimate_tokens(text):
+    """Local approximation of the model's token count (no tokenizer download)."""
+    return sum(1 + (len(piece) - 1) // 8 if piece[0].isalpha() else 1 for piece in TOKEN_RE.findall(text or ""))
+
+
+# ---------------------------
+# Cleanup
+# ---------------------------
+def strip_page_furniture(text):
+    """
+    Drop running headers/footers: lines at the edges of several pages that
+    are the same apart from numbers ("Jane Roe - Page 2 of 3"). The first
+    occurrence stays (page 1's header is usually the name/contact line),
+    except for bare page numbers ("2", "2 / 5" on page 2), which go everywhere.
+    """
+    pages = [page.splitlines() for page in (text or "").split(PAGE_BREAK)]
+    if len(pages) < 2:
+        return text or ""
+    key = lambda line: DIGITS_RE.sub("#", SPACE_RE.sub(" ", line.strip().lower()))
+
+    def edges(lines):
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        return set(filled[:EDGE_LINES] + filled[-EDGE_LINES:])
+
+    seen_on = Counter()
+    for lines in pages:
+        seen_on.update({key(lines[i]) for i in edges(lines)})
+    repeated = {k for k, n in seen_on.items() if n >= max(2, len(pages) // 2)}
+
+    kept, shown = [], set()
+    for page_no, lines in enumerate(pages, 1):
+        edge = edges(lines)
+        for i, line in enumerate(lines):
+            k = key(line) if i in edge else None
+            if k in repeated:
+                number = PAGE_NUMBER_RE.match(line.strip())
+                if number:  # only the page's own number goes, years etc. stay
+                    if int(number.group(1)) == page_no:
+                        continue
+                elif k in shown:
+                    continue
+                shown.add(k)
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def clean_lines(text):
+    """Whitespace collapsed, blank/boilerplate lines and immediate repeats dropped."""
+    lines = []
+    for line in (text or "").replace(PAGE_BREAK, "\n").splitlines():
+        line = SPACE_RE.sub(" ", line).strip()
+        if not line or BOILERPLATE_RE.match(line) or (lines and line == lines[-1]):
+            continue
+        lines.append(line)
+    return lines
+
+
+def split_sections(lines):
+    """[(kind, lines)] in document order; a heading line starts a new section and stays in it."""
+    from app.resume_parser import SECTION_RE, _section_of  # resume_parser imports this module
+
+    sections = [("header", [])]
+    for line in lines:
+        match = SECTION_RE.match(line) if len(line) < 60 or ":" in line[:40] else None
+        if match and (match.group("sep") or not match.group("rest")):
+            sections.append((_section_of(match), []))
+        sections[-1][1].append(line)
+    return [(kind, body) for kind, body in sections if body]
+
+
+# ---------------------------
+# Relevance + budget
+# ---------------------------
+def _relevance(text, jd_terms, jd_skills, taxonomy):
+    terms = {t for t in tokenize(text) if len(t) > 2 and t not in STOPWORDS}
+    skills = taxonomy.find(text)
+    shared_terms = len(terms & jd_terms) / max(len(terms), 1) ** 0.5
+    shared_skills = sum(taxonomy.weight(key) for key in skills if key in jd_skills)
+    return shared_terms + 2 * shared_skills
+
+
+def _truncate(lines, budget):
+    """Leading lines (the last one cut by words) that fit in `budget` tokens."""
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+        words = []
+        for word in line.split():
+            cost = estimate_tokens(word)
+            if used + cost > budget:
+                break
+            words.append(word)
+            used += cost
+        if words:
+            kept.append(" ".join(words) + " …")
+        break
+    return kept
+
+
+def compact_prompt(resume_text, job_description=None, budget=None, prefer=(), taxonomy=None):
+    """
+    Shrink a resume (and job description) to fit `budget` tokens.
+
+    Both are cleaned (whitespace, boilerplate, running page headers/footers).
+    The job description gets JD_SHARE of the budget, or whatever the
+    resume leaves unused if that is more (nothing is cut when both fit); the resume's
+    sections are then kept in order of relevance - the header first, then
+    the `prefer` section kinds, then by shared terms/skills with the job
+    description (or SECTION_PRIORITY without one) - until the budget is
+    spent, and emitted in their original order.
+
+    Returns {"resume", "job_description", "tokens_before", "tokens_after",
+    "tokens_saved", "dropped_sections"}.
+    """
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    taxonomy = taxonomy or get_taxonomy()
+    tokens_before = estimate_tokens(resume_text) + estimate_tokens(job_description)
+
+    sections = split_sections(clean_lines(strip_page_furniture(resume_text)))
+    resume_tokens = sum(estimate_tokens(line) for _, body in sections for line in body)
+    jd_lines = clean_lines(job_description)
+    jd_lines = _truncate(jd_lines, max(int(budget * JD_SHARE), budget - resume_tokens))
+    jd_text = "\n".join(jd_lines)
+    remaining = budget - estimate_tokens(jd_text)
+
+    preferred = [kind for kind in prefer if kind in SECTION_PRIORITY]
+    if jd_text:
+        jd_terms = {t for t in tokenize(jd_text) if len(t) > 2 and t not in STOPWORDS}
+        jd_skills = set(taxonomy.find(jd_text))
+        score = lambda kind, body: _relevance(" ".join(body), jd_terms, jd_skills, taxonomy)
+    else:
+        score = lambda kind, body: -SECTION_PRIORITY.index(kind)
+
+    def rank(i):
+        kind, body = sections[i]
+        return (kind != "header", kind not in preferred, -score(kind, body), i)
+
+    kept, dropped = {}, []
+    for i in sorted(range(len(sections)), key=rank):
+        kind, body = sections[i]
+        cost = sum(estimate_tokens(line) for line in body)
+        if cost <= remaining:
+            kept[i] = body
+            remaining -= cost
+        elif remaining >= MIN_PARTIAL_TOKENS:
+            kept[i] = _truncate(body, remaining)
+            remaining -= sum(estimate_tokens(line) for line in kept[i])
+        else:
+            dropped.append(body[0] if kind != "header" else "header")
+
+    resume = "\n\n".join("\n".join(kept[i]) for i in sorted(kept))
+    tokens_after = estimate_tokens(resume) + estimate_tokens(jd_text)
+    return {
+        "resume": resume,
+        "job_description": jd_text,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+        "dropped_sections": dropped,
+    }
+
+
+def record_usage(usage, compacted):
+    """Copy the token counts of a compact_prompt() result into a caller's `usage` dict."""
+    if usage is not None:
+        usage.update({key: compacted[key] for key in ("tokens_before", "tokens_after", "tokens_saved")})
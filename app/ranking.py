@@ -0,0 +1,223 @@
+import os
+import time
+import threading
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from app.job_index import count_terms, preprocess
+from app.ats_checker import skill_matrix
+from app.skill_taxonomy import get_taxonomy
+
+# Final score = weighted mean of the per-stage scores (each in [0, 1])
+STAGES = ("bm25", "tfidf", "skills")
+DEFAULT_WEIGHTS = {"bm25": 0.6, "tfidf": 0.3, "skills": 0.1}  # tuned with bench_ranking.py
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def parse_weights(spec):
+    """"bm25=0.5,tfidf=0.2,skills=0.3" -> weights dict (missing stages get 0)."""
+    weights = dict.fromkeys(STAGES, 0.0)
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        stage, _, value = part.partition("=")
+        if stage.strip() not in weights:
+            raise ValueError(f"⚠️ Unknown ranking stage: {stage}")
+        weights[stage.strip()] = float(value)
+    return weights
+
+
+MATCH_WEIGHTS = parse_weights(os.environ["MATCH_WEIGHTS"]) if os.getenv("MATCH_WEIGHTS") else DEFAULT_WEIGHTS
+
+
+# ---------------------------
+# Hybrid ranker
+# ---------------------------
+class HybridRanker:
+    """
+    Scores a resume against every job of a JobIndex with three signals:
+
+    bm25:   Okapi BM25 over the job term counts, normalized by the best
+            job's score.
+    tfidf:  cosine similarity against the L2-normalized TF-IDF job matrix.
+    skills: weight of the job's taxonomy skills found in the resume / weight
+            of all the job's skills (the ATS Score, unfloored, as a fraction).
+
+    Per-(job, term) and per-(job, skill) weights are precomputed once into
+    CSC matrices - inverted indexes with one posting column per term/skill -
+    so a query only reads the postings of its own terms and skills, and each
+    stage is one vectorized column-slice product over all jobs. When a
+    prefilter narrows the candidates, whichever is smaller is read: the
+    candidates' rows (row-major copies) or the query's posting columns.
+    """
+
+    def __init__(self, job_index, k1=BM25_K1, b=BM25_B, taxonomy=None):
+        self.job_index = job_index
+        self.version = job_index.version
+        self.taxonomy = taxonomy or get_taxonomy()
+
+        # BM25 postings
+        counts = job_index.counts
+        n_jobs = counts.shape[0]
+        doc_len = np.asarray(counts.sum(axis=1)).ravel()
+        avg_len = doc_len.mean() if n_jobs else 1.0
+        df = job_index.doc_freq
+        idf = np.log(1 + (n_jobs - df + 0.5) / (df + 0.5))
+        idf[df == 0] = 0.0
+        tf = counts.data
+        row_len = np.repeat(doc_len, np.diff(counts.indptr))
+        data = idf[counts.indices] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * row_len / max(avg_len, 1e-9)))
+        self.bm25_rows = sp.csr_matrix(
+            (data.astype(np.float32), counts.indices, counts.indptr), shape=counts.shape
+        )
+        self.postings = self.bm25_rows.tocsc()
+
+        # TF-IDF postings (cosine = dot product of L2-normalized rows)
+        self.tfidf_weights = sp.diags(job_index.idf)
+        self.tfidf_rows = job_index.weighted_matrix()
+        self.tfidf_postings = self.tfidf_rows.tocsc()
+
+        # Skill weights per job (binary presence x taxonomy weight)
+        weights = np.array([self.taxonomy.weight(key) for key in self.taxonomy.keys], dtype=np.float32)
+        skills = job_index.skills[:, :len(weights)]
+        self.skill_rows = (skills > 0).astype(np.float32).multiply(weights).tocsr()
+        self.job_skills = self.skill_rows.tocsc()
+        self.required = np.asarray(self.job_skills.sum(axis=1)).ravel()
+
+    def __len__(self):
+        return len(self.job_index)
+
+    @staticmethod
+    def _scan(postings, row_major, cols, values, rows=None):
+        """matrix[:, cols] @ values, over all jobs or just `rows` (aligned with them)."""
+        if rows is None:
+            return np.asarray(postings[:, cols] @ values).ravel()
+        column_nnz = (postings.indptr[cols + 1] - postings.indptr[cols]).sum()
+        row_nnz = (row_major.indptr[rows + 1] - row_major.indptr[rows]).sum()
+        if column_nnz <= row_nnz:
+            return np.asarray(postings[:, cols] @ values).ravel()[rows]
+        dense = np.zeros(row_major.shape[1], dtype=np.float32)
+        dense[cols] = values
+        return row_major[rows] @ dense
+
+    def stage_scores(self, resume_text, stages=STAGES, timings=None, rows=None):
+        """
+        {stage: score array} for the requested stages, over every job or only
+        the given rows (aligned with them). Timings (ms) are added to `timings`.
+        """
+        timings = {} if timings is None else timings
+        scores = {}
+
+        start = time.perf_counter()
+        corpus = preprocess(resume_text)
+        query = count_terms([corpus], self.job_index.vocabulary)
+        timings["vectorize"] = timings.get("vectorize", 0.0) + (time.perf_counter() - start) * 1000
+
+        if "bm25" in stages:
+            start = time.perf_counter()
+            cols = np.unique(query.indices)  # each query term counts once
+            bm25 = self._scan(self.postings, self.bm25_rows, cols, np.ones(len(cols), dtype=np.float32), rows)
+            top = bm25.max() if len(bm25) else 0.0
+            scores["bm25"] = bm25 / top if top > 0 else bm25
+            timings["bm25"] = timings.get("bm25", 0.0) + (time.perf_counter() - start) * 1000
+
+        if "tfidf" in stages:
+            start = time.perf_counter()
+            query_vec = normalize(query @ self.tfidf_weights).tocsr()  # same counts as BM25, no re-tokenizing
+            scores["tfidf"] = self._scan(self.tfidf_postings, self.tfidf_rows, query_vec.indices,
+                                         query_vec.data, rows)
+            timings["tfidf"] = timings.get("tfidf", 0.0) + (time.perf_counter() - start) * 1000
+
+        if "skills" in stages:
+            start = time.perf_counter()
+            cols = skill_matrix([resume_text], self.taxonomy).indices
+            cols = cols[cols < self.job_skills.shape[1]]
+            matched = self._scan(self.job_skills, self.skill_rows, cols, np.ones(len(cols), dtype=np.float32), rows)
+            required = self.required if rows is None else self.required[rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores["skills"] = np.where(required > 0, matched / required, 0.0)
+            timings["skills"] = timings.get("skills", 0.0) + (time.perf_counter() - start) * 1000
+
+        return scores
+
+    def rank(self, resume_text, top_n=5, weights=None, timings=None, rows=None):
+        """
+        Top-N jobs by the weighted combination of the stage scores, among all
+        jobs or only the candidate `rows` (e.g. from app.prefilter). Stages
+        with weight 0 are skipped. Returns [(row, score, {stage: score}), ...], best first.
+        """
+        weights = {stage: w for stage, w in (weights or MATCH_WEIGHTS).items() if w}
+        total = sum(weights.values())
+        n_scored = len(self) if rows is None else len(rows)
+        if not n_scored or top_n <= 0 or total <= 0:
+            return []
+        timings = {} if timings is None else timings
+        scores = self.stage_scores(resume_text, tuple(weights), timings, rows)
+
+        start = time.perf_counter()
+        final = sum(w * scores[stage] for stage, w in weights.items()) / total
+        k = min(top_n, len(final))
+        best = np.argpartition(-final, k - 1)[:k]
+        best = best[np.argsort(-final[best], kind="stable")]
+        ranked = [
+            (int(i if rows is None else rows[i]), float(final[i]), {stage: float(scores[stage][i]) for stage in scores})
+            for i in best
+        ]
+        timings["combine"] = timings.get("combine", 0.0) + (time.perf_counter() - start) * 1000
+        return ranked
+
+
+_lock = threading.Lock()
+_cached = {"ranker": None, "job_index": None, "version": None}
+
+
+def get_ranker(job_index):
+    """HybridRanker for job_index, rebuilt when the index changed."""
+    with _lock:
+        if _cached["job_index"] is not job_index or _cached["version"] != job_index.version:
+            _cached.update(ranker=HybridRanker(job_index), job_index=job_index, version=job_index.version)
+        return _cached["ranker"]
+
+
+# ---------------------------
+# Offline evaluation
+# ---------------------------
+def ndcg_at_k(ranked_ids, relevance, k):
+    """NDCG@k with graded relevance ({job_id: grade}, missing = 0)."""
+    gains = [relevance.get(job_id, 0) for job_id in ranked_ids[:k]]
+    dcg = sum((2 ** g - 1) / np.log2(i + 2) for i, g in enumerate(gains))
+    ideal = sorted(relevance.values(), reverse=True)[:k]
+    idcg = sum((2 ** g - 1) / np.log2(i + 2) for i, g in enumerate(ideal))
+    return dcg / idcg if idcg > 0 else 0.0
+
+
+def recall_at_k(ranked_ids, relevance, k):
+    """Share of the relevant (grade > 0) jobs found in the top k."""
+    relevant = {job_id for job_id, grade in relevance.items() if grade > 0}
+    if not relevant:
+        return 0.0
+    return len(relevant & set(ranked_ids[:k])) / len(relevant)
+
+
+def evaluate(ranker, queries, weights=None, k=5):
+    """
+    Mean NDCG@k / recall@k over labeled queries ({"resume", "relevance"})
+    and per-stage latency percentiles (ms) across the queries.
+    """
+    ndcg, recall, latencies = [], [], {}
+    for query in queries:
+        timings = {}
+        ranked = ranker.rank(query["resume"], top_n=k, weights=weights, timings=timings)
+        ranked_ids = [ranker.job_index.job_ids[row] for row, _, _ in ranked]
+        ndcg.append(ndcg_at_k(ranked_ids, query["relevance"], k))
+        recall.append(recall_at_k(ranked_ids, query["relevance"], k))
+        timings["total"] = sum(timings.values())
+        for stage, ms in timings.items():
+            latencies.setdefault(stage, []).append(ms)
+    return {
+        f"ndcg@{k}": float(np.mean(ndcg)) if ndcg else 0.0,
+        f"recall@{k}": float(np.mean(recall)) if recall else 0.0,
+        "latency_ms": {
+            stage: {"p50": float(np.percentile(ms, 50)), "p95": float(np.percentile(ms, 95))}
+            for stage, ms in latencies.items()
+        },
+    }
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import sqlite3
+import contextlib
+import hashlib
+import threading
+
+BASE_DIR = os.path.dirname(__file__)
+CACHE_PATH = os.getenv("RESUME_CACHE_PATH", os.path.join(BASE_DIR, "cache", "resume_cache.sqlite3"))
+CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def pdf_digest(data: bytes) -> str:
+    """Content address of an uploaded PDF."""
+    return hashlib.sha256(data).hexdigest()
+
+
+# ---------------------------
+# On-disk cache
+# ---------------------------
+class ResumeCache:
+    """
+    Persistent cache for per-PDF results (extracted text, rule-based and AI
+    parses), keyed by (SHA-256 of the PDF bytes, kind). Stored in SQLite with
+    size-based LRU eviction; hit/miss counters and the compute time saved by
+    hits are persisted alongside.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " digest TEXT, kind TEXT, value TEXT, size INTEGER, cost REAL, last_access REAL,"
+                " PRIMARY KEY (digest, kind))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                " kind TEXT PRIMARY KEY, hits INTEGER DEFAULT 0, misses INTEGER DEFAULT 0,"
+                " saved_seconds REAL DEFAULT 0)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Connection for one transaction (committed, or rolled back on error), closed afterwards."""
+        with contextlib.closing(sqlite3.connect(self.path, timeout=30)) as conn, conn:
+            yield conn
+
+    def _count(self, conn, kind, hit, saved=0.0):
+        conn.execute("INSERT OR IGNORE INTO stats (kind) VALUES (?)", (kind,))
+        column = "hits" if hit else "misses"
+        conn.execute(
+            f"UPDATE stats SET {column} = {column} + 1, saved_seconds = saved_seconds + ? WHERE kind = ?",
+            (saved, kind),
+        )
+
+    def get(self, digest, kind):
+        """Cached value or None (counts a hit or a miss)."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, cost FROM entries WHERE digest = ? AND kind = ?", (digest, kind)
+            ).fetchone()
+            if row is None:
+                self._count(conn, kind, hit=False)
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ? WHERE digest = ? AND kind = ?",
+                (time.time(), digest, kind),
+            )
+            self._count(conn, kind, hit=True, saved=row[1] or 0.0)
+            return json.loads(row[0])
+
+    def put(self, digest, kind, value, cost=0.0):
+        """Store a JSON-serializable value, then evict least recently used entries over max_bytes."""
+        payload = json.dumps(value, default=str)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, kind, payload, len(payload), cost, time.time()),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute("SELECT digest, kind, size FROM entries ORDER BY last_access").fetchall()
+                evict = []
+                for d, k, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    evict.append((d, k))
+                    total -= size
+                conn.executemany("DELETE FROM entries WHERE digest = ? AND kind = ?", evict)
+
+    def get_or_compute(self, digest, kind, compute, cacheable=lambda value: value is not None):
+        """Return the cached value, or compute, store (if cacheable) and return it."""
+        value = self.get(digest, kind)
+        if value is not None:
+            return value
+        start = time.perf_counter()
+        value = compute()
+        if cacheable(value):
+            self.put(digest, kind, value, cost=time.perf_counter() - start)
+        return value
+
+    def stats(self):
+        """{kind: {"hits", "misses", "saved_seconds"}} plus entry count and size."""
+        with self._connect() as conn:
+            result = {
+                kind: {"hits": hits, "misses": misses, "saved_seconds": round(saved, 2)}
+                for kind, hits, misses, saved in conn.execute("SELECT * FROM stats")
+            }
+            count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        result["_store"] = {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
+        return result
+
+
+_default = {"cache": None}
+
+
+def get_resume_cache():
+    """Process-wide cache instance at CACHE_PATH."""
+    if _default["cache"] is None:
+        _default["cache"] = ResumeCache()
+    return _default["cache"]
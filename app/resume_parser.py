@@ -1,8 +1,14 @@
 import re
 import os
+import time
 import requests
 import json
+import threading
+from collections import deque
 from dotenv import load_dotenv
+from app.llm_cache import cached_chat_completion
+from app.skill_taxonomy import get_taxonomy, tokenize
+from app.prompt_compactor import compact_prompt, record_usage
 
 # Load environment variables from .env
 load_dotenv()
@@ -10,75 +16,232 @@ load_dotenv()
 # ----------------------------
 # Rule-based Parser
 # ----------------------------
-def parse_resume_text(resume_text: str) -> dict:
-    """Extracts basic fields from resume text using regex (fast but limited)."""
-    parsed_data = {}
+RULE_CACHE_KIND = "rule:v2"  # resume cache key; bump when the rule-based output changes
+AI_PARSER = "ai"             # `parser` of AI-parsed resumes; never overwritten by a rule re-parse
+SCHEMA_FIELDS = ("Name", "Email", "Phone", "Skills", "Education", "Experience")
+
+# Compiled once at import; the whole text is scanned once for contacts
+CONTACT_RE = re.compile(
+    r"(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+    r"|(?P<phone>\+?\d[\d\s().-]{8,}\d)"
+)
+TITLE_RE = re.compile(r"(resume|curriculum vitae|\bcv\b)", re.I)
+NAME_RE = re.compile(r"^[A-Za-z][A-Za-z.'\- ]{0,60}$")
+CONTACT_LABEL_RE = re.compile(r"\b(e-?mail|phone|mobile|tel|contact|linkedin|github|address)\b", re.I)
+NAME_STRIP = " |,;:-–/"
+SECTION_RE = re.compile(
+    r"^\s*(?P<heading>"
+    r"(?P<education>education(?:al)?(?: (?:background|qualifications?|details))?|academics?|academic (?:background|qualifications?)|qualifications?)"
+    r"|(?P<experience>(?:(?:work|professional|relevant|industry) )?experience|employment(?: history)?|work history|career history)"
+    r"|(?P<skills>(?:(?:technical|key|core|professional) )?skills(?: (?:&|and) (?:tools|technologies))?|technologies|tech stack|(?:core )?competencies)"
+    r"|(?P<other>projects?|certifications?|summary|profile|objective|about me|achievements|awards|publications|languages|interests|hobbies|references|contact(?: information)?|personal (?:details|information))"
+    r")\s*(?P<sep>:|-|–)?\s*(?P<rest>.*)$",
+    re.I,
+)
+BULLET_RE = re.compile(r"^[\s•▪●◦*·\-–>]+")
+ITEM_SPLIT_RE = re.compile(r"\s*[,;|•·]\s*")
+DEGREE_RE = re.compile(
+    r"\b(b\.?\s?tech|m\.?\s?tech|b\.?\s?e|m\.?\s?e|b\.?\s?sc|m\.?\s?sc|bca|mca|mba|ph\.?\s?d|"
+    r"bachelor'?s?|master'?s?|diploma|degree|university|college|institute)\b",
+    re.I,
+)
+EXPERIENCE_RE = re.compile(
+    r"\b(\d+\+?\s*(?:years?|yrs?)\b|(?:19|20)\d{2}\s*(?:-|–|to)\s*(?:(?:19|20)\d{2}|present|current)\b|"
+    r"(?:engineer|developer|analyst|scientist|manager|intern|consultant|lead)\b.*\b(?:at|@)\b)",
+    re.I,
+)
+BULLET_CHARS = frozenset("•▪●◦*·-–>")
+MAX_SKILL_ITEM_WORDS = 4
+
+
+def _clean_line(line):
+    return BULLET_RE.sub("", line).strip() if line[:1] in BULLET_CHARS else line
+
+
+def _section_of(match):
+    for section in ("education", "experience", "skills"):
+        if match.group(section):
+            return section
+    return "other"
+
+
+def extract_skills(resume_text, taxonomy=None):
+    """Taxonomy skills (display names) in order of first mention, one pass over the tokens."""
+    taxonomy = taxonomy or get_taxonomy()
+    return [taxonomy.names[taxonomy.index[key]] for key in taxonomy.find_tokens(tokenize(resume_text or ""))]
+
+
+def segment_sections(lines):
+    """
+    {"education"|"experience"|"skills"|"other"|"header": [lines]} from
+    heading lines ("Work Experience", "Skills: Python, SQL", ...). Text
+    after a heading on the same line belongs to that section; lines before
+    the first heading are the "header".
+    """
+    sections = {"header": []}
+    current = "header"
+    for line in lines:
+        match = SECTION_RE.match(line) if len(line) < 60 or ":" in line[:40] else None
+        if match and (match.group("sep") or not match.group("rest")):  # "Skills: ..." but not "Experience in X"
+            current = _section_of(match)
+            sections.setdefault(current, [])
+            line = match.group("rest")
+        line = _clean_line(line)
+        if line:
+            sections[current].append(line)
+    return sections
+
+
+def parse_resume_text(resume_text: str, taxonomy=None) -> dict:
+    """
+    Rule-based parse into the same schema as ai_parse_resume_text.
+    Patterns are precompiled; the text is split into lines once (section
+    segmentation), scanned once for email/phone, and tokenized once for
+    dictionary skill matching (app/data/skills.json, any size).
+    """
+    return _rule_parse(resume_text, taxonomy)[0]
+
+
+def _rule_parse(resume_text, taxonomy=None):
+    """(parsed fields, sections) - the sections feed confidence and the trimmed LLM prompt."""
+    taxonomy = taxonomy or get_taxonomy()
+    parsed_data = {field: None for field in SCHEMA_FIELDS[:3]}
+    parsed_data.update({field: [] for field in SCHEMA_FIELDS[3:]})
+    sections = {"header": []}
 
     try:
-        # Name (first line assumption, skip headers like Resume/CV)
-        lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
-        parsed_data["Name"] = (
-            lines[0]
-            if lines and not re.search(r"(resume|curriculum vitae)", lines[0], re.I)
-            else None
-        )
-
-        # Email
-        email_match = re.search(
-            r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", resume_text
-        )
-        parsed_data["Email"] = email_match.group() if email_match else None
-
-        # Phone
-        phone_match = re.search(r"\+?\d[\d\s-]{8,}\d", resume_text)
-        parsed_data["Phone"] = phone_match.group() if phone_match else None
-
-        # Skills
-        skills = re.findall(
-            r"\b(Python|Java|C\+\+|SQL|Machine Learning|Deep Learning|AI|Data Science)\b",
-            resume_text,
-            re.I,
-        )
-        parsed_data["Skills"] = (
-            list(set([s.title() for s in skills])) if skills else []
-        )
+        lines = [l.strip() for l in (resume_text or "").splitlines() if l.strip()]
+        sections = segment_sections(lines)
+
+        for match in CONTACT_RE.finditer(resume_text or ""):
+            kind = match.lastgroup
+            if kind == "phone" and not 10 <= sum(c.isdigit() for c in match.group()) <= 15:
+                continue  # date ranges, ids, ...
+            if parsed_data[kind.title()] is None:
+                parsed_data[kind.title()] = match.group().strip()
+            if parsed_data["Email"] and parsed_data["Phone"]:
+                break
+
+        # Name: first header line that isn't a title, once contacts are stripped from it
+        for line in sections["header"] or lines[:1]:
+            candidate = CONTACT_RE.sub(" ", line).strip(NAME_STRIP)
+            if TITLE_RE.search(line) or CONTACT_LABEL_RE.search(candidate) or not NAME_RE.match(candidate):
+                continue
+            words = candidate.split()
+            if len(words) <= 5 and all(word[0].isupper() for word in words):  # "Jane Roe", not a sentence
+                parsed_data["Name"] = candidate
+            break
+
+        # Skills: dictionary hits anywhere, plus short items listed under a Skills heading
+        skills = extract_skills(resume_text, taxonomy)
+        seen = {skill.lower() for skill in skills}
+        for line in sections.get("skills", []):
+            for item in ITEM_SPLIT_RE.split(line):
+                item = item.strip(" .:")
+                if item and item.lower() not in seen and len(item.split()) <= MAX_SKILL_ITEM_WORDS \
+                        and not taxonomy.find(item):  # items naming a known skill are already in
+                    seen.add(item.lower())
+                    skills.append(item)
+        parsed_data["Skills"] = skills
+
+        # Education / Experience: their sections, else lines that look like them
+        unsectioned = sections["header"] if len(sections) == 1 else []
+        parsed_data["Education"] = sections.get("education") or [l for l in unsectioned if DEGREE_RE.search(l)]
+        parsed_data["Experience"] = sections.get("experience") or [
+            l for l in unsectioned if EXPERIENCE_RE.search(l) and not DEGREE_RE.search(l)
+        ]
 
     except Exception as e:
         parsed_data["Error"] = f"Rule-based parsing failed: {e}"
 
-    return parsed_data
+    return parsed_data, sections
+
+
+# ----------------------------
+# Field confidence
+# ----------------------------
+CONFIDENCE_THRESHOLD = float(os.getenv("PARSE_CONFIDENCE_THRESHOLD", 0.6))
+PHONE_LIKE_RE = re.compile(r"\d[\d\s().-]{8,}\d")
+
+# Sections an LLM needs to see to extract each field
+FIELD_SECTIONS = {
+    "Name": ("header",), "Email": ("header",), "Phone": ("header",),
+    "Skills": ("skills", "experience", "other"),
+    "Education": ("education",), "Experience": ("experience",),
+}
+
+
+def field_confidence(parsed, sections, resume_text):
+    """
+    {field: 0..1} - how much the rule-based value can be trusted. A field
+    that is missing is still confident when the text gives nothing to find
+    (no "@" for Email); list fields are confident when they came from their
+    own section rather than from pattern-matched lines.
+    """
+    text = resume_text or ""
+    headed = len(sections) > 1
+    confidence = {
+        "Name": 0.9 if parsed.get("Name") else 0.2,
+        "Email": 1.0 if parsed.get("Email") else (0.3 if "@" in text else 0.9),
+        "Phone": 0.9 if parsed.get("Phone") else (0.3 if any(
+            10 <= sum(c.isdigit() for c in m.group()) for m in PHONE_LIKE_RE.finditer(text)) else 0.8),
+    }
+    n_skills = len(parsed.get("Skills") or [])
+    if sections.get("skills"):
+        confidence["Skills"] = 0.95 if n_skills else 0.3
+    else:
+        confidence["Skills"] = min(0.9, 0.2 + 0.2 * n_skills)
+    for field in ("Education", "Experience"):
+        if sections.get(field.lower()):
+            confidence[field] = 0.9
+        elif parsed.get(field):
+            confidence[field] = 0.5  # pattern-matched lines, no heading
+        else:
+            confidence[field] = 0.7 if headed else 0.3  # a sectioned resume without one probably has none
+    if "Error" in parsed:
+        confidence = dict.fromkeys(confidence, 0.0)
+    return confidence
+
+
+def trimmed_resume_text(resume_text, sections, fields):
+    """Only the sections the low-confidence fields need (the full text if one of them has no section)."""
+    wanted = {section for field in fields for section in FIELD_SECTIONS[field]}
+    if any(not any(sections.get(s) for s in FIELD_SECTIONS[field]) for field in fields):
+        return resume_text
+    parts = [
+        "\n".join(lines) if name == "header" else f"{name.title()}:\n" + "\n".join(lines)
+        for name, lines in sections.items() if name in wanted and lines
+    ]
+    return "\n\n".join(parts)
 
 
 # ----------------------------
 # AI-powered Parser (Groq)
 # ----------------------------
-def ai_parse_resume_text(resume_text: str) -> dict:
+FIELD_TYPES = {field: "string or null" for field in SCHEMA_FIELDS[:3]}
+FIELD_TYPES.update({field: "list of strings" for field in SCHEMA_FIELDS[3:]})
+
+
+def ai_parse_resume_text(resume_text: str, fields=SCHEMA_FIELDS, usage=None) -> dict:
     """
     Uses Groq AI API to parse resumes into structured JSON with the same schema
-    as the rule-based parser. Requires GROQ_API_KEY env variable.
+    as the rule-based parser (or only `fields` of it). Requires GROQ_API_KEY env variable.
+    The resume is compacted to the prompt token budget first, keeping the
+    sections the fields come from; token counts are added to `usage`.
     """
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise ValueError("⚠️ GROQ_API_KEY not set in environment variables")
 
-    # ✅ Correct Groq endpoint
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+    compacted = compact_prompt(resume_text, prefer=[s for f in fields for s in FIELD_SECTIONS[f]])
+    record_usage(usage, compacted)
 
     system_prompt = (
         "You are a resume parsing expert. Extract ONLY the following fields "
         "and respond in strict JSON format (no explanations, no markdown):\n"
         "{\n"
-        '  "Name": string or null,\n'
-        '  "Email": string or null,\n'
-        '  "Phone": string or null,\n'
-        '  "Skills": list of strings,\n'
-        '  "Education": list of strings,\n'
-        '  "Experience": list of strings\n'
-        "}"
+        + ",\n".join(f'  "{field}": {FIELD_TYPES[field]}' for field in fields)
+        + "\n}"
     )
 
     # ✅ Use a supported model (from list_models.py)
@@ -86,15 +249,14 @@ def ai_parse_resume_text(resume_text: str) -> dict:
         "model": "llama-3.1-8b-instant",
         "messages": [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Resume Text:\n\n{resume_text}"},
+            {"role": "user", "content": f"Resume Text:\n\n{compacted['resume']}"},
         ],
         "temperature": 0.1,
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        result = response.json()
+        # Identical requests are served from the response cache
+        result = cached_chat_completion(api_key, payload, timeout=30)
 
         # Debug: Print raw response (optional, can remove later)
         # print(json.dumps(result, indent=2))
@@ -105,16 +267,8 @@ def ai_parse_resume_text(resume_text: str) -> dict:
         parsed = json.loads(ai_output)
 
         # Ensure schema consistency (fill missing keys with defaults)
-        schema = {
-            "Name": None,
-            "Email": None,
-            "Phone": None,
-            "Skills": [],
-            "Education": [],
-            "Experience": [],
-        }
-        for key in schema:
-            parsed.setdefault(key, schema[key])
+        for key in fields:
+            parsed.setdefault(key, [] if FIELD_TYPES[key] == "list of strings" else None)
 
         return parsed
 
@@ -131,3 +285,88 @@ def ai_parse_resume_text(resume_text: str) -> dict:
             "Error": f"Unexpected AI parser error: {e}",
             "RawResponse": locals().get("result", {}),
         }
+
+
+# ----------------------------
+# Tiered Parser (rules first, AI for what they missed)
+# ----------------------------
+TIERED_CACHE_KIND = f"tiered:{RULE_CACHE_KIND}"
+
+
+class TierStats:
+    """Recent tiered parses: share resolved without an LLM call and latency saved."""
+
+    def __init__(self, maxlen=1000):
+        self._records = deque(maxlen=maxlen)  # (rule_ms, llm_ms | None, chars sent, chars total)
+        self._lock = threading.Lock()
+
+    def record(self, rule_ms, llm_ms, chars_sent, chars_total):
+        with self._lock:
+            self._records.append((rule_ms, llm_ms, chars_sent, chars_total))
+
+    def summary(self):
+        """
+        Medians over the recent parses. Saved latency compares each parse with
+        an AI-only parse, estimated as the median observed LLM call.
+        """
+        with self._lock:
+            records = list(self._records)
+        if not records:
+            return {"resumes": 0}
+        median = lambda values: sorted(values)[len(values) // 2] if values else None
+        llm_ms = [r[1] for r in records if r[1] is not None]
+        ai_only_ms = median(llm_ms)
+        sent = sum(r[2] for r in records if r[1] is not None)
+        total = sum(r[3] for r in records if r[1] is not None)
+        return {
+            "resumes": len(records),
+            "rule_only": len(records) - len(llm_ms),
+            "rule_only_share": round(1 - len(llm_ms) / len(records), 3),
+            "p50_rule_ms": round(median([r[0] for r in records]), 2),
+            "p50_llm_ms": round(ai_only_ms, 1) if llm_ms else None,
+            "p50_saved_ms": round(median([ai_only_ms - r[0] - (r[1] or 0) for r in records]), 1) if llm_ms else None,
+            "prompt_chars_saved": round(1 - sent / total, 3) if total else None,
+        }
+
+
+tier_stats = TierStats()
+
+
+def tiered_parse_resume_text(resume_text: str, threshold=CONFIDENCE_THRESHOLD, taxonomy=None,
+                             ai_parse=None, stats=tier_stats) -> dict:
+    """
+    Rule-based parse, then an AI parse of only the fields whose confidence is
+    below `threshold`, sent only the sections those fields need. Adds
+    "Confidence" ({field: score}) and "LLM Fields" (the fields asked of the
+    LLM); if the LLM call fails, the rule-based values stay and "LLM Error"
+    says why.
+    """
+    ai_parse = ai_parse or ai_parse_resume_text
+    start = time.perf_counter()
+    parsed, sections = _rule_parse(resume_text, taxonomy)
+    confidence = field_confidence(parsed, sections, resume_text)
+    low = [field for field in SCHEMA_FIELDS if confidence[field] < threshold]
+    rule_ms = (time.perf_counter() - start) * 1000
+
+    llm_ms, excerpt = None, ""
+    if low:
+        excerpt = trimmed_resume_text(resume_text, sections, low)
+        start = time.perf_counter()
+        try:
+            ai_result = ai_parse(excerpt, fields=low)
+        except ValueError as e:  # no API key
+            ai_result = {"Error": str(e)}
+        llm_ms = (time.perf_counter() - start) * 1000
+        if "Error" in ai_result:
+            parsed["LLM Error"] = ai_result["Error"]
+        else:
+            parsed.pop("Error", None)
+            for field in low:
+                if ai_result.get(field):
+                    parsed[field] = ai_result[field]
+
+    parsed["Confidence"] = {field: round(score, 2) for field, score in confidence.items()}
+    parsed["LLM Fields"] = low
+    if stats is not None:
+        stats.record(rule_ms, llm_ms, len(excerpt), len(resume_text or ""))
+    return parsed
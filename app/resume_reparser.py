@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.mongodb_config import resumes_collection
+from app.resume_parser import AI_PARSER, RULE_CACHE_KIND, SCHEMA_FIELDS, parse_resume_text
+from app.pagination import iter_batches
+
+DEFAULT_BATCH_SIZE = 500    # resumes read (and bulk-updated) at a time
+PARSE_CHUNK = 50            # resumes per process-pool task
+DEFAULT_CHECKPOINT = "resume_reparse.checkpoint.json"
+STAGES = ("read", "parse", "write", "checkpoint")
+
+
+# ---------------------------
+# Checkpoints
+# ---------------------------
+def load_checkpoint(path, target, parser):
+    """Saved progress of an unfinished run over this collection/parser, or None."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if checkpoint.get("target") != target or checkpoint.get("parser") != parser:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+# ---------------------------
+# Parsing (runs in the worker processes)
+# ---------------------------
+def _parse_chunk(items):
+    """[(resume _id, raw text)] -> ([(resume _id, parsed)], worker seconds)."""
+    start = time.perf_counter()
+    parsed = [(resume_id, parse_resume_text(text)) for resume_id, text in items]
+    return parsed, time.perf_counter() - start
+
+
+def _submit(pool, items):
+    if pool is None:  # inline (workers <= 1)
+        future = Future()
+        future.set_result(_parse_chunk(items))
+        return future
+    return pool.submit(_parse_chunk, items)
+
+
+def _update(resume_id, parsed, parser, now):
+    """UpdateOne replacing the parsed fields of one resume (upload metadata untouched)."""
+    fields = {field: parsed.get(field) for field in SCHEMA_FIELDS}
+    update = {"$set": {**fields, "parser": parser, "parsed_at": now}}
+    if "Error" in parsed:
+        update["$set"]["Error"] = parsed["Error"]
+    else:
+        update["$unset"] = {"Error": ""}
+    return UpdateOne({"_id": resume_id}, update)
+
+
+# ---------------------------
+# Bulk re-parse
+# ---------------------------
+def reparse_resumes(collection=None, workers=None, batch_size=DEFAULT_BATCH_SIZE, checkpoint_path=None,
+                    resume=True, force=False, parser=RULE_CACHE_KIND):
+    """
+    Re-run parse_resume_text over the stored resumes (their `raw_text`) and
+    write the parsed fields back.
+
+    Resumes are streamed in _id keyset batches; each batch is parsed on a
+    process pool while the next one is read, then written with one unordered
+    bulk_write. The last written _id is checkpointed after every batch, so a
+    rerun resumes there unless resume=False. Resumes already parsed by this
+    parser version are skipped unless force=True; AI-parsed ones always are.
+    Resumes stored without `raw_text` can't be re-parsed and are only
+    counted (`skipped_no_text`).
+    """
+    collection = resumes_collection if collection is None else collection
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    checkpoint_path = checkpoint_path or DEFAULT_CHECKPOINT
+    checkpoint = load_checkpoint(checkpoint_path, collection.name, parser) if resume else None
+    if checkpoint:
+        print(f"↩️ Resuming re-parse after resume {checkpoint['last_id']}.")
+    else:
+        checkpoint = {"target": collection.name, "parser": parser, "last_id": None,
+                      "parsed": 0, "updated": 0, "errors": 0}
+
+    skipped = collection.count_documents({"raw_text": {"$exists": False}})
+    if skipped:
+        print(f"⚠️ Skipping {skipped} resumes stored without raw_text (re-upload them to re-parse).")
+
+    query = {"raw_text": {"$exists": True},
+             "parser": {"$ne": AI_PARSER} if force else {"$nin": [AI_PARSER, parser]}}
+    if checkpoint["last_id"]:
+        query["_id"] = {"$gt": ObjectId(checkpoint["last_id"])}
+    batches = iter_batches(collection, batch_size=batch_size, projection={"raw_text": 1}, query=query)
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    worker_seconds = 0.0
+    processed = 0
+
+    def _finish(last_id, futures):
+        nonlocal worker_seconds, processed
+        start = time.perf_counter()
+        results = []
+        for future in futures:
+            parsed, seconds = future.result()
+            results.extend(parsed)
+            worker_seconds += seconds
+        timings["parse"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        if results:
+            result = collection.bulk_write([_update(rid, parsed, parser, now) for rid, parsed in results],
+                                           ordered=False)
+            checkpoint["updated"] += result.modified_count
+        checkpoint["parsed"] += len(results)
+        checkpoint["errors"] += sum("Error" in parsed for _, parsed in results)
+        processed += len(results)
+        timings["write"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        checkpoint["last_id"] = str(last_id)
+        save_checkpoint(checkpoint_path, checkpoint)
+        timings["checkpoint"] += time.perf_counter() - start
+
+    # spawn: workers must not inherit the parent's MongoClient sockets
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) if workers > 1 else None
+    started = time.perf_counter()
+    pending = None
+    try:
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            timings["read"] += time.perf_counter() - start
+            if batch is None:
+                break
+
+            start = time.perf_counter()
+            items = [(doc["_id"], doc.get("raw_text") or "") for doc in batch]
+            futures = [_submit(pool, items[i:i + PARSE_CHUNK]) for i in range(0, len(items), PARSE_CHUNK)]
+            timings["parse"] += time.perf_counter() - start
+
+            if pending:  # write the previous batch while this one parses
+                _finish(*pending)
+            pending = (batch[-1]["_id"], futures)
+        if pending:
+            _finish(*pending)
+    except Exception as e:
+        return {"error": f"⚠️ Re-parse stopped after resume {checkpoint['last_id']} (rerun to resume): {e}"}
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return {
+        "parsed": checkpoint["parsed"],
+        "updated": checkpoint["updated"],
+        "errors": checkpoint["errors"],
+        "skipped_no_text": skipped,
+        "workers": max(workers, 1),
+        "seconds": round(elapsed, 2),
+        "docs_per_second": round(processed / elapsed, 1) if elapsed > 0 else 0.0,
+        "stage_seconds": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        "worker_parse_seconds": round(worker_seconds, 3),
+        "message": "✅ Resumes re-parsed.",
+    }
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+if __name__ == "__main__":
+    # python -m app.resume_reparser [--workers 8] [--batch-size 1000] [--force] [--restart]
+    import argparse
+    parser = argparse.ArgumentParser(description="Re-parse every stored resume with the current rule-based parser.")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count, 1 = inline)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--force", action="store_true", help="also re-parse resumes already at this parser version")
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint")
+    args = parser.parse_args()
+    result = reparse_resumes(workers=args.workers, batch_size=args.batch_size, checkpoint_path=args.checkpoint,
+                             resume=not args.restart, force=args.force)
+    print(result)
+    sys.exit(1 if "error" in result else 0)
@@ -0,0 +1,128 @@
+import os
+import re
+import json
+import string
+from collections import Counter
+
+BASE_DIR = os.path.dirname(__file__)
+SKILLS_FILE = os.getenv("SKILLS_FILE", os.path.join(BASE_DIR, "data", "skills.json"))
+
+# "+" and "#" stay part of tokens so C++ / C# survive normalization
+_PUNCT = "".join(c for c in string.punctuation if c not in "+#")
+_PUNCT_TABLE = str.maketrans(_PUNCT, " " * len(_PUNCT))
+
+
+def normalize_text(text: str) -> str:
+    if not text:
+        return ""
+    return re.sub(r"\s+", " ", text.lower().translate(_PUNCT_TABLE)).strip()
+
+
+def tokenize(text: str) -> list:
+    return normalize_text(text).split()
+
+
+# ---------------------------
+# Skill taxonomy
+# ---------------------------
+class SkillTaxonomy:
+    """
+    Skill list with aliases and weights, compiled once into an Aho-Corasick
+    automaton over normalized tokens. Matching is a single pass over a
+    text's tokens regardless of the number of skills; token-level matching
+    gives word boundaries for free, and overlapping hits resolve
+    leftmost-longest ("power bi" is Power BI, not also BI).
+    """
+
+    def __init__(self, skills):
+        self.keys, self.names, self.weights = [], [], {}
+        goto, out = [{}], [[]]
+
+        for skill in skills:
+            key = skill["name"].lower()
+            if key in self.weights:
+                continue
+            idx = len(self.keys)
+            self.keys.append(key)
+            self.names.append(skill["name"])
+            self.weights[key] = skill.get("weight", 1)
+
+            for pattern in [skill["name"], *skill.get("aliases", [])]:
+                tokens = tokenize(pattern)
+                if not tokens:
+                    continue
+                state = 0
+                for token in tokens:
+                    nxt = goto[state].get(token)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][token] = nxt
+                        goto.append({})
+                        out.append([])
+                    state = nxt
+                if not out[state]:  # first skill to claim an alias wins
+                    out[state].append((idx, len(tokens)))
+
+        # Failure links (BFS), with outputs merged along them
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for token, nxt in goto[state].items():
+                f = fail[state]
+                while f and token not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(token, 0) if goto[f].get(token) != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+
+        self._goto, self._fail, self._out = goto, fail, out
+        self._vocab = frozenset(token for edges in goto for token in edges)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+    @classmethod
+    def from_file(cls, path=SKILLS_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find_tokens(self, tokens) -> Counter:
+        """Skill key -> occurrence count over an already tokenized text."""
+        goto, fail, out, vocab = self._goto, self._fail, self._out, self._vocab
+        hits = []
+        state = 0
+        for i, token in enumerate(tokens):
+            if token not in vocab:  # in no skill pattern: no match spans it, back to the root
+                state = 0
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for idx, length in out[state]:
+                hits.append((i - length + 1, -length, idx))
+
+        counts = Counter()
+        end = 0
+        for start, neg_length, idx in sorted(hits):
+            if start >= end:
+                counts[self.keys[idx]] += 1
+                end = start - neg_length
+        return counts
+
+    def find(self, text) -> Counter:
+        """Skill key -> occurrence count in raw text (one pass)."""
+        return self.find_tokens(tokenize(text))
+
+    def weight(self, key):
+        return self.weights.get(key, 1)
+
+
+_default = {"taxonomy": None}
+
+
+def get_taxonomy():
+    """Default taxonomy from SKILLS_FILE, compiled once per process."""
+    if _default["taxonomy"] is None:
+        _default["taxonomy"] = SkillTaxonomy.from_file()
+    return _default["taxonomy"]
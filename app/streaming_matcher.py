@@ -0,0 +1,42 @@
+import heapq
+import numpy as np
+from app.job_index import JOB_PROJECTION, job_tokens
+from app.pagination import iter_batches
+
+
+# ---------------------------
+# Batched reads
+# ---------------------------
+def iter_job_batches(collection, batch_size=1000, projection=JOB_PROJECTION, query=None):
+    """The whole jobs collection as keyset batches of job documents (see app.pagination.iter_batches)."""
+    return iter_batches(collection, batch_size=batch_size, projection=projection, query=query)
+
+
+# ---------------------------
+# Streaming scorer
+# ---------------------------
+def top_jobs_from_batches(query_vec, vectorizer, batches, top_n=5):
+    """
+    Score each batch of jobs against a TF-IDF query vector and keep a bounded
+    top-N min-heap. Returns [(similarity, job), ...] best first.
+    """
+    if top_n <= 0:
+        return []
+    heap, seq = [], 0
+    for batch in batches:
+        if not batch:
+            continue
+        job_vecs = vectorizer.transform([job_tokens(job) for job in batch])
+        sims = (job_vecs @ query_vec.T).toarray().ravel()
+
+        # Only the batch's own top-N can enter the global top-N
+        k = min(top_n, len(sims))
+        for i in np.argpartition(-sims, k - 1)[:k]:
+            item = (float(sims[i]), seq, batch[i])
+            seq += 1
+            if len(heap) < top_n:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    return [(score, job) for score, _, job in sorted(heap, key=lambda x: (-x[0], x[1]))]
@@ -0,0 +1,67 @@
+"""
+Benchmark: approximate (IVF) job retrieval vs the exact cosine scan.
+
+Reports top-N recall against the exact path and mean query latency for a
+range of n_probe values (the recall/latency knob).
+
+    python bench_ann_matcher.py
+    python bench_ann_matcher.py --jobs 200000 --queries 50 --n-probe 4 16 64
+"""
+import argparse
+import random
+import time
+import numpy as np
+
+from app.job_index import JobIndex
+from app.ann_index import IVFJobIndex, ann_search
+from bench_streaming_matcher import SKILLS, FILLER, synthetic_jobs
+
+
+def synthetic_resumes(n, seed=7):
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(SKILLS, 6) + rng.choices(FILLER, k=10)) for _ in range(n)]
+
+
+def exact_top(index, query_vec, top_n):
+    sims = (index.weighted_matrix() @ query_vec.T).toarray().ravel()
+    return set(np.argsort(-sims, kind="stable")[:top_n])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    print(f"Building job index over {args.jobs:,} synthetic jobs...")
+    index = JobIndex.build(synthetic_jobs(args.jobs))
+    index.weighted_matrix()
+
+    start = time.perf_counter()
+    ann = IVFJobIndex(index)
+    print(f"IVF build: {time.perf_counter() - start:.1f}s ({len(ann.lists)} lists)")
+
+    # Prime the module cache with this IVF index
+    from app import ann_index
+    ann_index._cached.update(ann=ann, job_index=index, version=index.version)
+
+    queries = [index.transform(text) for text in synthetic_resumes(args.queries)]
+
+    start = time.perf_counter()
+    truth = [exact_top(index, q, args.top_n) for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"\n{'mode':>12} {'recall@' + str(args.top_n):>10} {'ms/query':>10}")
+    print(f"{'exact':>12} {1.0:>10.3f} {exact_ms:>10.2f}")
+    for n_probe in args.n_probe:
+        start = time.perf_counter()
+        found = [ann_search(index, q, top_n=args.top_n, n_probe=n_probe) for q in queries]
+        ann_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = np.mean([len(t & {row for row, _ in f}) / len(t) for t, f in zip(truth, found)])
+        print(f"{'n_probe=' + str(n_probe):>12} {recall:>10.3f} {ann_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: batch ATS scoring (one skill matrix per side, sparse weighted
+matched/required ratios) vs calling ats_score() once per pair.
+
+    python bench_ats_batch.py
+    python bench_ats_batch.py --resumes 10 --jobs 5000
+"""
+import time
+import random
+import argparse
+
+from app.ats_checker import ats_score, ats_score_many, ats_score_matrix, skill_matrix
+from bench_streaming_matcher import FILLER, SKILLS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    resumes = [" ".join(rng.choices(FILLER + SKILLS, k=300)) for _ in range(args.resumes)]
+    jobs = [" ".join(rng.choices(FILLER + SKILLS, k=120)) for _ in range(args.jobs)]
+    pairs = args.resumes * args.jobs
+
+    start = time.perf_counter()
+    for resume in resumes:
+        for job in jobs:
+            ats_score(resume, job)
+    pairwise_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ats_score_many(resumes, jobs)
+    batch_s = time.perf_counter() - start
+
+    resume_matrix, job_matrix = skill_matrix(resumes), skill_matrix(jobs)
+    start = time.perf_counter()
+    ats_score_matrix(resume_matrix, job_matrix)
+    scores_s = time.perf_counter() - start
+
+    print(f"{args.resumes} resumes x {args.jobs} jobs = {pairs} pairs")
+    print(f"  pairwise ats_score      : {pairwise_s:7.2f}s  {pairs / pairwise_s:10.0f} pairs/s")
+    print(f"  ats_score_many (full)   : {batch_s:7.2f}s  {pairs / batch_s:10.0f} pairs/s")
+    print(f"  scores only (matrices)  : {scores_s:7.4f}s  {pairs / scores_s:10.0f} pairs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: batch resume screening (match_resumes_to_jobs) vs looping the
+single-resume path, in resumes/second. Scoring only - no MongoDB needed.
+
+    python bench_batch_matching.py
+    python bench_batch_matching.py --jobs 50000 --resumes 1000
+"""
+import argparse
+import time
+import numpy as np
+
+from app.job_index import JobIndex
+from app.matching_engine import _resume_corpus
+from bench_ann_matcher import synthetic_resumes
+from bench_streaming_matcher import synthetic_jobs
+
+
+def looped(index, resumes, top_n):
+    results = []
+    for text in resumes:
+        sims = index.score(_resume_corpus(text))
+        top = np.argpartition(-sims, top_n - 1)[:top_n]
+        results.append(sorted(top, key=lambda i: sims[i], reverse=True))
+    return results
+
+
+def batched(index, resumes, top_n):
+    queries = index.transform([_resume_corpus(text) for text in resumes])
+    return index.top_matches(queries, top_n=top_n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--top-n", type=int, default=5)
+    args = parser.parse_args()
+
+    index = JobIndex.build(synthetic_jobs(args.jobs))
+    index.weighted_matrix()
+    resumes = synthetic_resumes(args.resumes)
+
+    start = time.perf_counter()
+    loop_results = looped(index, resumes, args.top_n)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_results = batched(index, resumes, args.top_n)
+    batch_s = time.perf_counter() - start
+
+    agree = np.mean([
+        set(map(int, a)) == {row for row, _ in b} for a, b in zip(loop_results, batch_results)
+    ])
+    print(f"{args.resumes} resumes x {args.jobs:,} jobs (top {args.top_n})")
+    print(f"  looped : {args.resumes / loop_s:>9,.1f} resumes/s")
+    print(f"  batched: {args.resumes / batch_s:>9,.1f} resumes/s  ({loop_s / batch_s:.1f}x)")
+    print(f"  identical top-N sets: {agree:.1%}")
+
+
+if __name__ == "__main__":
+    main()
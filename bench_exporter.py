@@ -0,0 +1,108 @@
+"""
+Benchmark: streaming export (NDJSON / CSV / Parquet) vs the old admin
+export (list(find()) + json.dumps + DataFrame.to_csv) at growing
+collection sizes.
+
+Each run happens in a fresh process so peak RSS is measured independently.
+Documents come from a synthetic collection that generates each _id range on
+demand, so the database itself holds nothing in the benchmark process.
+
+    python bench_exporter.py
+    python bench_exporter.py --sizes 10000 100000 500000 --formats ndjson parquet
+"""
+import os
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+from multiprocessing import get_context
+
+from app.exporter import AVAILABLE_FORMATS, EXPORT_FIELDS, export_collection
+
+FIELDS = EXPORT_FIELDS["resumes"]
+SKILLS = ["Python", "SQL", "Java", "Docker", "AWS", "Pandas", "Spark", "NLP", "React", "Kubernetes"]
+
+
+class SyntheticCursor:
+    def __init__(self, collection, query):
+        self.collection, self.query, self.n = collection, query, collection.size
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        self.n = n
+        return self
+
+    def __iter__(self):
+        start = self.query.get("_id", {}).get("$gt", -1) + 1
+        for i in range(start, min(start + self.n, self.collection.size)):
+            yield self.collection.document(i)
+
+
+class SyntheticCollection:
+    """Just enough of a pymongo Collection for keyset scans over `size` resumes."""
+
+    def __init__(self, size):
+        self.size = size
+
+    def document(self, i):
+        rng = random.Random(i)
+        return {
+            "_id": i,
+            "Name": f"Candidate {i}",
+            "Email": f"candidate{i}@example.com",
+            "Phone": f"+91 98{i:08d}",
+            "Skills": rng.sample(SKILLS, 4),
+            "Education": ["B.Tech Computer Science"],
+            "Experience": [f"Engineer at Company {i % 500} building data pipelines and services"] * 3,
+            "uploaded_by": f"user{i % 100}@example.com",
+            "version_name": f"resume_{i}.pdf",
+            "uploaded_at": "2026-01-01T00:00:00",
+        }
+
+    def find(self, query=None, projection=None):
+        return SyntheticCursor(self, query or {})
+
+
+def _run(size, fmt, batch_size):
+    collection = SyntheticCollection(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, f"export.{fmt}")
+        start = time.perf_counter()
+        if fmt == "legacy":
+            import pandas as pd
+            docs = list(collection.find().limit(size))
+            with open(out + ".json", "w") as f:
+                f.write(json.dumps(docs, indent=4, default=str))
+            with open(out + ".csv", "w") as f:
+                f.write(pd.DataFrame(docs).to_csv(index=False))
+            n_bytes = os.path.getsize(out + ".json") + os.path.getsize(out + ".csv")
+        else:
+            n_bytes = export_collection(collection, fmt, out, FIELDS, batch_size=batch_size)["bytes"]
+        elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    return elapsed, peak_mb, n_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--formats", nargs="+", default=["legacy", *AVAILABLE_FORMATS])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'docs':>9} {'format':>8} {'seconds':>8} {'docs/s':>9} {'MB out':>8} {'peak RSS (MB)':>14}")
+    ctx = get_context("spawn")
+    for size in args.sizes:
+        for fmt in args.formats:
+            with ctx.Pool(1) as pool:
+                elapsed, peak_mb, n_bytes = pool.apply(_run, (size, fmt, args.batch_size))
+            print(f"{size:>9,} {fmt:>8} {elapsed:>8.2f} {size / elapsed:>9,.0f} "
+                  f"{n_bytes / 2**20:>8.1f} {peak_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
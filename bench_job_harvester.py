@@ -0,0 +1,65 @@
+"""
+Benchmark: concurrent Jooble harvester vs the sequential fetch_from_jooble
+loop, against a local mock Jooble server with simulated API latency.
+
+    python bench_job_harvester.py
+    python bench_job_harvester.py --queries 20 --pages 5 --latency 0.3 --rate 20
+"""
+import os
+os.environ.setdefault("JOOBLE_API_KEY", "bench-key")
+
+import time
+import argparse
+
+from mock_jooble import PAGE_SIZE, MockJooble, start_mock_jooble
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=10, help="keyword/location pairs")
+    parser.add_argument("--pages", type=int, default=5, help="pages per query")
+    parser.add_argument("--latency", type=float, default=0.2, help="mock API latency (s)")
+    parser.add_argument("--rate", type=float, default=20.0, help="harvester requests/second")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server, base_url = start_mock_jooble()
+    MockJooble.latency = args.latency
+    MockJooble.total_count = args.pages * PAGE_SIZE
+    os.environ["JOOBLE_API_URL"] = base_url
+
+    from app import jobs_utils
+    from app.http_client import http_client
+    from app.job_harvester import JoobleHarvester
+    jobs_utils.JOOBLE_API_URL = base_url
+    http_client.max_per_host = args.concurrency
+
+    keywords = ["Data Scientist", "Python Developer", "ML Engineer", "Data Analyst", "DevOps Engineer"]
+    locations = ["India", "Remote", "Hyderabad", "Bangalore"]
+    queries = [(keywords[i % len(keywords)], locations[i // len(keywords) % len(locations)])
+               for i in range(args.queries)]
+
+    # Sequential: the existing one-page-at-a-time path
+    start = time.perf_counter()
+    seen = set()
+    for kw, loc in queries:
+        for page in range(1, args.pages + 1):
+            for job in jobs_utils.fetch_from_jooble(kw, loc, page=page, limit=PAGE_SIZE):
+                seen.add((job["title"], job["company"]))
+    seq_s = time.perf_counter() - start
+
+    harvester = JoobleHarvester(api_key="bench-key", base_url=base_url, max_pages=args.pages,
+                                concurrency=args.concurrency, rate_per_sec=args.rate,
+                                sink=lambda batch: {"inserted": len(batch)})
+    import asyncio
+    stats = asyncio.run(harvester.run(queries))
+    server.shutdown()
+
+    print(f"{args.queries} queries x {args.pages} pages, {args.latency * 1000:.0f} ms mock latency")
+    print(f"  sequential: {seq_s:6.2f}s  {len(seen) / seq_s:8.1f} unique jobs/s  ({len(seen)} unique)")
+    print(f"  harvester : {stats['seconds']:6.2f}s  {stats['jobs_per_sec']:8.1f} unique jobs/s  "
+          f"({stats['unique']} unique, {stats['duplicates']} duplicates, {stats['batches']} batches)")
+
+
+if __name__ == "__main__":
+    main()
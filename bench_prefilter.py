@@ -0,0 +1,72 @@
+"""
+Benchmark: posting-list prefilter (app/prefilter.py) before hybrid ranking.
+
+Compares scoring every job against scoring only the jobs that pass the
+location / remote / minimum-skill-overlap filters, on synthetic jobs.
+
+    python bench_prefilter.py
+    python bench_prefilter.py --jobs 500000 --location Pune --min-skill-overlap 3
+    python bench_prefilter.py --cities 300 --location City40   # Zipf-distributed cities
+"""
+import time
+import random
+import argparse
+
+from app.job_index import JobIndex
+from app.prefilter import JobPostings, filter_rows, get_postings
+from app.ranking import HybridRanker
+from bench_ann_matcher import synthetic_resumes
+from bench_streaming_matcher import synthetic_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--location", default="Pune")
+    parser.add_argument("--remote", choices=["any", "yes", "no"], default="any")
+    parser.add_argument("--min-skill-overlap", type=int, default=3)
+    parser.add_argument("--cities", type=int, default=0,
+                        help="relocate jobs across this many cities (Zipf); 0 keeps the 7 synthetic ones")
+    args = parser.parse_args()
+    remote = {"any": None, "yes": True, "no": False}[args.remote]
+
+    print(f"Building job index over {args.jobs:,} synthetic jobs...")
+    jobs = synthetic_jobs(args.jobs)
+    if args.cities:
+        rng = random.Random(3)
+        cities = ["Remote"] + [f"City{i}" for i in range(args.cities - 1)]  # City0 most common
+        weights = [1 / (rank + 1) for rank in range(len(cities))]
+        jobs = (dict(job, location=rng.choices(cities, weights)[0]) for job in jobs)
+    index = JobIndex.build(jobs)
+    ranker = HybridRanker(index)
+    start = time.perf_counter()
+    JobPostings(index)
+    print(f"Posting lists build: {(time.perf_counter() - start) * 1000:.0f} ms")
+    get_postings(index)
+    resumes = synthetic_resumes(args.queries)
+
+    start = time.perf_counter()
+    for text in resumes:
+        ranker.rank(text, top_n=10)
+    full_ms = (time.perf_counter() - start) * 1000 / len(resumes)
+
+    scored, filter_ms, rank_ms = 0, 0.0, 0.0
+    for text in resumes:
+        start = time.perf_counter()
+        rows = filter_rows(index, text, args.location, remote, args.min_skill_overlap)
+        filter_ms += (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        ranker.rank(text, top_n=10, rows=rows)
+        rank_ms += (time.perf_counter() - start) * 1000
+        scored += len(rows)
+
+    n = len(resumes)
+    print(f"\n{'':>10} {'jobs scored':>12} {'filter ms':>10} {'rank ms':>9} {'total ms':>9}")
+    print(f"{'all jobs':>10} {len(index):>12,} {0:>10.2f} {full_ms:>9.2f} {full_ms:>9.2f}")
+    print(f"{'filtered':>10} {scored / n:>12,.0f} {filter_ms / n:>10.2f} {rank_ms / n:>9.2f} "
+          f"{(filter_ms + rank_ms) / n:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: prompt compaction on synthetic multi-page resumes (running
+header and "Page x of y" footer on every page, extra boilerplate and
+unrelated sections), with a job description, at several token budgets.
+Reports estimated tokens before/after, the share saved and the compaction
+time per request.
+
+    python bench_prompt_compactor.py
+    python bench_prompt_compactor.py --pages 1 3 6 --budgets 1500 3000
+"""
+import time
+import random
+import argparse
+
+import numpy as np
+
+from app.prompt_compactor import compact_prompt
+from bench_resume_parser import synthetic_resume
+from bench_skill_matcher import WORDS, synthetic_skills
+
+FILLER = ["Hobbies", "Interests", "Personal Details", "References available upon request", "Declaration"]
+
+
+def multipage_resume(skills, rng, pages):
+    body = synthetic_resume(skills, rng).splitlines()
+    name = body[0]
+    for _ in range(pages - 1):  # longer histories, more projects, hobbies...
+        body += ["", rng.choice(FILLER), " ".join(rng.choices(WORDS, k=60)),
+                 "Projects", " ".join(rng.choices(WORDS, k=80))]
+    per_page = -(-len(body) // pages)
+    return "\f".join(
+        "\n".join([f"{name} - Resume"] + body[i * per_page:(i + 1) * per_page] + [f"Page {i + 1} of {pages}"])
+        for i in range(pages)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--budgets", type=int, nargs="+", default=[1000, 3000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    skills = synthetic_skills(204)
+    print(f"{'pages':>5} {'budget':>7} {'tokens before':>14} {'tokens after':>13} {'saved':>7} {'ms/request':>11}")
+    for pages in args.pages:
+        corpus = [multipage_resume(skills, rng, pages) for _ in range(args.resumes)]
+        jds = [" ".join(rng.choices(WORDS, k=80) + [s["name"] for s in rng.sample(skills, 8)])
+               for _ in range(args.resumes)]
+        for budget in args.budgets:
+            start = time.perf_counter()
+            results = [compact_prompt(text, jd, budget=budget) for text, jd in zip(corpus, jds)]
+            ms = (time.perf_counter() - start) * 1000 / len(corpus)
+            before = np.mean([r["tokens_before"] for r in results])
+            after = np.mean([r["tokens_after"] for r in results])
+            print(f"{pages:>5} {budget:>7,} {before:>14,.0f} {after:>13,.0f} {1 - after / before:>7.1%} {ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Offline evaluation of the hybrid job ranker (app/ranking.py).
+
+Scores the labeled fixture (app/data/ranking_eval.json: jobs + resumes with
+graded relevance) with each stage alone and with the combined weights, and
+reports NDCG@k / recall@k plus per-stage latency (p50 / p95 ms per query).
+--jobs pads the fixture with synthetic distractor jobs, so quality and
+latency can be checked at a realistic index size.
+
+    python bench_ranking.py
+    python bench_ranking.py --jobs 100000 --k 5
+    python bench_ranking.py --weights "bm25=0.5,tfidf=0.2,skills=0.3"
+"""
+import os
+import json
+import argparse
+
+from app.job_index import JobIndex
+from app.ranking import MATCH_WEIGHTS, HybridRanker, evaluate, parse_weights
+from bench_streaming_matcher import synthetic_jobs
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "data", "ranking_eval.json")
+
+
+def load_fixture(path=FIXTURE):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def configurations(weights):
+    return {
+        "bm25": {"bm25": 1},
+        "tfidf": {"tfidf": 1},
+        "skills": {"skills": 1},
+        "hybrid": weights,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default=FIXTURE)
+    parser.add_argument("--jobs", type=int, default=0, help="synthetic distractor jobs to add")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--weights", help='e.g. "bm25=0.4,tfidf=0.3,skills=0.3" (default: MATCH_WEIGHTS)')
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the queries for latency")
+    args = parser.parse_args()
+
+    fixture = load_fixture(args.fixture)
+    jobs = fixture["jobs"] + [dict(job, _id=f"synthetic-{job['_id']}") for job in synthetic_jobs(args.jobs)]
+    index = JobIndex.build(jobs)
+    index.weighted_matrix()
+    ranker = HybridRanker(index)
+    weights = parse_weights(args.weights) if args.weights else MATCH_WEIGHTS
+    queries = fixture["queries"] * args.repeat
+
+    print(f"{len(index):,} jobs, {len(fixture['queries'])} labeled queries, weights {weights}\n")
+    print(f"{'ranker':>8} {'ndcg@' + str(args.k):>8} {'recall@' + str(args.k):>9}   latency p50/p95 ms per stage")
+    for name, config in configurations(weights).items():
+        result = evaluate(ranker, queries, config, k=args.k)
+        latency = "  ".join(f"{stage} {t['p50']:.2f}/{t['p95']:.2f}" for stage, t in result["latency_ms"].items())
+        print(f"{name:>8} {result[f'ndcg@{args.k}']:>8.3f} {result[f'recall@{args.k}']:>9.3f}   {latency}")
+
+
+if __name__ == "__main__":
+    main()
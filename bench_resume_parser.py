@@ -0,0 +1,103 @@
+"""
+Benchmark: rule-based resume parser throughput (resumes/second) on a
+synthetic corpus, against the old parser (regexes compiled per call, an
+8-skill alternation - or one alternation over the whole dictionary - and
+no sections), at growing skill-dictionary sizes.
+
+    python bench_resume_parser.py
+    python bench_resume_parser.py --resumes 5000 --skills 204 2000 10000
+"""
+import re
+import time
+import random
+import argparse
+
+from app.resume_parser import parse_resume_text
+from app.skill_taxonomy import SkillTaxonomy
+from bench_skill_matcher import WORDS, synthetic_skills
+
+FIRST = ["Aarav", "Priya", "Rahul", "Sneha", "Vikram", "Ananya", "Karthik", "Meera"]
+LAST = ["Sharma", "Reddy", "Iyer", "Patel", "Nair", "Gupta", "Rao", "Das"]
+DEGREES = ["B.Tech in Computer Science, JNTU Hyderabad", "M.Sc Statistics, University of Pune",
+           "MBA, IIM Bangalore", "B.E. Electronics, Anna University"]
+ROLES = ["Data Scientist", "Software Engineer", "Backend Developer", "Data Analyst", "ML Engineer"]
+COMPANIES = ["Infosys", "TCS", "Flipkart", "Swiggy", "Zoho", "Freshworks"]
+
+
+def synthetic_resume(skills, rng):
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+    listed = [s["name"] for s in rng.sample(skills, min(12, len(skills)))]
+    lines = [
+        name,
+        f"Email: {name.lower().replace(' ', '.')}@example.com | Phone: +91 9{rng.randrange(10**8, 10**9)}",
+        "",
+        "Summary",
+        " ".join(rng.choices(WORDS, k=40)),
+        "",
+        "Work Experience",
+    ]
+    for _ in range(rng.randint(2, 4)):
+        start = rng.randint(2012, 2022)
+        lines.append(f"- {rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 3)})")
+        lines.append("  " + " ".join(rng.choices(WORDS, k=25) + rng.sample(listed, 3)))
+    lines += ["", "Education", *rng.sample(DEGREES, rng.randint(1, 2)), "",
+              "Technical Skills: " + ", ".join(listed), "", "Projects", " ".join(rng.choices(WORDS, k=30))]
+    return "\n".join(lines)
+
+
+LEGACY_SKILLS = r"\b(Python|Java|C\+\+|SQL|Machine Learning|Deep Learning|AI|Data Science)\b"
+
+
+def legacy_parse(resume_text, skills_pattern=LEGACY_SKILLS):
+    """The pre-engine parse_resume_text (optionally with a bigger skill alternation)."""
+    parsed_data = {}
+    lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
+    parsed_data["Name"] = (
+        lines[0] if lines and not re.search(r"(resume|curriculum vitae)", lines[0], re.I) else None
+    )
+    email_match = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", resume_text)
+    parsed_data["Email"] = email_match.group() if email_match else None
+    phone_match = re.search(r"\+?\d[\d\s-]{8,}\d", resume_text)
+    parsed_data["Phone"] = phone_match.group() if phone_match else None
+    skills = re.findall(skills_pattern, resume_text, re.I)
+    parsed_data["Skills"] = list(set([s.title() for s in skills])) if skills else []
+    return parsed_data
+
+
+def throughput(parse, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        parse(text)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--skills", type=int, nargs="+", default=[204, 1000, 5000, 20000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base = synthetic_skills(204)
+    corpus = [synthetic_resume(base, rng) for _ in range(args.resumes)]
+    print(f"{args.resumes:,} synthetic resumes, {sum(map(len, corpus)) / len(corpus):,.0f} chars each\n")
+
+    re.purge()
+    print(f"{'parser':>22} {'skills':>7} {'resumes/s':>10} {'skills found/resume':>20}")
+    legacy_found = sum(len(legacy_parse(t)["Skills"]) for t in corpus) / len(corpus)
+    print(f"{'legacy (8 regex skills)':>22} {8:>7} {throughput(legacy_parse, corpus):>10,.0f} {legacy_found:>20.1f}")
+    for n in args.skills:
+        names = sorted((s["name"] for s in synthetic_skills(n)), key=len, reverse=True)
+        pattern = r"\b(" + "|".join(re.escape(name) for name in names) + r")\b"
+        rate = throughput(lambda text: legacy_parse(text, pattern), corpus[:200])
+        found = sum(len(legacy_parse(t, pattern)["Skills"]) for t in corpus[:200]) / 200
+        print(f"{'legacy + alternation':>22} {n:>7,} {rate:>10,.0f} {found:>20.1f}")
+
+        taxonomy = SkillTaxonomy(synthetic_skills(n))
+        found = sum(len(parse_resume_text(t, taxonomy)["Skills"]) for t in corpus) / len(corpus)
+        rate = throughput(lambda text: parse_resume_text(text, taxonomy), corpus)
+        print(f"{'rule engine':>22} {n:>7,} {rate:>10,.0f} {found:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
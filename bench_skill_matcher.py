@@ -0,0 +1,91 @@
+"""
+Benchmark: compiled skill-taxonomy automaton vs the old per-skill scan
+(re.search + two str.count per skill) at growing taxonomy sizes.
+
+    python bench_skill_matcher.py
+    python bench_skill_matcher.py --sizes 20 1000 10000 --pairs 200
+"""
+import re
+import time
+import random
+import argparse
+
+from app.skill_taxonomy import SkillTaxonomy, get_taxonomy, normalize_text
+
+WORDS = ("build maintain scalable services collaborate team design deliver features production "
+         "systems pipelines customers reliable data platform analytics cloud models").split()
+
+
+def synthetic_skills(n, seed=0):
+    """The real taxonomy first, then generated one- and two-token skills with an alias each."""
+    base = [{"name": name, "aliases": [], "weight": get_taxonomy().weight(key)}
+            for key, name in zip(get_taxonomy().keys, get_taxonomy().names)]
+    rng = random.Random(seed)
+    skills = base[:n]
+    i = 0
+    while len(skills) < n:
+        name = f"skill{i}" if i % 2 else f"tool{i} framework"
+        skills.append({"name": name, "aliases": [f"alias{i}"], "weight": rng.choice([1, 2])})
+        i += 1
+    return skills
+
+
+def synthetic_text(skills, rng, n_words=400, n_skills=15):
+    words = rng.choices(WORDS, k=n_words)
+    for skill in rng.sample(skills, min(n_skills, len(skills))):
+        words.insert(rng.randrange(len(words)), skill["name"])
+    return " ".join(words)
+
+
+def legacy_scan(skillset, resume_text, job_desc):
+    """The pre-taxonomy ats_score inner loop."""
+    resume_norm, job_norm = normalize_text(resume_text), normalize_text(job_desc)
+    density = {}
+    for skill in skillset:
+        if " " in skill:
+            found = skill in job_norm
+        else:
+            found = bool(re.search(rf"\b{re.escape(skill)}\b", job_norm))
+        if found:
+            density[skill] = (resume_norm.count(skill), job_norm.count(skill))
+    return density
+
+
+def automaton_scan(taxonomy, resume_text, job_desc):
+    resume_hits, job_hits = taxonomy.find(resume_text), taxonomy.find(job_desc)
+    return {skill: (resume_hits.get(skill, 0), count) for skill, count in job_hits.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 1000, 10000])
+    parser.add_argument("--pairs", type=int, default=100, help="resume/JD pairs scored per size")
+    args = parser.parse_args()
+
+    print(f"{'skills':>8} {'compile':>10} {'legacy/pair':>13} {'automaton/pair':>15} {'speedup':>8}")
+    for n in args.sizes:
+        skills = synthetic_skills(n)
+        rng = random.Random(n)
+        pairs = [(synthetic_text(skills, rng), synthetic_text(skills, rng)) for _ in range(args.pairs)]
+
+        start = time.perf_counter()
+        taxonomy = SkillTaxonomy(skills)
+        compile_s = time.perf_counter() - start
+
+        skillset = [s["name"].lower() for s in skills]
+        start = time.perf_counter()
+        for resume, job in pairs:
+            legacy_scan(skillset, resume, job)
+        legacy_s = (time.perf_counter() - start) / len(pairs)
+
+        start = time.perf_counter()
+        for resume, job in pairs:
+            automaton_scan(taxonomy, resume, job)
+        auto_s = (time.perf_counter() - start) / len(pairs)
+
+        print(f"{n:>8} {compile_s * 1000:>8.1f}ms {legacy_s * 1000:>11.2f}ms "
+              f"{auto_s * 1000:>13.3f}ms {legacy_s / auto_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
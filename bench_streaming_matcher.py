@@ -0,0 +1,87 @@
+"""
+Benchmark: streaming top-N job matcher on synthetic job collections.
+
+Each size runs in a fresh process so peak RSS is measured independently.
+No MongoDB needed: jobs are generated in batches the same shape as
+iter_job_batches() yields them.
+
+    python bench_streaming_matcher.py
+    python bench_streaming_matcher.py --sizes 1000 10000 --batch-size 2000
+"""
+import argparse
+import random
+import resource
+import time
+from multiprocessing import get_context
+
+from app.job_index import JobIndex
+from app.streaming_matcher import top_jobs_from_batches
+
+SKILLS = [
+    "python", "sql", "java", "spring", "docker", "kubernetes", "react", "pandas", "pytorch",
+    "tensorflow", "nlp", "statistics", "excel", "tableau", "aws", "azure", "linux", "golang",
+    "microservices", "spark", "hadoop", "airflow", "etl", "devops", "terraform", "security",
+]
+TITLES = ["Data Scientist", "Backend Developer", "Frontend Engineer", "ML Engineer",
+          "Data Analyst", "DevOps Engineer", "Cloud Architect", "Security Analyst"]
+CITIES = ["Remote", "Hyderabad", "Bangalore", "Pune", "Chennai", "Delhi", "Mumbai"]
+FILLER = ("build maintain scalable services collaborate team design deliver features "
+          "production systems pipelines customers reliable data platform").split()
+
+RESUME = ("Python SQL machine learning NLP pytorch pandas statistics. Built ETL pipelines "
+          "with airflow and spark, deployed models with docker on AWS.")
+
+
+def synthetic_jobs(n, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "_id": i,
+            "title": rng.choice(TITLES),
+            "company": f"Company{i % 5000}",
+            "location": rng.choice(CITIES),
+            "skills_required": ", ".join(rng.sample(SKILLS, 4)),
+            "description": " ".join(rng.choices(FILLER + SKILLS, k=25)),
+        }
+
+
+def synthetic_batches(n, batch_size):
+    batch = []
+    for job in synthetic_jobs(n, seed=1):
+        batch.append(job)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _run(size, batch_size, top_n):
+    vectorizer = JobIndex.build(synthetic_jobs(2000)).vectorizer()
+    query_vec = vectorizer.transform(RESUME)
+
+    start = time.perf_counter()
+    top = top_jobs_from_batches(query_vec, vectorizer, synthetic_batches(size, batch_size), top_n=top_n)
+    elapsed = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    return elapsed, peak_mb, len(top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--top-n", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'jobs':>10} {'latency (s)':>12} {'jobs/s':>10} {'peak RSS (MB)':>14}")
+    ctx = get_context("spawn")
+    for size in args.sizes:
+        with ctx.Pool(1) as pool:
+            elapsed, peak_mb, _ = pool.apply(_run, (size, args.batch_size, args.top_n))
+        print(f"{size:>10,} {elapsed:>12.2f} {size / elapsed:>10,.0f} {peak_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
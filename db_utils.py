@@ -1,18 +1,10 @@
-from pymongo import MongoClient
-from dotenv import load_dotenv
-import os
+from app.mongodb_config import jobs_collection
 
-# Load environment variables
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
+# Shared lazy client (see app/mongodb_config.py); nothing connects until first use
+jobs = jobs_collection
 
-if not MONGO_URI:
-    raise ValueError("⚠️ MONGO_URI not found in .env")
-
-# Connect once and reuse
-client = MongoClient(MONGO_URI)
-db = client["ai_resume_analyzer"]
-jobs = db["jobs"]
+# Stored matching features (tokens etc.) are never needed by callers
+JOB_DISPLAY_PROJECTION = {"norm_text": 0, "tokens": 0, "extracted_skills": 0, "content_hash": 0}
 
 
 def get_jobs(limit=20, search_query=None):
@@ -22,7 +14,7 @@ def get_jobs(limit=20, search_query=None):
     - search_query: optional dict for filtering (MongoDB query)
     """
     query = search_query if search_query else {}
-    results = list(jobs.find(query).limit(limit))
+    results = list(jobs.find(query, JOB_DISPLAY_PROJECTION).limit(limit))
 
     # Convert ObjectId to string for JSON/Streamlit compatibility
     for job in results:
@@ -0,0 +1,73 @@
+import os
+import time
+import argparse
+from datetime import datetime, timezone
+from tqdm import tqdm
+
+from app.pdf_extraction import DEFAULT_MAX_PAGES, DEFAULT_TIMEOUT, extract_many
+from app.resume_parser import RULE_CACHE_KIND, parse_resume_text
+from app.mongodb_config import resumes_collection
+
+
+def ingest_directory(directory, uploaded_by="bulk-import", workers=None,
+                     timeout=DEFAULT_TIMEOUT, max_pages=DEFAULT_MAX_PAGES, batch_size=100):
+    """Extract every PDF in a directory on a process pool and store the parsed resumes."""
+    paths = sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(".pdf")
+    )
+    if not paths:
+        return {"error": f"⚠️ No PDF files found in {directory}"}
+
+    stats = {"files": len(paths), "inserted": 0, "pages": 0, "failed": 0, "timeouts": 0}
+    batch = []
+    start = time.perf_counter()
+
+    with tqdm(total=len(paths), unit="pdf") as progress:
+        for result in extract_many(paths, workers=workers, timeout=timeout, max_pages=max_pages):
+            progress.update(1)
+            if result["error"] or not result["text"]:
+                stats["timeouts" if result["error"] == "timeout" else "failed"] += 1
+                tqdm.write(f"⚠️ {os.path.basename(result['source'])}: {result['error'] or 'no text'}")
+                continue
+
+            parsed = parse_resume_text(result["text"])
+            parsed["uploaded_by"] = uploaded_by
+            parsed["version_name"] = os.path.basename(result["source"])
+            parsed["uploaded_at"] = datetime.now(timezone.utc)
+            # raw text + parser version let app.resume_reparser re-parse it later
+            parsed["raw_text"] = result["text"]
+            parsed["parser"] = RULE_CACHE_KIND
+            batch.append(parsed)
+            stats["pages"] += result["pages"]
+
+            if len(batch) >= batch_size:
+                stats["inserted"] += len(resumes_collection.insert_many(batch).inserted_ids)
+                batch = []
+
+            elapsed = time.perf_counter() - start
+            progress.set_postfix(docs_s=f"{progress.n / elapsed:.1f}", pages_s=f"{stats['pages'] / elapsed:.1f}")
+
+    if batch:
+        stats["inserted"] += len(resumes_collection.insert_many(batch).inserted_ids)
+
+    elapsed = time.perf_counter() - start
+    stats["seconds"] = round(elapsed, 2)
+    stats["docs_per_sec"] = round(len(paths) / elapsed, 2)
+    stats["pages_per_sec"] = round(stats["pages"] / elapsed, 2)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory of PDF resumes into MongoDB.")
+    parser.add_argument("directory")
+    parser.add_argument("--uploaded-by", default="bulk-import")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per document")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES)
+    args = parser.parse_args()
+
+    print(f"📂 Ingesting resumes from {args.directory}...")
+    result = ingest_directory(args.directory, args.uploaded_by, args.workers, args.timeout, args.max_pages)
+    print(result)
@@ -1,9 +1,10 @@
 import os
-import requests
 import pandas as pd
 from dotenv import load_dotenv
 from pymongo import UpdateOne
+from app.http_client import http_client
 from app.mongodb_config import jobs_collection  # ✅ use central config
+from app.job_index import prepare_job_features, sync_jobs_to_index
 
 # Load environment
 load_dotenv()
@@ -20,7 +21,7 @@ def fetch_from_jooble(keywords="Python Developer", location="India", page=1, lim
     payload = {"keywords": keywords, "location": location, "page": page}
 
     try:
-        response = requests.post(url, json=payload, timeout=20)
+        response = http_client.post(url, json=payload, timeout=20)
         response.raise_for_status()
         data = response.json()
         return data.get("jobs", [])[:limit]
@@ -49,9 +50,9 @@ def save_jobs_to_mongo(job_list):
     if not job_list:
         return {"inserted": 0, "updated": 0, "message": "⚠️ No jobs to save."}
 
-    ops = []
+    docs = []
     for job in job_list:
-        doc = {
+        docs.append({
             "title": job.get("title"),
             "company": job.get("company"),
             "location": job.get("location"),
@@ -59,20 +60,32 @@ def save_jobs_to_mongo(job_list):
             "skills_required": job.get("skills_required", ""),
             "link": job.get("link"),
             "updated": job.get("updated"),
-        }
-        if doc["title"] and doc["company"]:
-            ops.append(
-                UpdateOne(
-                    {"title": doc["title"], "company": doc["company"]},
-                    {"$set": doc},
-                    upsert=True,
-                )
-            )
+        })
+
+    # Derived matching features, recomputed only for new/changed jobs
+    changed = prepare_job_features(docs, jobs_collection)
+
+    ops = [
+        UpdateOne(
+            {"title": doc["title"], "company": doc["company"]},
+            {"$set": doc},
+            upsert=True,
+        )
+        for doc in docs
+        if doc["title"] and doc["company"]
+    ]
 
     if not ops:
         return {"inserted": 0, "updated": 0, "message": "⚠️ No valid jobs to save."}
 
     result = jobs_collection.bulk_write(ops)
+
+    # Keep the persisted matching index in step with the upserted jobs
+    try:
+        sync_jobs_to_index(changed)
+    except Exception as e:
+        print(f"⚠️ Job index update failed: {e}")
+
     return {
         "inserted": result.upserted_count,
         "updated": result.modified_count,
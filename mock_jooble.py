@@ -0,0 +1,53 @@
+"""
+Local mock of the Jooble search API for the harvester tests and benchmark:
+deterministic pages with a configurable latency and totalCount.
+"""
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_SIZE = 20
+
+
+class MockJooble(BaseHTTPRequestHandler):
+    """Deterministic Jooble-shaped pages. Titles repeat across locations to exercise dedupe."""
+    protocol_version = "HTTP/1.1"
+    latency = 0.1
+    total_count = 100
+    invalid_per_page = 0  # extra jobs without a company on every page
+    requests = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        MockJooble.requests += 1
+        time.sleep(MockJooble.latency)
+        page, keywords = body.get("page", 1), body["keywords"]
+        start = (page - 1) * PAGE_SIZE
+        jobs = [
+            {
+                "title": f"{keywords} {i}",
+                "company": f"Company {i % 7}",
+                "location": body["location"],
+                "snippet": f"{keywords} role number {i}",
+                "link": f"https://example.test/{keywords}/{i}",
+                "updated": "2026-01-01T00:00:00",
+            }
+            for i in range(start, min(start + PAGE_SIZE, MockJooble.total_count))
+        ]
+        jobs += [{"title": f"{keywords} untitled {i}", "company": ""} for i in range(MockJooble.invalid_per_page)]
+        data = json.dumps({"totalCount": MockJooble.total_count, "jobs": jobs}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_mock_jooble():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockJooble)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/api/"
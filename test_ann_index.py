@@ -0,0 +1,24 @@
+import numpy as np
+from app.job_index import JobIndex
+from app.ann_index import IVFJobIndex
+from bench_streaming_matcher import synthetic_jobs
+
+
+def test_probing_every_list_recovers_every_job():
+    index = JobIndex.build(synthetic_jobs(500))
+    ann = IVFJobIndex(index, dim=16, n_lists=10)
+    query = index.transform("python sql nlp pandas statistics")
+
+    rows = ann.shortlist_rows(index, query, n_probe=10)
+    assert np.array_equal(rows, np.arange(len(index)))
+    assert len(ann.shortlist_rows(index, query, n_probe=2)) < len(index)
+
+
+def test_jobs_added_after_build_are_always_shortlisted():
+    index = JobIndex.build(synthetic_jobs(300))
+    ann = IVFJobIndex(index, dim=16, n_lists=10)
+    index.upsert([{"_id": "new", "title": "Rust Engineer", "description": "rust systems"}])
+
+    assert not ann.sync(index)  # one new job is well under the rebuild drift
+    rows = ann.shortlist_rows(index, index.transform("rust"), n_probe=1)
+    assert index._row_of["new"] in rows
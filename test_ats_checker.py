@@ -0,0 +1,37 @@
+import random
+import mongomock
+from app.ats_checker import ats_score, ats_score_many
+from app.matching_engine import ats_score_resume_vs_jobs, ats_score_resumes_vs_job
+from bench_streaming_matcher import synthetic_jobs, SKILLS, FILLER
+
+
+def test_batch_matches_pairwise_ats_score():
+    rng = random.Random(1)
+    resumes = [" ".join(rng.choices(FILLER + SKILLS, k=40)) for _ in range(8)] + [""]
+    jobs = [" ".join(rng.choices(FILLER + SKILLS, k=30)) for _ in range(12)] + [""]
+
+    results = ats_score_many(resumes, jobs)
+    for i, resume in enumerate(resumes):
+        for j, job in enumerate(jobs):
+            assert results[i][j] == ats_score(resume, job)
+
+
+def test_resume_vs_jobs_and_resumes_vs_job_collections():
+    jobs = mongomock.MongoClient().db.jobs
+    jobs.insert_many(list(synthetic_jobs(250)))
+    resume = "Python SQL pandas docker kubernetes aws"
+
+    ranked = ats_score_resume_vs_jobs(resume, collection=jobs, batch_size=64)
+    assert len(ranked) == 250
+    assert [r["ATS Score"] for r in ranked] == sorted((r["ATS Score"] for r in ranked), reverse=True)
+    job = jobs.find_one({"_id": int(ranked[0]["job_id"])})
+    text = " ".join(str(job[f]) for f in ("title", "description", "skills_required"))
+    assert {k: v for k, v in ranked[0].items() if k not in ("job_id", "title", "company")} == ats_score(resume, text)
+
+    resumes = mongomock.MongoClient().db.resumes
+    resumes.insert_many([
+        {"uploaded_by": "a@x.com", "version_name": "a.pdf", "Skills": ["python", "sql"], "Experience": []},
+        {"uploaded_by": "b@x.com", "version_name": "b.pdf", "Skills": ["java"], "Experience": ["docker"]},
+    ])
+    screened = ats_score_resumes_vs_job("Python, SQL and docker", collection=resumes, top_n=1)
+    assert [(r["version_name"], r["ATS Score"]) for r in screened] == [("a.pdf", 80)]
@@ -0,0 +1,95 @@
+import os
+import mongomock
+import pytest
+from app import csv_importer
+from app.csv_importer import import_jobs_csv
+
+ROWS = [(f"Job {i}", f"Company {i % 7}", "Remote", "Python; SQL", f"Role {i}, with commas") for i in range(53)]
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    rebuilt = []
+    monkeypatch.setattr(csv_importer, "build_job_index", lambda collection: rebuilt.append(1) or _Index())
+    monkeypatch.setattr(csv_importer, "sync_jobs_to_index", lambda keys, collection: rebuilt.append(len(keys)))
+    collection = mongomock.MongoClient().db.jobs
+    collection.rebuilt = rebuilt
+    return collection
+
+
+class _Index:
+    terms = []
+
+    def __len__(self):
+        return 0
+
+
+def _write_csv(path, malformed=False):
+    header = "title,company,location,skills_required,description"
+    with open(path, "w", encoding="utf-8") as f:
+        if malformed:  # whole lines quoted as one field
+            f.write(f'"{header}"\n' + "".join(f'"{",".join(row)}"\n' for row in ROWS))
+        else:
+            f.write(f"{header}\n" + "".join(",".join(f'"{v}"' for v in row) + "\n" for row in ROWS))
+            f.write(',NoTitle,Remote,,\n')
+
+
+def test_upsert_mode_chunks_batches_and_is_idempotent(jobs, tmp_path):
+    path = str(tmp_path / "jobs.csv")
+    _write_csv(path)
+    result = import_jobs_csv(path, jobs, chunksize=20, batch_size=8)
+    assert (result["inserted"], result["rows"], result["skipped"]) == (53, 54, 1)
+    assert result["batches"] == 3 + 3 + 2  # 20/20/14-row chunks in batches of 8
+    job = jobs.find_one({"title": "Job 5"})
+    assert job["description"] == "Role 5, with commas" and job["tokens"]
+    assert not os.path.exists(path + ".import-checkpoint.json")
+    assert jobs.rebuilt == [53]
+
+    again = import_jobs_csv(path, jobs, chunksize=20, batch_size=8)
+    assert (again["inserted"], again["updated"]) == (0, 0)
+
+
+def test_malformed_header_repaired_per_chunk(jobs, tmp_path):
+    path = str(tmp_path / "jobs.csv")
+    _write_csv(path, malformed=True)
+    result = import_jobs_csv(path, jobs, chunksize=10)
+    assert result["inserted"] == 53
+    # the description keeps its own commas (split stops at the column count)
+    assert jobs.find_one({"title": "Job 9"})["description"] == "Role 9, with commas"
+
+
+def test_replace_mode_resumes_from_checkpoint_and_swaps(jobs, tmp_path, monkeypatch):
+    jobs.insert_one({"title": "Old", "company": "Gone"})
+    path = str(tmp_path / "jobs.csv")
+    _write_csv(path)
+
+    real_write, calls = csv_importer._write_batch, []
+
+    def flaky_write(collection, records):
+        calls.append(len(records))
+        if len(calls) == 4:
+            raise RuntimeError("connection reset")
+        return real_write(collection, records)
+
+    monkeypatch.setattr(csv_importer, "_write_batch", flaky_write)
+    failed = import_jobs_csv(path, jobs, mode="replace", chunksize=20, batch_size=10)
+    assert "error" in failed
+    assert jobs.count_documents({}) == 1  # live collection untouched until the swap
+
+    result = import_jobs_csv(path, jobs, mode="replace", chunksize=20, batch_size=10)
+    assert result["rows"] == 54 and result["inserted"] == 53
+    assert jobs.count_documents({}) == 53 and jobs.find_one({"title": "Old"}) is None
+    assert "jobs_import_staging" not in jobs.database.list_collection_names()
+    assert sum(calls) == 53 + 10  # only the failed batch was re-sent
+
+
+def test_normalized_rows_match_the_jooble_job_fields(jobs, tmp_path):
+    path = str(tmp_path / "jobs.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Title,Company,Location,Snippet,Link,Internal Notes\n"
+                "Data Engineer,Acme,Remote,Spark pipelines,https://x.io/1,do not publish\n")
+    assert import_jobs_csv(path, jobs, normalize=True)["inserted"] == 1
+    job = jobs.find_one({"title": "Data Engineer"}, {"_id": 0, "title": 1, "description": 1, "link": 1,
+                                                     "skills_required": 1, "updated": 1, "internal_notes": 1})
+    assert job == {"title": "Data Engineer", "description": "Spark pipelines", "link": "https://x.io/1",
+                   "skills_required": "", "updated": None}
@@ -0,0 +1,33 @@
+import os
+
+import mongomock
+import pytest
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from app.db_schema import HOT_QUERIES, check_query_plans, ensure_indexes
+
+
+def test_hot_queries_need_the_bootstrapped_indexes():
+    db = mongomock.MongoClient().db
+    assert set(check_query_plans(db)) == {
+        "user by email", "resumes of a user", "jobs by (title, company)", "jobs by location", "job text search",
+    }
+    ensure_indexes(db)
+    assert check_query_plans(db) == {}
+    ensure_indexes(db)  # idempotent
+
+
+def test_no_collscan_on_live_mongod():
+    client = MongoClient(os.getenv("MONGO_TEST_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        pytest.skip("no local mongod")
+    db = client["ai_resume_analyzer_plan_test"]
+    try:
+        for query in HOT_QUERIES:  # plans are only meaningful on non-empty collections
+            db[query["collection"]].insert_one({"seed": True})
+        ensure_indexes(db)
+        assert check_query_plans(db) == {}
+    finally:
+        client.drop_database(db.name)
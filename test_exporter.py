@@ -0,0 +1,45 @@
+import io
+import csv
+import json
+from datetime import datetime, timezone
+
+import mongomock
+import pytest
+from app.exporter import EXPORT_FIELDS, export_collection, export_to_tempfile, iter_export
+
+FIELDS = EXPORT_FIELDS["resumes"]
+
+
+@pytest.fixture
+def resumes():
+    collection = mongomock.MongoClient().db.resumes
+    collection.insert_many([
+        {"Name": f"Person {i}", "Skills": ["Python", "SQL"], "uploaded_by": "a@x.com",
+         "version_name": f"cv{i}.pdf", "uploaded_at": datetime(2026, 1, 1, tzinfo=timezone.utc), "raw": "x" * 50}
+        for i in range(7)
+    ])
+    return collection
+
+
+def test_ndjson_and_csv_stream_every_document(resumes):
+    out = io.BytesIO()
+    stats = export_collection(resumes, "ndjson", out, FIELDS, batch_size=3)
+    rows = [json.loads(line) for line in out.getvalue().decode().splitlines()]
+    assert stats["docs"] == len(rows) == 7 and stats["bytes"] == len(out.getvalue())
+    assert rows[0]["Skills"] == ["Python", "SQL"] and "raw" not in rows[0] and "_id" not in rows[0]
+
+    data = b"".join(iter_export(resumes, "csv", FIELDS, batch_size=3)).decode()
+    rows = list(csv.DictReader(io.StringIO(data)))
+    assert [r["Name"] for r in rows] == [f"Person {i}" for i in range(7)]
+    assert rows[0]["Skills"] == "Python; SQL" and rows[0]["uploaded_at"] == "2026-01-01T00:00:00"
+    assert b"".join(iter_export(resumes.database.empty, "csv", FIELDS)).decode().strip() == ",".join(FIELDS)
+
+
+def test_parquet_row_groups_per_batch(resumes):
+    pq = pytest.importorskip("pyarrow.parquet")
+    f = export_to_tempfile(resumes, "parquet", FIELDS, batch_size=3)
+    parquet = pq.ParquetFile(f)
+    assert parquet.metadata.num_rows == 7 and parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("Name").to_pylist()[-1] == "Person 6"
+    f.seek(0)
+    assert b"".join(iter_export(resumes, "parquet", FIELDS, batch_size=3)) == f.read()
@@ -0,0 +1,114 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from app.http_client import HttpClient
+
+
+class FakeServer(BaseHTTPRequestHandler):
+    """Scripted responses: a queue of (status, headers) per test, then 200s."""
+    protocol_version = "HTTP/1.1"  # keep-alive
+    script = []
+    client_ports = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with FakeServer.lock:
+            FakeServer.client_ports.append(self.client_address[1])
+            FakeServer.active += 1
+            FakeServer.max_active = max(FakeServer.max_active, FakeServer.active)
+            status, headers = FakeServer.script.pop(0) if FakeServer.script else (200, {})
+        time.sleep(0.05)
+        body = json.dumps({"status": status}).encode()
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with FakeServer.lock:
+            FakeServer.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeServer.script, FakeServer.client_ports = [], []
+    FakeServer.active = FakeServer.max_active = 0
+    yield f"http://127.0.0.1:{server.server_port}/api"
+    server.shutdown()
+
+
+def test_retries_429_and_5xx_honouring_retry_after(url):
+    FakeServer.script = [(429, {"Retry-After": "0.3"}), (503, {})]
+    client = HttpClient(backoff_base=0.01)
+
+    start = time.perf_counter()
+    response = client.post(url, json={"q": 1})
+    assert response.status_code == 200
+    assert time.perf_counter() - start >= 0.3
+
+    stats = client.metrics()[url.split("/")[2]]
+    assert stats["requests"] == 3 and stats["retries"] == 2
+    assert stats["p50_ms"] is not None
+
+
+def test_gives_up_after_max_retries(url):
+    FakeServer.script = [(500, {})] * 5
+    client = HttpClient(max_retries=2, backoff_base=0.01)
+    assert client.post(url).status_code == 500
+    assert len(FakeServer.client_ports) == 3
+
+
+def test_connections_are_kept_alive(url):
+    client = HttpClient()
+    for _ in range(3):
+        client.post(url, json={})
+    assert len(set(FakeServer.client_ports)) == 1
+
+
+def test_concurrency_is_bounded_per_host(url):
+    client = HttpClient(max_per_host=2)
+    threads = [threading.Thread(target=client.post, args=(url,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(FakeServer.client_ports) == 8
+    assert FakeServer.max_active <= 2
+
+
+def test_streamed_response_holds_its_slot_until_closed(url):
+    client = HttpClient(max_per_host=1)
+    streamed = client.post(url, stream=True)
+    waiting = threading.Thread(target=client.post, args=(url,))
+    waiting.start()
+    time.sleep(0.2)
+    assert len(FakeServer.client_ports) == 1  # the body is still being read: no second request yet
+    streamed.close()
+    waiting.join(timeout=5)
+    assert len(FakeServer.client_ports) == 2
+    streamed.close()  # closing twice releases the slot once
+
+
+def test_read_timeouts_are_retried_only_when_idempotent(url):
+    client = HttpClient(max_retries=2, backoff_base=0.01)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post(url, json={}, timeout=0.01)  # e.g. a Groq completion: may have been processed
+    time.sleep(0.1)  # let the server log it
+    assert len(FakeServer.client_ports) == 1
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.post(url, json={}, timeout=0.01, idempotent=True)
+    time.sleep(0.1)
+    assert len(FakeServer.client_ports) == 1 + 3
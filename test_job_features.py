@@ -0,0 +1,44 @@
+import tempfile
+import mongomock
+import numpy as np
+from app import job_index, jobs_utils
+from app.job_index import FEATURE_FIELDS, JobIndex, build_job_index, compute_job_features
+from test_job_index import JOBS, RESUME
+
+
+def _collection(monkeypatch):
+    collection = mongomock.MongoClient().db.jobs
+    monkeypatch.setattr(jobs_utils, "jobs_collection", collection)
+    monkeypatch.setattr(job_index, "jobs_collection", collection)
+    return collection
+
+
+def test_features_stored_and_only_recomputed_on_change(monkeypatch):
+    collection = _collection(monkeypatch)
+    jobs = [{k: v for k, v in job.items() if k != "_id"} for job in JOBS]
+    jobs_utils.save_jobs_to_mongo(jobs)
+
+    stored = collection.find_one({"title": "Data Scientist"})
+    assert all(field in stored for field in FEATURE_FIELDS)
+    assert ["python", 1] in stored["extracted_skills"] and ["sql", 1] in stored["extracted_skills"]
+    assert stored["tokens"] == compute_job_features(stored)["tokens"]
+
+    calls = []
+    real = job_index.compute_job_features
+    monkeypatch.setattr(job_index, "compute_job_features", lambda job: calls.append(job["title"]) or real(job))
+    jobs[1]["description"] = "Kafka streaming services."
+    jobs_utils.save_jobs_to_mongo(jobs)
+
+    assert calls == ["Backend Developer"]
+    assert ["kafka", 1] in collection.find_one({"title": "Backend Developer"})["extracted_skills"]
+
+
+def test_index_built_from_stored_tokens_and_legacy_jobs_backfilled(monkeypatch):
+    collection = _collection(monkeypatch)
+    collection.insert_many([dict(job) for job in JOBS])  # written before features existed
+
+    with tempfile.TemporaryDirectory() as path:
+        index = build_job_index(collection, path)
+
+    assert collection.count_documents({"tokens": {"$exists": False}}) == 0
+    assert np.allclose(index.score(RESUME), JobIndex.build(JOBS).score(RESUME), atol=1e-6)
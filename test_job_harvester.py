@@ -0,0 +1,52 @@
+import time
+import asyncio
+from app.job_harvester import JoobleHarvester, _job_key
+from mock_jooble import PAGE_SIZE, MockJooble, start_mock_jooble
+
+
+def test_paginates_dedupes_and_streams_batches():
+    server, base_url = start_mock_jooble()
+    MockJooble.latency, MockJooble.total_count, MockJooble.requests = 0.05, 3 * PAGE_SIZE, 0
+    MockJooble.invalid_per_page = 2
+    batches = []
+    try:
+        harvester = JoobleHarvester(api_key="k", base_url=base_url, max_pages=5, rate_per_sec=100,
+                                    batch_size=25, sink=lambda b: batches.append(list(b)) or {"inserted": len(b)})
+        stats = asyncio.run(harvester.run([("Data Scientist", "India"), ("Data Scientist", "Remote"),
+                                           ("ML Engineer", "India")]))
+    finally:
+        MockJooble.invalid_per_page = 0
+        server.shutdown()
+
+    # totalCount caps pagination at 3 pages per query
+    assert MockJooble.requests == 9
+    # the two "Data Scientist" queries return the same (title, company) pairs
+    assert stats["unique"] == 2 * 3 * PAGE_SIZE
+    assert stats["duplicates"] == 3 * PAGE_SIZE
+    assert stats["invalid"] == 2 * 9  # jobs without a company are not counted as duplicates
+    assert [len(b) for b in batches][:-1] == [25] * (len(batches) - 1)
+    assert sum(len(b) for b in batches) == stats["inserted"] == stats["unique"]
+
+
+def test_requests_respect_global_rate_limit():
+    server, base_url = start_mock_jooble()
+    MockJooble.latency, MockJooble.total_count = 0.0, 4 * PAGE_SIZE
+    try:
+        harvester = JoobleHarvester(api_key="k", base_url=base_url, max_pages=4, rate_per_sec=20,
+                                    sink=lambda b: {})
+        start = time.perf_counter()
+        stats = asyncio.run(harvester.run([("Python Developer", "India"), ("Data Analyst", "India")]))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    assert stats["requests"] == 8
+    assert elapsed >= 7 / 20  # first token is free, then one every 50 ms
+
+
+def test_dedupe_key_matches_the_upsert_key():
+    # save_jobs_to_mongo upserts on the exact (title, company): case variants are separate jobs there
+    assert _job_key({"title": "Data Scientist", "company": "Acme"}) == ("Data Scientist", "Acme")
+    assert _job_key({"title": "data scientist", "company": "ACME"}) != _job_key({"title": "Data Scientist",
+                                                                                "company": "Acme"})
+    assert not all(_job_key({"title": "Data Scientist", "company": None}))
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import multiprocessing
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from app import job_index
+from app.job_index import JobIndex, job_document, update_job_index
+from app.skill_taxonomy import get_taxonomy
+
+JOBS = [
+    {"_id": "1", "title": "Data Scientist", "company": "TechNova", "location": "Remote",
+     "skills_required": "Python, Machine Learning, SQL", "description": "Predictive models and big data pipelines."},
+    {"_id": "2", "title": "Backend Developer", "company": "CodeWorks", "location": "Hyderabad",
+     "skills_required": "Java, Spring Boot, Docker, SQL", "description": "Scalable backend services."},
+    {"_id": "3", "title": "AI Research Intern", "company": "DeepAI", "location": "Remote",
+     "skills_required": "Python, Deep Learning, PyTorch, NLP", "description": "Experiments in NLP models."},
+]
+RESUME = "python machine learning sql nlp pytorch engineer"
+
+
+def _reference_scores(jobs, text):
+    vectorizer = TfidfVectorizer(stop_words="english")
+    job_matrix = vectorizer.fit_transform([job_document(j) for j in jobs])
+    return (job_matrix @ vectorizer.transform([text]).T).toarray().ravel()
+
+
+def test_scores_match_full_refit():
+    index = JobIndex.build(JOBS)
+    assert np.allclose(index.score(RESUME), _reference_scores(JOBS, RESUME), atol=1e-6)
+
+
+def test_incremental_updates_match_rebuild():
+    index = JobIndex.build(JOBS[:1])
+    index.upsert(JOBS[1:])
+    index.upsert([dict(JOBS[0], description="Now a computer vision role.")])
+    index.remove(["2"])
+
+    expected_jobs = [JOBS[2], dict(JOBS[0], description="Now a computer vision role.")]
+    assert index.job_ids == ["3", "1"]
+    assert np.allclose(index.score(RESUME), _reference_scores(expected_jobs, RESUME), atol=1e-6)
+
+
+def test_save_and_load_round_trip():
+    index = JobIndex.build(JOBS)
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        loaded = JobIndex.load(path)
+    assert loaded.job_ids == index.job_ids
+    assert np.allclose(loaded.score(RESUME), index.score(RESUME))
+
+
+def test_top_matches_agrees_with_single_queries():
+    index = JobIndex.build(JOBS)
+    resumes = [RESUME, "java spring docker backend", "nlp research"]
+    batch = index.top_matches(index.transform(resumes), top_n=2, max_chunk_bytes=1)
+    for text, ranked in zip(resumes, batch):
+        sims = index.score(text)
+        assert [row for row, _ in ranked] == list(np.argsort(-sims, kind="stable")[:2])
+        assert np.allclose([score for _, score in ranked], np.sort(sims)[::-1][:2])
+
+
+def test_skill_rows_follow_job_rows():
+    index = JobIndex.build(JOBS)
+    index.remove(["2"])
+    index.upsert([dict(JOBS[0], _id="4", skills_required="Docker, Kubernetes")])
+    taxonomy = get_taxonomy()
+    skills = [{taxonomy.keys[c] for c in index.skills[i].indices} for i in range(len(index))]
+    assert index.job_ids == ["1", "3", "4"]
+    assert {"python", "machine learning", "sql"} <= skills[0] and "pytorch" in skills[1]
+    assert {"docker", "kubernetes"} <= skills[2]
+
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        assert (JobIndex.load(path).skills != index.skills).nnz == 0
+        os.remove(os.path.join(path, "skills.npz"))  # index saved before skill rows existed
+        assert JobIndex.load(path) is None
+
+
+if __name__ == "__main__":
+    test_scores_match_full_refit()
+    test_incremental_updates_match_rebuild()
+    test_save_and_load_round_trip()
+    test_top_matches_agrees_with_single_queries()
+    test_skill_rows_follow_job_rows()
+    print("✅ Job index tests passed")
+
+
+def _update_many(path, prefix, n):
+    job_index._cached.update(index=None, stamp=None)
+    for i in range(n):
+        update_job_index(jobs=[dict(JOBS[i % 3], _id=f"{prefix}{i}")], path=path)
+
+
+@pytest.mark.skipif(job_index.fcntl is None, reason="cross-process index lock needs fcntl")
+def test_concurrent_processes_do_not_lose_index_updates(tmp_path):
+    path = str(tmp_path / "index")
+    JobIndex.build(JOBS).save(path)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_update_many, args=(path, prefix, 15)) for prefix in "ab"]
+    for worker in workers:
+        worker.start()
+    _update_many(path, "c", 15)  # a third writer in this process
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    ids = JobIndex.load(path).job_ids
+    assert len(ids) == 3 + 45 and {f"{p}{i}" for p in "abc" for i in range(15)} <= set(ids)
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import mongomock
+from app.job_refresher import (
+    LOCK_ID, LeaseLock, add_saved_query, due_queries, get_refresh_status, parse_updated,
+    refresh_query, request_refresh, run_due_refreshes,
+)
+
+
+def _db():
+    return mongomock.MongoClient().db
+
+
+def _fake_fetch(pages):
+    """fetch_from_jooble stand-in serving fixed pages; records the calls."""
+    calls = []
+
+    def fetch(keywords, location, page=1, limit=20, date_from=None):
+        calls.append((page, date_from))
+        return pages[page - 1] if page <= len(pages) else []
+    fetch.calls = calls
+    return fetch
+
+
+def _job(i, updated):
+    return {"title": f"Job {i}", "company": "Acme", "updated": updated}
+
+
+def test_parse_updated_handles_jooble_precision():
+    assert parse_updated("2026-03-01T10:20:30.1234567") == datetime(2026, 3, 1, 10, 20, 30, 123456)
+    assert parse_updated("2026-03-01T10:20:30") == datetime(2026, 3, 1, 10, 20, 30)
+    assert parse_updated("") is None
+    assert parse_updated("yesterday") is None
+
+
+def test_lease_lock_excludes_other_owners_until_expiry():
+    state = _db().refresh_state
+    now = datetime(2026, 1, 1, 12, 0)
+    a, b = LeaseLock(state, "a", ttl=60), LeaseLock(state, "b", ttl=60)
+
+    assert a.acquire(now)
+    assert not b.acquire(now + timedelta(seconds=30))
+    assert a.renew(now + timedelta(seconds=30))          # owner may renew
+    assert b.acquire(now + timedelta(seconds=120))       # expired lease is taken over
+    assert not a.acquire(now + timedelta(seconds=130))
+    b.release()
+    assert a.acquire(now + timedelta(seconds=130))
+
+
+def test_refresh_query_keeps_only_jobs_newer_than_watermark():
+    saved = []
+    watermark = datetime(2026, 1, 10)
+    fetch = _fake_fetch([
+        [_job(1, "2026-01-12T00:00:00.0000000"), _job(2, "2026-01-05T00:00:00.0000000")],
+        [_job(3, "2026-01-11T00:00:00.0000000")],
+        [_job(4, "2026-01-01T00:00:00.0000000")],   # nothing new -> stop paging
+        [_job(5, "2026-01-20T00:00:00.0000000")],
+    ])
+    query = {"keywords": "Python", "location": "India", "watermark": watermark}
+    metrics, new_watermark = refresh_query(query, max_pages=5, fetch=fetch,
+                                           save=lambda jobs: saved.extend(jobs) or {"inserted": len(jobs)})
+
+    assert [j["title"] for j in saved] == ["Job 1", "Job 3"]
+    assert new_watermark == datetime(2026, 1, 12)
+    assert [page for page, _ in fetch.calls] == [1, 2, 3]
+    assert fetch.calls[0][1] == "2026-01-10"
+    assert metrics["fetched"] == 4 and metrics["new"] == 2 and metrics["inserted"] == 2
+
+
+def test_run_due_refreshes_schedules_and_records_status():
+    db = _db()
+    add_saved_query("Python", "India", interval_minutes=60, collection=db.refresh_queries)
+    fetch = _fake_fetch([[_job(1, "2026-01-12T00:00:00")]])
+    save = lambda jobs: {"inserted": len(jobs), "updated": 0}
+    kwargs = dict(queries_collection=db.refresh_queries, state_collection=db.refresh_state,
+                  fetch=fetch, save=save)
+
+    result = run_due_refreshes(owner="w1", **kwargs)
+    assert result["refreshed"] == 1 and result["errors"] == 0
+    status = get_refresh_status(db.refresh_state)
+    assert status["state"] == "idle" and status["last_new_jobs"] == 1
+    saved = db.refresh_queries.find_one({"keywords": "Python"})
+    assert saved["watermark"] == datetime(2026, 1, 12) and saved["last_run"] is not None
+
+    # Just ran: nothing due until the interval passes or a refresh is requested
+    assert due_queries(collection=db.refresh_queries) == []
+    assert run_due_refreshes(owner="w1", **kwargs) == {"skipped": "nothing due"}
+    request_refresh(db.refresh_state)
+    assert run_due_refreshes(owner="w1", **kwargs)["refreshed"] == 1
+    assert run_due_refreshes(owner="w1", **kwargs) == {"skipped": "nothing due"}
+
+
+def test_concurrent_worker_skips_while_lock_is_held():
+    db = _db()
+    add_saved_query("Python", "India", collection=db.refresh_queries)
+    LeaseLock(db.refresh_state, "other-worker").acquire()
+
+    result = run_due_refreshes(owner="w1", queries_collection=db.refresh_queries,
+                               state_collection=db.refresh_state, fetch=_fake_fetch([]))
+    assert result == {"skipped": "another refresh is running"}
+    assert db.refresh_queries.find_one({"keywords": "Python"})["last_run"] is None
+
+
+def test_lease_is_renewed_per_page_and_a_lost_lease_stops_the_refresh():
+    db = _db()
+    add_saved_query("Python", "India", collection=db.refresh_queries)
+    saved, renewals = [], []
+    pages = [[_job(i, f"2026-01-{10 + i}T00:00:00")] for i in range(1, 5)]
+
+    def fetch(keywords, location, page=1, limit=20, date_from=None):
+        renewals.append(db.refresh_state.find_one({"_id": LOCK_ID})["expires_at"] > datetime(2000, 1, 1))
+        lease = {"owner": "w1", "expires_at": datetime(2000, 1, 1)}  # renewing moves expires_at forward again
+        if page == 3:  # our lease expired and another worker took it over
+            lease = {"owner": "w2", "expires_at": datetime(2100, 1, 1)}
+        db.refresh_state.update_one({"_id": LOCK_ID}, {"$set": lease})
+        return pages[page - 1]
+
+    result = run_due_refreshes(owner="w1", queries_collection=db.refresh_queries, state_collection=db.refresh_state,
+                               fetch=fetch, save=lambda jobs: saved.extend(jobs) or {"inserted": len(jobs)},
+                               max_pages=4)
+    assert "lease lost" in result["error"] and result["refreshed"] == 0
+    assert renewals == [True, True, True]                                   # renewed after every page
+    assert saved == []                                                      # nothing saved without the lease
+    assert db.refresh_queries.find_one({"keywords": "Python"})["last_run"] is None
+    assert db.refresh_state.find_one({"_id": LOCK_ID})["owner"] == "w2"     # not released from under w2
+    assert get_refresh_status(db.refresh_state)["state"] == "running"       # w2's status left alone
@@ -0,0 +1,98 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app import llm_cache
+from app.llm_cache import LLMResponseCache, cached_chat_completion
+
+
+class StubGroq(BaseHTTPRequestHandler):
+    """Stands in for the Groq chat-completions endpoint."""
+    calls = 0
+    fail = False
+
+    def do_POST(self):
+        StubGroq.calls += 1
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(0.2)  # long enough for concurrent callers to overlap
+        if StubGroq.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+        content = json.dumps({"echo": body["messages"][-1]["content"]})
+        data = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def groq_url(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGroq)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubGroq.calls, StubGroq.fail = 0, False
+    monkeypatch.setattr(llm_cache, "llm_cache", LLMResponseCache(ttl=60, max_entries=2))
+    monkeypatch.setattr(llm_cache.http_client, "max_retries", 0)  # count raw calls
+    yield f"http://127.0.0.1:{server.server_port}/openai/v1/chat/completions"
+    server.shutdown()
+
+
+def payload(text):
+    return {"model": "llama-3.1-8b-instant", "messages": [{"role": "user", "content": text}]}
+
+
+def test_identical_and_whitespace_variant_requests_hit_cache(groq_url):
+    first = cached_chat_completion("key", payload("Resume:\n  Python  SQL"), url=groq_url)
+    second = cached_chat_completion("other-key", payload("Resume: Python SQL\n"), url=groq_url)
+    assert first == second
+    assert StubGroq.calls == 1
+    assert llm_cache.llm_cache.stats["hits"] == 1
+
+
+def test_concurrent_identical_requests_share_one_call(groq_url):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cached_chat_completion("k", payload("same"), url=groq_url)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 8 and all(r == results[0] for r in results)
+    assert StubGroq.calls == 1
+    assert llm_cache.llm_cache.stats["coalesced"] == 7
+
+
+def test_errors_are_not_cached_and_lru_evicts(groq_url):
+    StubGroq.fail = True
+    with pytest.raises(requests.exceptions.HTTPError):
+        cached_chat_completion("k", payload("a"), url=groq_url)
+    StubGroq.fail = False
+    cached_chat_completion("k", payload("a"), url=groq_url)
+    assert StubGroq.calls == 2
+
+    cached_chat_completion("k", payload("b"), url=groq_url)
+    cached_chat_completion("k", payload("c"), url=groq_url)  # max_entries=2: evicts "a"
+    cached_chat_completion("k", payload("a"), url=groq_url)
+    assert StubGroq.calls == 5
+
+
+def test_entries_expire_after_ttl():
+    cache = LLMResponseCache(ttl=0.05)
+    fetches = []
+    fetch = lambda: fetches.append(1) or {"ok": True}
+    cache.get_or_fetch("k", fetch)
+    cache.get_or_fetch("k", fetch)
+    time.sleep(0.1)
+    cache.get_or_fetch("k", fetch)
+    assert len(fetches) == 2
@@ -0,0 +1,82 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.llm_cache import http_client
+from app.llm_stream import iter_sse_data, parse_partial_json
+from app.ai_assistant import stream_resume_feedback
+
+FEEDBACK = {"strengths": ["Clear impact metrics", "Strong Spark experience"],
+            "weaknesses": ["No summary"], "missing_skills": ["Kubernetes"], "suggestions": ["Add a summary"]}
+
+
+class StubSSE(BaseHTTPRequestHandler):
+    """Streams a chat completion as OpenAI-style server-sent events, a few characters at a time."""
+    content = json.dumps(FEEDBACK)
+    requests = []
+
+    def do_POST(self):
+        StubSSE.requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.wfile.write(b": keep-alive\n\n")
+        time.sleep(0.05)  # time to first token
+        for i in range(0, len(StubSSE.content), 7):
+            chunk = {"choices": [{"delta": {"content": StubSSE.content[i:i + 7]}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(0.002)
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sse_url(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSSE)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubSSE.content, StubSSE.requests = json.dumps(FEEDBACK), []
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(http_client, "max_retries", 0)
+    yield f"http://127.0.0.1:{server.server_port}/openai/v1/chat/completions"
+    server.shutdown()
+
+
+def test_partials_grow_and_the_final_result_is_validated(sse_url):
+    usage = {}
+    results = list(stream_resume_feedback("Data engineer. Python, Spark.", "Needs Kubernetes", usage=usage,
+                                          url=sse_url))
+    partials, final = results[:-1], results[-1]
+    assert final == FEEDBACK
+    assert len(partials) > 5
+    for partial in partials:  # every partial item is a prefix of the final one
+        for field, items in partial.items():
+            assert all(FEEDBACK[field][i].startswith(item) for i, item in enumerate(items))
+    assert any(p.get("strengths") and p["strengths"][0] != FEEDBACK["strengths"][0] for p in partials)  # mid-item
+    assert 50 <= usage["ttft_ms"] < usage["total_ms"] and usage["tokens_after"] > 0
+    request = StubSSE.requests[0]
+    assert request["stream"] is True and "response_format" not in request
+
+
+def test_invalid_final_json_is_an_error(sse_url):
+    StubSSE.content = '{"strengths": ["Good"], "weaknesses": "none", "missing_skills": [1], "sugg'
+    final = list(stream_resume_feedback("resume", url=sse_url))[-1]
+    assert final == {"error": "Failed to parse AI response as JSON"}
+
+
+def test_parse_partial_json():
+    assert parse_partial_json("") == {}
+    assert parse_partial_json('{"strengths": ["Clear') == {"strengths": ["Clear"]}
+    assert parse_partial_json('{"strengths": ["A", "B"], "weak') == {"strengths": ["A", "B"]}
+    assert parse_partial_json('```json\n{"a": "x \\"q') == {"a": 'x "q'}
+    assert parse_partial_json('{"a": [1, 2], "b": tr') == {"a": [1, 2]}
+
+
+def test_sse_events_span_lines_and_stop_at_done():
+    lines = [": comment", "event: message", "data: {\"a\":", "data: 1}", "", "data: [DONE]", "", "data: late", ""]
+    assert list(iter_sse_data(lines)) == ['{"a":\n1}']
@@ -0,0 +1,46 @@
+import mongomock
+import pytest
+from bson import ObjectId
+from app import matching_engine
+from app.job_index import JobIndex
+from app.matching_engine import match_resume_to_jobs, match_resumes_to_jobs
+
+SKILLS = ["Python, SQL", "Java, Docker", "Python, Docker, Kubernetes", "Excel, SQL", "Spark, Kafka, Python",
+          "React, JavaScript", "Machine Learning, Python", "AWS, Terraform, Docker"]
+LOCATIONS = ["Bangalore", "Remote", "New Delhi", "Hyderabad"]
+JOBS = [
+    {"_id": ObjectId(f"{i + 1:024x}"), "title": f"Engineer {i}", "company": f"C{i}",
+     "location": LOCATIONS[i % len(LOCATIONS)], "skills_required": SKILLS[i % len(SKILLS)],
+     "description": f"Build services with {SKILLS[(i * 3) % len(SKILLS)]}."}
+    for i in range(24)
+]
+RESUMES = ["Python developer with SQL, Docker and Kubernetes experience",
+           "Data engineer: Spark, Kafka, Python pipelines on AWS"]
+
+
+@pytest.fixture(autouse=True)
+def jobs(monkeypatch):
+    collection = mongomock.MongoClient().db.jobs
+    collection.insert_many([dict(job) for job in JOBS])
+    index = JobIndex.build([dict(job, _id=str(job["_id"])) for job in JOBS])
+    monkeypatch.setattr(matching_engine, "jobs_collection", collection)
+    monkeypatch.setattr(matching_engine, "get_job_index", lambda: index)
+
+
+def _ranking(matches):
+    return [(str(job["_id"]), round(job["similarity"], 6)) for job in matches]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"mode": "index"}, {"location": "Bangalore", "remote": True},
+                                    {"mode": "index", "location": "Hyderabad", "min_skill_overlap": 1}])
+def test_batch_and_single_resume_matching_agree(kwargs):
+    batch = match_resumes_to_jobs(RESUMES, top_n=5, **kwargs)
+    for resume, matches in zip(RESUMES, batch):
+        single = match_resume_to_jobs(resume, top_n=5, **kwargs)
+        assert single and _ranking(matches) == _ranking(single)
+        assert [job.get("scores") for job in matches] == [job.get("scores") for job in single]
+
+
+def test_batch_rejects_single_resume_modes():
+    with pytest.raises(ValueError):
+        match_resumes_to_jobs(RESUMES, mode="stream")
@@ -0,0 +1,31 @@
+import pytest
+from app import mongodb_config
+from app.mongodb_config import authenticate_user, register_user, set_backend, users_collection
+
+
+@pytest.fixture
+def memory_backend():
+    set_backend("memory")
+    yield
+    set_backend(mongodb_config.MONGO_BACKEND)
+
+
+def test_import_does_not_connect(monkeypatch):
+    monkeypatch.setattr(mongodb_config, "MONGO_URI", None)
+    set_backend("mongo")
+    with pytest.raises(ValueError):
+        users_collection.find_one({})  # only now is the URI needed
+
+
+def test_memory_backend_behind_lazy_collections(memory_backend):
+    assert register_user("a@x.com", "pw") == {"success": True}
+    assert register_user("a@x.com", "pw") == {"error": "User already exists"}
+    assert authenticate_user("a@x.com", "pw") == {"email": "a@x.com", "role": "user"}
+    assert authenticate_user("a@x.com", "wrong") is None
+    assert mongodb_config.db["users"].count_documents({}) == 1
+
+    set_backend("memory")  # fresh client, fresh data
+    assert users_collection.count_documents({}) == 0
+
+    with pytest.raises(ValueError):
+        set_backend("sqlite")
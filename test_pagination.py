@@ -0,0 +1,52 @@
+import mongomock
+from app.pagination import CountCache, Pager, fetch_page, iter_batches
+
+
+def _collection(n):
+    collection = mongomock.MongoClient().db.users
+    collection.insert_many([{"_id": i, "email": f"u{i}@x.com", "role": "user", "password": b"x"} for i in range(n)])
+    return collection
+
+
+def test_pager_walks_forward_and_back():
+    collection = _collection(25)
+    pager = Pager({}, "users")
+    projection = {"_id": 0, "email": 1, "role": 1}
+
+    seen = []
+    while True:
+        page = pager.fetch(collection, projection, page_size=10)
+        seen.append([u["_id"] for u in page["items"]])
+        assert all(set(u) == {"_id", "email", "role"} for u in page["items"])
+        if not page["has_next"]:
+            break
+        pager.next(page["last_id"])
+
+    assert seen == [list(range(10)), list(range(10, 20)), list(range(20, 25))]
+    assert pager.page_number == 3
+    pager.prev()
+    assert [u["_id"] for u in pager.fetch(collection, projection, page_size=10)["items"]] == list(range(10, 20))
+    assert fetch_page(collection, page_size=10, after=24) == {"items": [], "last_id": 24, "has_next": False}
+
+
+def test_counts_are_cached_until_invalidated():
+    collection = _collection(3)
+    cache = CountCache(ttl=60)
+    assert cache.count(collection) == 3
+    assert cache.count(collection, {"role": "user"}) == 3
+
+    collection.insert_one({"_id": 99, "role": "admin"})
+    assert cache.count(collection) == 3
+    cache.invalidate("users")
+    assert cache.count(collection) == 4
+    assert cache.count(collection, {"role": "user"}) == 3
+
+
+def test_iter_batches_reads_every_match_in_id_order():
+    collection = _collection(25)
+    collection.update_many({"_id": {"$gte": 20}}, {"$set": {"role": "admin"}})
+
+    batches = list(iter_batches(collection, batch_size=8, projection={"_id": 0, "email": 1}))
+    assert [len(b) for b in batches] == [8, 8, 8, 1]
+    assert [u["_id"] for b in batches for u in b] == list(range(25))  # kept for the cursor
+    assert [len(b) for b in iter_batches(collection, batch_size=4, query={"role": "admin"})] == [4, 1]
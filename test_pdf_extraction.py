@@ -0,0 +1,51 @@
+import os
+import tempfile
+from app.pdf_extraction import PAGE_BREAK, extract_many, extract_pdf_text
+
+
+def make_pdf(pages):
+    """Minimal single-font PDF with one line of text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = "%PDF-1.4\n", []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def test_page_cap_and_page_breaks():
+    result = extract_pdf_text(make_pdf(["Jane Doe", "Python SQL", "References"]), max_pages=2)
+    assert result["text"].split(PAGE_BREAK) == ["Jane Doe", "Python SQL"]
+    assert result["pages"] == 2 and result["truncated"]
+
+
+def test_pool_reports_errors_and_timeouts():
+    with tempfile.TemporaryDirectory() as tmp:
+        stuck = os.path.join(tmp, "stuck.pdf")
+        os.mkfifo(stuck)  # opening it blocks forever: a worker that never finishes
+        sources = [
+            ("a.pdf", make_pdf(["Resume A"])),
+            ("broken.pdf", b"not a pdf"),
+            stuck,
+            ("b.pdf", make_pdf(["Resume B", "Page two"])),
+        ]
+        results = {r["source"]: r for r in extract_many(sources, workers=2, timeout=2)}
+
+    assert results["a.pdf"]["text"] == "Resume A"
+    assert results["b.pdf"]["pages"] == 2
+    assert results["broken.pdf"]["error"] and results["broken.pdf"]["text"] is None
+    assert results[stuck]["error"] == "timeout"
@@ -0,0 +1,106 @@
+import numpy as np
+from app.job_index import JobIndex
+from app.prefilter import JobPostings, filter_rows, get_postings, is_remote, location_tokens
+from app.ranking import HybridRanker
+from app.skill_taxonomy import get_taxonomy
+
+JOBS = [
+    {"_id": "1", "title": "Data Scientist", "company": "A", "location": "Bangalore, India",
+     "skills_required": "Python, SQL, Machine Learning", "description": "Models."},
+    {"_id": "2", "title": "Backend Developer", "company": "B", "location": "Remote",
+     "skills_required": "Java, Docker, SQL", "description": "Services."},
+    {"_id": "3", "title": "ML Engineer", "company": "C", "location": "New Delhi",
+     "skills_required": "Python, Docker, Kubernetes", "description": "Serving."},
+    {"_id": "4", "title": "Analyst", "company": "D", "location": "Bangalore (Work from home)",
+     "skills_required": "Excel, SQL", "description": "Reports."},
+]
+RESUME = "Python developer with SQL and Docker experience"
+
+
+def _cols(*skills):
+    return [get_taxonomy().index[s] for s in skills]
+
+
+def test_location_helpers():
+    assert location_tokens("Bangalore (Work from home)") == ["bangalore"]
+    assert is_remote("Remote - India") and is_remote("WFH") and not is_remote("Delhi")
+    assert location_tokens("Remote") == [] and is_remote("Remote")
+
+
+def test_candidates_intersect_posting_lists():
+    postings = JobPostings(JobIndex.build(JOBS))
+    assert postings.candidates() is None
+    assert postings.candidates(location="bangalore").tolist() == [0, 3]
+    assert postings.candidates(location="new delhi").tolist() == [2]
+    assert postings.candidates(location="Mumbai").tolist() == []
+    assert postings.candidates(remote=True).tolist() == [1, 3]
+    assert postings.candidates(location="delhi", remote=True).tolist() == [1, 2, 3]
+    assert postings.candidates(location="bangalore", remote=False).tolist() == [0]
+    assert postings.candidates(location="Remote").tolist() == [1, 3]             # remote-only results
+    assert postings.candidates(location="Remote", remote=False).tolist() == [0, 2]  # an explicit remote wins
+
+    skills = _cols("python", "sql", "docker")
+    assert postings.candidates(skill_cols=skills, min_skill_overlap=2).tolist() == [0, 1, 2]
+    assert postings.candidates(skill_cols=skills, min_skill_overlap=3).tolist() == []
+    assert postings.candidates(location="bangalore", skill_cols=skills, min_skill_overlap=2).tolist() == [0]
+    assert postings.candidates(location="bangalore", skill_cols=skills, min_skill_overlap=2).dtype == np.int32
+
+
+def test_postings_follow_index_updates():
+    index = JobIndex.build(JOBS[:2])
+    postings = get_postings(index)
+    index.upsert(JOBS[2:])                       # appended rows: synced in place
+    synced = get_postings(index)
+    assert synced is postings
+    assert synced.candidates(location="bangalore").tolist() == [0, 3]
+
+    index.remove(["1"])                          # rows shift: rebuilt
+    rebuilt = get_postings(index)
+    assert rebuilt is not postings
+    assert rebuilt.candidates(location="bangalore").tolist() == [2]
+    assert [index.job_ids[r] for r in filter_rows(index, RESUME, min_skill_overlap=2)] == ["2", "3"]
+
+
+def test_reupserting_the_last_job_rebuilds_its_postings():
+    index = JobIndex.build(JOBS)
+    postings = get_postings(index)
+    index.upsert([dict(JOBS[3], location="Chennai")])  # same id, same (last) row, new location
+    rebuilt = get_postings(index)
+    assert rebuilt is not postings
+    assert rebuilt.candidates(location="chennai").tolist() == [3]
+    assert rebuilt.candidates(location="bangalore").tolist() == [0]
+    assert filter_rows(index, location="Bangalore").tolist() == [0]
+
+
+def test_ranker_scores_only_candidate_rows():
+    index = JobIndex.build(JOBS)
+    ranker = HybridRanker(index)
+    weights = {"bm25": 1, "tfidf": 1, "skills": 1}
+    rows = filter_rows(index, RESUME, remote=True)
+    ranked = ranker.rank(RESUME, top_n=5, weights=weights, rows=rows)
+    assert sorted(row for row, _, _ in ranked) == [1, 3]
+
+    full = ranker.stage_scores(RESUME)
+    subset = ranker.stage_scores(RESUME, rows=rows)
+    assert np.allclose(subset["tfidf"], full["tfidf"][rows], atol=1e-6)
+    assert np.allclose(subset["skills"], full["skills"][rows])
+
+
+def test_candidates_match_brute_force_on_larger_index():
+    import random
+    rng = random.Random(0)
+    skills = ["Python", "SQL", "Docker", "Java", "AWS", "React"]
+    jobs = [{"_id": str(i), "title": "Engineer", "company": f"C{i}",
+             "location": "Remote" if i % 17 == 0 else f"City{rng.randrange(40)}",
+             "skills_required": ", ".join(rng.sample(skills, 3)), "description": ""} for i in range(3000)]
+    postings = JobPostings(JobIndex.build(jobs))
+    cols = _cols("python", "sql", "docker")
+    for location, remote, overlap in [("City3", None, 2), (None, None, 2), ("City7", True, 1), (None, False, 3)]:
+        expected = [
+            i for i, job in enumerate(jobs)
+            if (location is None or job["location"] == location or (remote and job["location"] == "Remote"))
+            and (remote is not False or job["location"] != "Remote")
+            and (location is not None or remote is not True or job["location"] == "Remote")
+            and sum(s in job["skills_required"] for s in ("Python", "SQL", "Docker")) >= overlap
+        ]
+        assert postings.candidates(location, remote, cols, overlap).tolist() == expected
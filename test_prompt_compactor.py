@@ -0,0 +1,75 @@
+from app.prompt_compactor import clean_lines, compact_prompt, estimate_tokens, strip_page_furniture
+
+PAGE_1 = """Jane Roe - Data Engineer
+jane@example.com | +91 98765 43210
+Summary
+Data engineer who likes hiking, photography and travel.
+Experience
+Data Engineer at StreamData (2020 - 2024)
+Built Spark and Kafka pipelines on AWS; maintained Airflow DAGs.
+Page 1 of 2"""
+
+PAGE_2 = """Jane Roe - Data Engineer
+Education
+B.Tech in Computer Science, JNTU Hyderabad
+Skills: Python, Apache Spark, Kafka, Airflow, SQL
+Hobbies
+Cricket, chess, cooking, gardening, reading fantasy novels and long-distance cycling.
+Page 2 of 2"""
+
+RESUME = PAGE_1 + "\f" + PAGE_2
+JD = "Data Engineer\n\nWe need Apache Spark, Kafka and Airflow experience building streaming pipelines on AWS."
+
+
+def test_running_headers_and_footers_are_stripped_once():
+    lines = clean_lines(strip_page_furniture(RESUME))
+    assert lines.count("Jane Roe - Data Engineer") == 1 and lines[0] == "Jane Roe - Data Engineer"
+    assert not any(line.startswith("Page ") for line in lines)
+
+
+def test_clean_lines_drops_whitespace_boilerplate_and_repeats():
+    text = "Python   SQL\n\n\nPython SQL\nReferences available upon request\nPage 3\nCurriculum Vitae"
+    assert clean_lines(text) == ["Python SQL"]
+
+
+def test_standalone_years_and_phone_numbers_survive():
+    text = "Jane Roe\n9876543210\nExperience\nAnalyst at RetailCo\n2019\n2020\n2021"
+    assert compact_prompt(text, budget=1000)["resume"].split() == text.replace("\n", " ").split()
+
+    pages = ["Jane Roe\nSkills: SQL\n1", "Experience\nAnalyst\n2019\n2", "Education\nMBA\n2021\n3"]
+    lines = clean_lines(strip_page_furniture("\f".join(pages)))
+    assert "2019" in lines and "2021" in lines  # page content, not page numbers
+    assert not {"1", "2", "3"} & set(lines)      # bare page numbers at page edges go
+
+
+def test_budget_keeps_the_sections_relevant_to_the_job():
+    result = compact_prompt(RESUME, JD, budget=80)
+    assert result["tokens_after"] <= 80
+    assert result["tokens_saved"] == result["tokens_before"] - result["tokens_after"] > 0
+    resume = result["resume"]
+    assert resume.startswith("Jane Roe - Data Engineer")  # header first, original order kept
+    assert "StreamData" in resume and "Apache Spark" in resume
+    assert set(result["dropped_sections"]) == {"Summary", "Education", "Hobbies"} and "cycling" not in resume
+    assert resume.index("Experience") < resume.index("Skills")
+
+
+def test_without_a_job_description_sections_follow_the_priority():
+    result = compact_prompt(RESUME, budget=60)
+    assert result["job_description"] == ""
+    assert "Skills: Python" in result["resume"] and "cycling" not in result["resume"]
+
+
+def test_roomy_budget_only_cleans():
+    result = compact_prompt(RESUME, JD, budget=10_000)
+    assert result["dropped_sections"] == [] and "cycling" in result["resume"]
+    assert 0 < result["tokens_saved"] < estimate_tokens(RESUME) // 4
+
+
+def test_a_request_within_budget_passes_through():
+    jd = "\n".join(f"Requirement {i}: Apache Spark, Kafka and Airflow pipelines on AWS" for i in range(120))
+    resume = "Jane Roe\nSkills: Python, SQL"
+    assert estimate_tokens(jd) + estimate_tokens(resume) < 3000 and estimate_tokens(jd) > 3000 * 0.35
+
+    result = compact_prompt(resume, jd, budget=3000)
+    assert result["job_description"] == jd and result["resume"].split() == resume.split()
+    assert result["tokens_saved"] == 0 and result["dropped_sections"] == []
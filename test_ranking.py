@@ -0,0 +1,84 @@
+import numpy as np
+from app.job_index import JobIndex, job_document, _analyze
+from app.ranking import HybridRanker, evaluate, get_ranker, ndcg_at_k, parse_weights, recall_at_k
+from app.ats_checker import ats_score
+
+JOBS = [
+    {"_id": "1", "title": "Data Scientist", "company": "TechNova", "location": "Remote",
+     "skills_required": "Python, Machine Learning, SQL", "description": "Predictive models and big data pipelines."},
+    {"_id": "2", "title": "Backend Developer", "company": "CodeWorks", "location": "Hyderabad",
+     "skills_required": "Java, Spring, Docker, SQL", "description": "Scalable backend services in Java."},
+    {"_id": "3", "title": "AI Research Intern", "company": "DeepAI", "location": "Remote",
+     "skills_required": "Python, Deep Learning, PyTorch, NLP", "description": "Experiments in NLP models."},
+    {"_id": "4", "title": "Office Manager", "company": "Acme", "location": "Delhi",
+     "skills_required": "", "description": "Run the front office."},
+]
+RESUME = "Python machine learning SQL NLP PyTorch engineer with python pipelines"
+
+
+def _reference_bm25(jobs, text, k1=1.2, b=0.75):
+    docs = [_analyze(job_document(j)) for j in jobs]
+    avg_len = np.mean([len(d) for d in docs])
+    query = set(_analyze(text.lower()))
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in query:
+            df = sum(term in d for d in docs)
+            tf = doc.count(term)
+            if not df or not tf:
+                continue
+            idf = np.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avg_len))
+        scores.append(score)
+    scores = np.array(scores)
+    return scores / scores.max()
+
+
+def test_stage_scores_match_reference_implementations():
+    index = JobIndex.build(JOBS)
+    scores = HybridRanker(index).stage_scores(RESUME)
+
+    assert np.allclose(scores["bm25"], _reference_bm25(JOBS, RESUME), atol=1e-5)
+    assert np.allclose(scores["tfidf"], index.score(RESUME), atol=1e-6)
+    ats = [ats_score(RESUME, " ".join([j["title"], j["description"], j["skills_required"]])) for j in JOBS]
+    assert [int(s * 100) for s in scores["skills"]] == [r["ATS Score"] for r in ats]
+    assert scores["skills"][3] == 0  # no skills required -> no overlap signal
+
+
+def test_rank_combines_weighted_stages():
+    ranker = HybridRanker(JobIndex.build(JOBS))
+    timings = {}
+    ranked = ranker.rank(RESUME, top_n=2, weights={"bm25": 2, "tfidf": 1, "skills": 1}, timings=timings)
+
+    scores = ranker.stage_scores(RESUME)
+    final = (2 * scores["bm25"] + scores["tfidf"] + scores["skills"]) / 4
+    assert [row for row, _, _ in ranked] == list(np.argsort(-final, kind="stable")[:2])
+    assert np.isclose(ranked[0][1], final.max())
+    assert set(ranked[0][2]) == {"bm25", "tfidf", "skills"}
+    assert {"vectorize", "bm25", "tfidf", "skills", "combine"} <= set(timings)
+
+    only_tfidf = ranker.rank(RESUME, top_n=4, weights={"tfidf": 1, "bm25": 0})
+    assert [row for row, _, _ in only_tfidf] == list(np.argsort(-ranker.job_index.score(RESUME), kind="stable"))
+    assert set(only_tfidf[0][2]) == {"tfidf"}
+
+
+def test_get_ranker_follows_index_updates():
+    index = JobIndex.build(JOBS[:2])
+    ranker = get_ranker(index)
+    assert get_ranker(index) is ranker
+    index.upsert(JOBS[2:])
+    assert get_ranker(index) is not ranker and len(get_ranker(index)) == 4
+
+
+def test_metrics_and_evaluate():
+    relevance = {"a": 3, "b": 1, "c": 0}
+    assert ndcg_at_k(["a", "b", "c"], relevance, 3) == 1.0
+    assert ndcg_at_k(["c", "b", "a"], relevance, 3) < ndcg_at_k(["b", "a", "c"], relevance, 3) < 1.0
+    assert recall_at_k(["a", "x"], relevance, 2) == 0.5
+    assert parse_weights("bm25=0.5, skills=0.5") == {"bm25": 0.5, "tfidf": 0.0, "skills": 0.5}
+
+    ranker = HybridRanker(JobIndex.build(JOBS))
+    result = evaluate(ranker, [{"resume": RESUME, "relevance": {"1": 2, "3": 2}}], k=2)
+    assert result["ndcg@2"] == 1.0 and result["recall@2"] == 1.0
+    assert result["latency_ms"]["total"]["p50"] > 0
@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import tempfile
+from app import resume_cache
+from app.resume_cache import ResumeCache, pdf_digest
+
+
+def test_hits_misses_and_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        digest = pdf_digest(b"%PDF-1.4 resume")
+        calls = []
+
+        cache = ResumeCache(path)
+        compute = lambda: calls.append(1) or {"Name": "Jane", "Skills": ["Python"]}
+        assert cache.get_or_compute(digest, "rule", compute) == {"Name": "Jane", "Skills": ["Python"]}
+
+        reopened = ResumeCache(path)  # survives a restart
+        assert reopened.get_or_compute(digest, "rule", compute)["Name"] == "Jane"
+        assert len(calls) == 1
+        assert reopened.stats()["rule"]["hits"] == 1
+        assert reopened.stats()["rule"]["misses"] == 1
+
+
+def test_size_based_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResumeCache(os.path.join(tmp, "cache.sqlite3"), max_bytes=250)
+        for name in ("a", "b", "c"):
+            cache.put(name, "text", "x" * 100)
+        # "a" was least recently used and pushed the store over 250 bytes
+        assert cache.get("a", "text") is None
+        assert cache.get("b", "text") and cache.get("c", "text")
+
+        cache.get("b", "text")          # b is now most recent
+        cache.put("d", "text", "x" * 100)
+        assert cache.get("c", "text") is None
+        assert cache.get("b", "text")
+
+
+def test_uncacheable_results_are_recomputed():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResumeCache(os.path.join(tmp, "cache.sqlite3"))
+        error = lambda: {"Error": "API request failed"}
+        cache.get_or_compute("d", "ai", error, cacheable=lambda parsed: "Error" not in parsed)
+        assert cache.get("d", "ai") is None
+
+
+def test_connections_are_closed(monkeypatch):
+    opened, real_connect = [], sqlite3.connect
+
+    def connect(*args, **kwargs):
+        opened.append(real_connect(*args, **kwargs))
+        return opened[-1]
+    monkeypatch.setattr(resume_cache.sqlite3, "connect", connect)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResumeCache(os.path.join(tmp, "cache.sqlite3"))
+        cache.get_or_compute("d", "rule", lambda: {"Name": "Jane"})
+        cache.stats()
+    assert len(opened) == 4
+    for conn in opened:
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:  # "Cannot operate on a closed database."
+            continue
+        raise AssertionError("sqlite connection left open")
@@ -0,0 +1,57 @@
+import mongomock
+from bson import ObjectId
+from app.resume_parser import RULE_CACHE_KIND
+from app.resume_reparser import load_checkpoint, reparse_resumes, save_checkpoint
+
+TEXT = "Jane Roe\njane@example.com\nSkills: Python, SQL\nEducation\nB.Tech, JNTU Hyderabad"
+
+
+def _resumes(n):
+    collection = mongomock.MongoClient().db.resumes
+    collection.insert_many([
+        {"_id": ObjectId(f"{i:024x}"), "raw_text": TEXT, "Skills": [], "uploaded_by": f"u{i}@x.io"}
+        for i in range(1, n + 1)
+    ])
+    return collection
+
+
+def test_reparses_in_batches_and_keeps_upload_fields(tmp_path):
+    collection = _resumes(7)
+    collection.insert_one({"_id": ObjectId(f"{99:024x}"), "raw_text": TEXT, "Skills": ["Kept"], "parser": "ai"})
+    collection.insert_one({"_id": ObjectId(f"{98:024x}"), "Skills": ["No text"]})
+    checkpoint = str(tmp_path / "reparse.json")
+
+    result = reparse_resumes(collection, workers=1, batch_size=3, checkpoint_path=checkpoint)
+    assert (result["parsed"], result["updated"], result["errors"]) == (7, 7, 0)
+    assert result["skipped_no_text"] == 1
+    assert set(result["stage_seconds"]) == {"read", "parse", "write", "checkpoint"}
+    doc = collection.find_one({"_id": ObjectId(f"{1:024x}")})
+    assert doc["Name"] == "Jane Roe" and doc["Skills"][:2] == ["Python", "SQL"]
+    assert doc["uploaded_by"] == "u1@x.io" and doc["parser"] == RULE_CACHE_KIND
+    assert collection.find_one({"parser": "ai"})["Skills"] == ["Kept"]
+
+    # done: a second run has nothing left at this parser version
+    assert reparse_resumes(collection, workers=1, checkpoint_path=checkpoint)["parsed"] == 0
+    assert reparse_resumes(collection, workers=1, checkpoint_path=checkpoint, force=True)["parsed"] == 7
+
+
+def test_resumes_after_the_checkpoint(tmp_path):
+    collection = _resumes(5)
+    checkpoint = str(tmp_path / "reparse.json")
+    save_checkpoint(checkpoint, {"target": "resumes", "parser": RULE_CACHE_KIND, "last_id": f"{3:024x}",
+                                 "parsed": 3, "updated": 3, "errors": 0})
+    assert load_checkpoint(checkpoint, "resumes", "rule:v1") is None  # other parser version
+
+    result = reparse_resumes(collection, workers=1, batch_size=2, checkpoint_path=checkpoint)
+    assert result["parsed"] == 5
+    assert collection.count_documents({"parser": RULE_CACHE_KIND}) == 2
+    assert load_checkpoint(checkpoint, "resumes", RULE_CACHE_KIND) is None  # removed when finished
+
+
+def test_process_pool_matches_inline(tmp_path):
+    inline, pooled = _resumes(60), _resumes(60)
+    reparse_resumes(inline, workers=1, batch_size=25, checkpoint_path=str(tmp_path / "a.json"))
+    result = reparse_resumes(pooled, workers=2, batch_size=25, checkpoint_path=str(tmp_path / "b.json"))
+    assert result["parsed"] == 60 and result["workers"] == 2
+    projection = {"parsed_at": 0}
+    assert list(pooled.find({}, projection)) == list(inline.find({}, projection))
@@ -0,0 +1,55 @@
+from app.resume_parser import SCHEMA_FIELDS, extract_skills, parse_resume_text, segment_sections
+from app.skill_taxonomy import SkillTaxonomy
+
+RESUME = """
+Jane Roe | jane.roe@example.com | +91 98765 43210
+Summary
+Backend engineer who enjoys Python and clean code.
+
+Work Experience
+- Software Engineer at Acme (2019 - 2023)
+  Built REST APIs with Django and PostgreSQL.
+
+Education:
+B.Tech in Computer Science, JNTU Hyderabad
+
+Technical Skills: Python, Docker, Kubernetes, Homegrown Tool
+"""
+
+
+def test_fills_the_ai_schema_from_sections():
+    parsed = parse_resume_text(RESUME)
+    assert set(SCHEMA_FIELDS) <= set(parsed) and "Error" not in parsed
+    assert parsed["Name"] == "Jane Roe"
+    assert parsed["Email"] == "jane.roe@example.com"
+    assert parsed["Phone"] == "+91 98765 43210"
+    assert parsed["Education"] == ["B.Tech in Computer Science, JNTU Hyderabad"]
+    assert parsed["Experience"] == [
+        "Software Engineer at Acme (2019 - 2023)",
+        "Built REST APIs with Django and PostgreSQL.",
+    ]
+    assert parsed["Skills"][:3] == ["Python", "REST API", "Django"]  # first mention order
+    assert {"Docker", "Kubernetes", "Homegrown Tool"} <= set(parsed["Skills"])
+
+
+def test_headings_need_a_separator_or_nothing_after_them():
+    sections = segment_sections(["Skills: SQL, Excel", "Experience in retail analytics", "Projects"])
+    assert sections == {"header": [], "skills": ["SQL, Excel", "Experience in retail analytics"], "other": []}
+
+
+def test_without_headings_falls_back_to_line_patterns():
+    parsed = parse_resume_text(
+        "John Smith\nMBA, IIM Bangalore\nData Analyst at RetailCo (2019 - 2023)\nMobile +1 555 010 9999"
+    )
+    assert parsed["Phone"] == "+1 555 010 9999"  # the date range before it is no phone number
+    assert parsed["Education"] == ["MBA, IIM Bangalore"]
+    assert parsed["Experience"] == ["Data Analyst at RetailCo (2019 - 2023)"]
+
+
+def test_title_line_is_not_a_name():
+    assert parse_resume_text("Curriculum Vitae\nEmail: a@b.io")["Name"] is None
+
+
+def test_custom_dictionary():
+    taxonomy = SkillTaxonomy([{"name": "Airflow"}, {"name": "Apache Spark", "aliases": ["pyspark"]}])
+    assert extract_skills("PySpark jobs scheduled in airflow; more pyspark", taxonomy) == ["Apache Spark", "Airflow"]
@@ -0,0 +1,39 @@
+from app.skill_taxonomy import SkillTaxonomy, get_taxonomy, tokenize
+from app.ats_checker import ats_score
+
+SKILLS = [
+    {"name": "Power BI", "aliases": ["powerbi"], "weight": 2},
+    {"name": "BI", "aliases": ["business intelligence"]},
+    {"name": "Machine Learning", "aliases": ["ml"], "weight": 2},
+    {"name": "C++", "aliases": ["cpp"]},
+    {"name": "C#", "aliases": ["csharp"]},
+    {"name": "Java"},
+]
+
+
+def test_aliases_counts_and_word_boundaries():
+    taxonomy = SkillTaxonomy(SKILLS)
+    hits = taxonomy.find("Machine-learning and ML; javascript is not Java. CPP, c++ and C#.")
+    assert hits == {"machine learning": 2, "java": 1, "c++": 2, "c#": 1}
+
+
+def test_overlaps_resolve_leftmost_longest():
+    taxonomy = SkillTaxonomy(SKILLS)
+    assert taxonomy.find("Power BI dashboards, business intelligence, BI") == {"power bi": 1, "bi": 2}
+
+
+def test_find_tokens_matches_find():
+    taxonomy = get_taxonomy()
+    text = "Python, SQL and TensorFlow on Kubernetes with scikit-learn"
+    assert taxonomy.find_tokens(tokenize(text)) == taxonomy.find(text)
+    assert {"python", "sql", "tensorflow", "kubernetes"} <= set(taxonomy.find(text))
+
+
+def test_ats_score_structure_and_weights():
+    result = ats_score("Python and pandas, python again", "Python, SQL, pandas and docker required")
+    assert result["matched_skills"] == ["python", "pandas"]
+    assert set(result["missing_skills"]) == {"sql", "docker"}
+    assert result["critical_missing"][0] == "sql"  # weight 2 ranks first
+    assert result["keyword_density"]["python"] == {"resume_count": 2, "job_count": 1}
+    assert result["ATS Score"] == int(3 / 6 * 100)
+    assert ats_score("anything", "")["ATS Score"] == 0
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from app.job_index import JobIndex
+from app.streaming_matcher import iter_job_batches, top_jobs_from_batches
+
+JOBS = [
+    {"_id": i, "title": f"Job {i}", "company": "Acme", "location": "Remote",
+     "skills_required": skills, "description": "team role"}
+    for i, skills in enumerate([
+        "python sql", "java spring", "python pytorch nlp", "react css", "sql excel",
+        "python machine learning sql", "docker kubernetes", "nlp python", "go rust", "pandas python",
+    ])
+]
+RESUME = "python nlp sql pandas"
+
+
+def test_heap_top_n_matches_full_ranking():
+    index = JobIndex.build(JOBS)
+    sims = index.score(RESUME)
+    expected = [index.job_ids[i] for i in np.argsort(-sims, kind="stable")[:3]]
+
+    vectorizer = index.vectorizer()
+    batches = [JOBS[i:i + 3] for i in range(0, len(JOBS), 3)]
+    top = top_jobs_from_batches(vectorizer.transform(RESUME), vectorizer, batches, top_n=3)
+
+    assert [str(job["_id"]) for _, job in top] == expected
+    assert np.allclose([score for score, _ in top], np.sort(sims)[::-1][:3])
+
+
+def test_iter_job_batches_reads_whole_collection():
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient()["db"]["jobs"]
+    collection.insert_many([dict(job) for job in JOBS])
+
+    batches = list(iter_job_batches(collection, batch_size=4))
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [job["_id"] for b in batches for job in b] == list(range(10))
@@ -0,0 +1,67 @@
+from app.resume_parser import TierStats, tiered_parse_resume_text
+
+STRUCTURED = """Jane Roe
+jane.roe@example.com | +91 98765 43210
+Experience
+Data Analyst at RetailCo (2019 - 2023)
+Education
+MBA, IIM Bangalore
+Skills: SQL, Excel, Tableau
+"""
+
+UNSTRUCTURED = """jane roe - data person
+reach me at jane.roe at example dot com
+did some dashboards for retail folks
+Experience
+Data Analyst at RetailCo (2019 - 2023)
+Education
+MBA, IIM Bangalore
+"""
+
+
+class FakeLLM:
+    def __init__(self, result):
+        self.result, self.calls = result, []
+
+    def __call__(self, text, fields):
+        self.calls.append((text, list(fields)))
+        return self.result
+
+
+def test_confident_resume_skips_the_llm():
+    llm, stats = FakeLLM({}), TierStats()
+    parsed = tiered_parse_resume_text(STRUCTURED, ai_parse=llm, stats=stats)
+    assert llm.calls == [] and parsed["LLM Fields"] == []
+    assert parsed["Name"] == "Jane Roe" and parsed["Skills"][:2] == ["SQL", "Excel"]
+    assert min(parsed["Confidence"].values()) >= 0.6
+    assert stats.summary()["rule_only_share"] == 1.0
+
+
+def test_low_confidence_fields_get_a_trimmed_prompt():
+    llm, stats = FakeLLM({"Name": "Jane Roe", "Skills": ["Dashboards"], "Experience": ["ignored"]}), TierStats()
+    parsed = tiered_parse_resume_text(UNSTRUCTURED, ai_parse=llm, stats=stats)
+
+    (text, fields), = llm.calls
+    assert fields == ["Name", "Skills"]
+    assert "dashboards" in text and "RetailCo" in text and "IIM" not in text  # Education is not sent
+    assert parsed["Name"] == "Jane Roe" and parsed["Skills"] == ["Dashboards"]
+    assert parsed["Experience"] == ["Data Analyst at RetailCo (2019 - 2023)"]  # confident rule value kept
+    summary = stats.summary()
+    assert summary["rule_only"] == 0 and summary["prompt_chars_saved"] > 0
+
+
+def test_llm_failure_keeps_the_rule_values():
+    parsed = tiered_parse_resume_text(UNSTRUCTURED, ai_parse=FakeLLM({"Error": "API request failed"}), stats=None)
+    assert parsed["LLM Error"] == "API request failed"
+    assert parsed["Experience"] == ["Data Analyst at RetailCo (2019 - 2023)"] and parsed["Name"] is None
+
+
+def test_saved_latency_is_measured_against_llm_calls():
+    stats = TierStats()
+    stats.record(2.0, None, 0, 1000)
+    stats.record(2.0, None, 0, 1000)
+    stats.record(3.0, 1000.0, 300, 1000)
+    summary = stats.summary()
+    assert summary["rule_only_share"] == round(2 / 3, 3)
+    assert summary["p50_llm_ms"] == 1000.0 and summary["p50_saved_ms"] == 998.0
+    assert summary["prompt_chars_saved"] == 0.7